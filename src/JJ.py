@@ -4,7 +4,7 @@
 # GitHub  : https://github.com/spencebarton/jazmin
 # License : MIT License
 # Descript: Main interface logic for Jazmin's GUI and voice interaction
-# Last date edited: (08/10/25 21:37)
+# Last date edited: (10/19/26 23:58)
 
 # C 2025 Jazmin and SBD. All rights reserved. For more information, visit jazminpy.com
 
@@ -16,7 +16,6 @@ import io
 import time
 import random
 import socket
-import tempfile
 import subprocess
 import re
 import threading
@@ -33,7 +32,6 @@ from tkVideoPlayer import TkinterVideo
 # audio libraries
 import pygame
 from pygame import mixer
-from playsound import playsound
 
 # speech recognition
 import speech_recognition as sr
@@ -95,9 +93,8 @@ username2 = get_logged_in_user()
 print(sys.version)  
 
 
-# initial boot message
-from jazmin_application import speak_boot_message
-speak_boot_message()
+# initial boot message (runs as a boot task once the window exists)
+from jazmin_application import api_boot_audio, get_wait_message
 
 # function for getting resources from the right file in Jazmin's executeable
 def resource_path(relative_path):
@@ -120,11 +117,53 @@ from jazmin_userinterface import open_jazminhelp
 from jazmin_userinterface import Jazmin_Timer_Start, Jazmin_Timer_Elapsed, Jazmin_Timer_Stop
 Jazmin_Timer_Start()
 
+# background threads hand widget updates to the Tk thread through this
+from jazmin_dispatcher import get_dispatcher, ui_post, ui_insert, ui_replace_text
+
+# every looping gif runs off one shared animation clock
+from jazmin_animation import GIFLooper, get_clock, decode_gif_frames, fill_photo_frames
+
+# startup work is declared as dependent tasks instead of sleeps and hand-tuned after() delays
+from jazmin_boot import BootOrchestrator
+
+# videos are rendered once at the window size so playback does no per-frame resize
+from jazmin_assets import prepare_video, video_for_display
+
+# times the main Tk event handlers for the optimizer
+from jazmin_optimizer import instrument
+
+# each conversation turn is traced stage by stage (LLM, TTS, download, playback, typing)
+from jazmin_trace import get_tracer, span, bind
+
+# web calls share one session and use the timeout tuned from measured round trips
+from jazmin_http import get_openai_client, synthesize_speech
+
+# mixer buffer follows audio.buffer_ms, playback is watched for stalls
+from jazmin_audio import init_mixer, StageTimes
+
+# import for the sound effect bank (UI sounds decoded once at boot)
+from jazmin_sfx import get_bank, play_sfx
+
+# import for the voice player (queued lines on the music stream, mute aware)
+from jazmin_player import play_audio, set_muted
+
+# import for the audio buses (voice, sfx, ambience) with ducking
+from jazmin_mixer import get_mixer
+
+# import for learning when the user shows up and prewarming ahead of it
+from jazmin_usage import start_usage_tracking, note_turn
+
+# import for the speech to text backends (Google, or a local engine when configured or offline)
+from jazmin_stt import warm_backend
+
+# import for the streaming microphone listener (partial transcripts while the user talks)
+from jazmin_listen import StreamingListener
+
 # jazmin shortcut creation
 try:
-    from jazmin_shortcut import creating_shortcut_async
+    from jazmin_shortcut import creating_shortcut
 except Exception:
-    creating_shortcut_async = None
+    creating_shortcut = None
 
 
 # Class   : MainJazmin
@@ -135,27 +174,22 @@ class MainJazmin(tk.Tk):
         # initializes the main Tkinter window
             tk.Tk.__init__(self, *args, **kwargs)
 
-    # Preload continued menu screen and mainjazmin sequences 
-            config_file = resource_path("gif_menu_sequence_continue.gif")
-            gif_path = config_file; frames = []; delays = []
-            
-        # loads all frames and delays from a GIF into lists for later playback
-            def preload_gif_frames(gif_path):
-                global frames, delays; frames = []; delays = []                                
-                gif = Image.open(gif_path); frame_count = 0
-                    
-                try:
-                    while True:                       
-                        frame = ImageTk.PhotoImage(gif.copy()); frames.append(frame)                        
-                        delay = gif.info.get('duration', 100);  delays.append(delay)                      
-                        gif.seek(len(frames)); frame_count += 1                        
-                except EOFError: print(f"[Jazmin] [Bootscreeen]   - Total number of frames in continued BootScreen: {frame_count}");return frames, delays                                   
-
-            frames, delays = preload_gif_frames(gif_path)  
-                                     
-            
-    # timer control
-            Jazmin_Timer_Elapsed(); Jazmin_Timer_Stop()
+        # starts draining widget updates posted by background threads
+            get_dispatcher().attach(self)
+            get_clock().attach(self)
+
+    # boot pipeline, pages add their own tasks and __main__ starts it (boot timer stops when it settles)
+            self.boot = BootOrchestrator()
+
+    # Preload continued menu screen (decoded on a worker, StartPage turns it into PhotoImages)
+            gif_path = resource_path("gif_menu_sequence_continue.gif")
+            self.boot.add("decode_menu_gif", lambda: decode_gif_frames(gif_path))
+
+    # decodes every audio_*.mp3 into the SFX bank so clicks play without touching the disk
+            self.boot.add("sfx_bank", lambda: get_bank().load_all(resource_path(".")))
+
+    # jazmin greeting, used to be fired at import before the window existed
+            self.boot.add("boot_greeting", api_boot_audio)
 
             container = tk.Frame(self);container.pack(side="top", fill="both", expand=True)           
             container.grid_rowconfigure(0, weight=1)
@@ -178,7 +212,8 @@ class MainJazmin(tk.Tk):
             frame = self.frames[page_name]
             frame.tkraise()
 
-pygame.mixer.init()
+        # lets animations on the newly raised page pick up right away
+            get_clock().wake()
 
 
 # Class   : StartPage
@@ -235,22 +270,21 @@ class StartPage(tk.Frame):
                 self.mute_tooltip_shown = True
 
 
-    # starts the optimizers session in a background thread and logs any errors
+    # starts the optimizers session (runs on a boot worker) and logs any errors
         def _start_optimizer_bg(self):
             try:
                 import jazmin_optimizer as jo
-                threading.Thread(target=jo.on_session_start, daemon=True).start()
+                jo.on_session_start()
             except Exception as e:
                 print("[Optimizer] start skipped:", e)
 
-    # runs optimizer idle task every 15 seconds in a background thread and logs errors.
-        def _optimizer_idle_tick(self):
+    # hands the periodic optimizer work (idle tick every scheduler.idle_tick_s) to the optimizer's own thread
+        def _start_optimizer_scheduler(self):
             try:
                 import jazmin_optimizer as jo
-                threading.Thread(target=jo.on_idle_tick, daemon=True).start()
+                jo.start_scheduler()
             except Exception as e:
-                print("[Optimizer] idle tick error:", e)
-            self.after(15000, self._optimizer_idle_tick)  
+                print("[Optimizer] scheduler start skipped:", e)
               
 
     # the entire main function of the program
@@ -307,30 +341,18 @@ class StartPage(tk.Frame):
 
         # jazmin telling user to login (name)
             from jazmin_application import nag_user_to_login
-            nag_user_to_login(audio_muted=self.audio_muted, tk_root=self.master)
+            controller.boot.add("nag_login", lambda: nag_user_to_login(audio_muted=self.audio_muted, tk_root=self.master), on_tk=True)
 
-        # begins loading frames for the main application
+        # begins loading frames for the main application, decoded on a worker and converted after the menu gif
             gif_path2 = resource_path("gif_program_background.gif"); frames2 = []; delays2 = []
-            def preload_gif_frames2(gif_path2, frames2, delays2, self, frame_count2=0):
-                    gif2 = Image.open(gif_path2)
-                    print("[Jazmin] [Bootscreen]   - Started loading graphics for main application")
-                    def load_next_frame():
-                        nonlocal frame_count2
-                        try:
-                            frame2 = ImageTk.PhotoImage(gif2.copy())
-                            frames2.append(frame2)
-                            delay2 = gif2.info.get('duration', 100)
-                            delays2.append(delay2)
-                            gif2.seek(len(frames2))  
-                            frame_count2 += 1
-                            self.after(10, load_next_frame)
-        
-                        except EOFError:
-                            print(f"[Jazmin] [Bootscreen]   - Total number of frames in main application gif: {frame_count2}")
-                            return frames2, delays2
-    
-                    load_next_frame()  
-            preload_gif_frames2(gif_path2, frames2, delays2, self)
+            def load_program_frames():
+                images2, src_delays2 = controller.boot.result("decode_program_gif")
+                print("[Jazmin] [Bootscreen]   - Started loading graphics for main application")
+                fill_photo_frames(self, images2, src_delays2, frames2, delays2,
+                                  on_done=lambda: print(f"[Jazmin] [Bootscreen]   - Total number of frames in main application gif: {len(frames2)}"))
+
+            controller.boot.add("decode_program_gif", lambda: decode_gif_frames(gif_path2))
+            controller.boot.add("program_gif", load_program_frames, deps=("decode_program_gif", "menu_gif"), on_tk=True)
 
 
 # login menu main overlay           
@@ -397,8 +419,8 @@ class StartPage(tk.Frame):
 
                 vcmd = (self.register(_validate_name), "%P")
 
-            # sound used for invalid name 
-                error_sound = pygame.mixer.Sound(error_audio_1)
+            # sound used for invalid name (decoded once in the SFX bank)
+                error_sound = error_audio_1
 
             # checks if theres an internet connection by attempting a socket connection
                 def internetConnect():
@@ -414,6 +436,7 @@ class StartPage(tk.Frame):
                 import jazmin_application as ja
 
             # proceeds if name length is valid, else shows error and restores text
+                @instrument("proceed_button")
                 def button_proceed_press(event=None):
                     entered_name = user_enter_name.get()
 
@@ -423,14 +446,14 @@ class StartPage(tk.Frame):
                         
                         ja.cancel_menu_messages(tk_root=self.master)
 
-                        pygame.mixer.Sound(audio_enter_button).play()
+                        play_sfx(audio_enter_button)
                         proceed_button.set_success_state()
                         TransitionJazmin_1()
 
                 # plays error sound and shows message
                     else:
                         
-                        error_sound.play()
+                        play_sfx(error_sound)
                         user_enter_name.config(validate="none", state="normal", fg="#FF6347")
                         original_text = entered_name
                         user_enter_name.delete(0, tk.END)
@@ -455,13 +478,13 @@ class StartPage(tk.Frame):
                         import jazmin_application as ja
                         ja.cancel_menu_messages(tk_root=self.master) 
 
-                        pygame.mixer.Sound(audio_enter_button).play()
+                        play_sfx(audio_enter_button)
                         proceed_button.set_success_state()  
                         TransitionJazmin_1()
 
                     else:
                         print("[Jazmin] [Internet] - No internet detected. Playing local alert sound...")
-                        playsound("audio_file2.mp3") 
+                        play_audio(resource_path("audio_file2.mp3"), cache_pcm=True)
 
         # entry widget for name  
                 user_enter_name = tk.Entry(
@@ -498,21 +521,7 @@ class StartPage(tk.Frame):
                 )
                 proceed_button.place(x=405, y=380)
 
-            
-        # class for looping jazmin gif
-                class GIFLooper(tk.Label):
-
-                # initializes the animated label with given frames, delays, and starts the animation
-                    def __init__(self, master, frames, delays):
-                        tk.Label.__init__(self, master)
-                        self.master = master; self.frames = frames; self.delays = delays; self.frame_index = 0                       
-                        self.update_frame()
 
-                # updates the displayed frame and schedules the next frame change
-                    def update_frame(self):
-                        self.config(image=self.frames[self.frame_index])
-                        self.frame_index = (self.frame_index + 1) % len(self.frames)
-                        self.after(self.delays[self.frame_index], self.update_frame)
 
     # transitions to jazmin when user enters name
                 def TransitionJazmin_1():
@@ -522,7 +531,7 @@ class StartPage(tk.Frame):
                     def DestroyJazminMenu():
                         global BootVideo                        
                         MenuToJazminVideo.place(x=0,y=0, width = 924, height = 520)     
-                        pygame.mixer.Sound(audio_logon).play()
+                        play_sfx(audio_logon)
                         BootVideo.destroy()
                         user_enter_name.destroy(); helpbutton.destroy()
 
@@ -572,18 +581,21 @@ class StartPage(tk.Frame):
                                     jazmin_output_entry.after(40, clear_and_type_text, current_index, False)  
 
             # toggles mute state, plays the matching sound, updates speech input availability, and logs the change
+                            @instrument("mute_button")
                             def handle_mute_button():
                             # play the appropriate sound BEFORE muting takes effect
                                 if button45.is_clicked:
                                 # button is now in clicked state (muted)
-                                    pygame.mixer.Sound(audio_mute_button_2).play()
+                                    play_sfx(audio_mute_button_2)
                                 else:
                                 # button is now in normal state (unmuted)
-                                    pygame.mixer.Sound(audio_mute_button_1).play()
+                                    play_sfx(audio_mute_button_1)
 
                         # now toggle the muted state
                                 self.audio_muted = not self.audio_muted
-                                pygame.mixer.music.stop()
+                                self.audio_status["muted"] = self.audio_muted
+                                set_muted(self.audio_muted)
+                                get_mixer().bus("voice").stop()
 
                         # is going to show that little message once
                                 self.show_mute_tooltip_once()
@@ -623,7 +635,7 @@ class StartPage(tk.Frame):
                             def jazmin_print_output4():
                                 text = ja_username or f"Hello {get_display_name()}"
                                 for ch in text:
-                                    jazmin_output_entry.insert('end', ch)
+                                    ui_insert(jazmin_output_entry, 'end', ch)
                                     time.sleep(0.05)
                             
                     # starts the jazmin_print_output4 thread and places the output widget and disables user interaction with it
@@ -668,13 +680,11 @@ class StartPage(tk.Frame):
 
                     # start sound for the speech button
                             def play_start_listening_sound():
-                                pygame.mixer.music.load(audio_speech_1)
-                                pygame.mixer.music.play()
+                                play_sfx(audio_speech_1)
 
                     # stop sound for the speech button
                             def play_stop_listening_sound():
-                                pygame.mixer.music.load(audio_speech_2)
-                                pygame.mixer.music.play()
+                                play_sfx(audio_speech_2)
 
                     # responds if "Jasmine" is detected
                             def respond_to_jasmine():
@@ -698,6 +708,7 @@ class StartPage(tk.Frame):
 
 
                     # starts speech recognition if inactive, otherwise stops it
+                            @instrument("speech_button")
                             def on_speech_input_pressed():
                                 global listening_active, stop_listening_func, speech_thread, tooltip_shown                               
                                 global CURRENT_START_PAGE
@@ -716,15 +727,6 @@ class StartPage(tk.Frame):
                                 # initializes listening state and tracking variables
                                     def start_listening():
                                         global stop_listening_func
-                                        heard_anything = False
-                                        no_input_timer = None
-
-                                    # cancels the no input timer if its active
-                                        def cancel_no_input_timer():
-                                            nonlocal no_input_timer
-                                            if no_input_timer:
-                                                self.after_cancel(no_input_timer)
-                                                no_input_timer = None
 
                                 # stops listening, clears text, sends a random fallback reply, and resets ignored timers
                                         def handle_unknown_audio():
@@ -755,53 +757,45 @@ class StartPage(tk.Frame):
                                         # schedules an immediate reset of ignored response timers
                                             self.after(0, lambda: reset_ignored_timers(jazmin_output_entry))
 
-                                    # stops listening after 5 seconds if no audio was heard otherwise skips stopping
-                                        def force_stop_after_timeout():
-                                            if not heard_anything:
-                                                print("[Jazmin] [Speech Input] - Auto-stopping after 5 seconds (no audio heard)")
-                                                stop_listening()
-                                                handle_unknown_audio()
-                                            else:
-                                                print("[Jazmin] [Speech Input] - Auto-stop skipped (audio was already processed)")
-
-                                    # handles incoming audio and marks that speech was heard then cancels the no-input timer
-                                        def callback(recognizer, audio):
+                                    # the endpointer heard the user start talking
+                                        def on_speech():
                                             print("[Jazmin] [Speech Input] - Audio received")
-                                            nonlocal heard_anything
-                                            heard_anything = True
 
-                                        # call function
-                                            cancel_no_input_timer()
+                                    # shows what has been understood so far while the user is still talking
+                                        def on_partial(text):
+                                            ui_replace_text(user_input, text.lower())
 
-                                        # processes speech input into text and then types it out, resets timers, and triggers actions
-                                            try:
-                                                command = recognizer.recognize_google(audio).lower()
-                                                print("[Jazmin] [Speech Input] - Heard:", command)
+                                    # the user stopped talking, puts the final text in and sends it straight away
+                                        def on_final(text):
+                                            command = text.lower()
+                                            print("[Jazmin] [Speech Input] - Heard:", command)
 
-                                                for word in command.split():
-                                                    user_input.after(0, lambda w=word: user_input.insert("end", w + " "))
-                                                    time.sleep(0.2)
+                                            ui_replace_text(user_input, command)
+                                            ui_post(reset_ignored_timers, jazmin_output_entry, key="ignored_timers")
+                                            ui_post(on_button_press)
+                                            ui_post(stop_listening, key="speech_stop")
 
-                                                self.after(0, lambda: reset_ignored_timers(jazmin_output_entry))
-                                                user_input.after(0, on_button_press)
-                                                user_input.after(0, stop_listening)
+                                    # nobody started talking, nothing understood, no speech service, or no microphone
+                                        def on_error(e):
+                                            if isinstance(e, sr.WaitTimeoutError):
+                                                print(f"[Jazmin] [Speech Input] - Auto-stopping, no speech heard ({e})")
+                                                ui_post(handle_unknown_audio)
 
-                                            except sr.UnknownValueError:
+                                            elif isinstance(e, sr.UnknownValueError):
                                                 print("[Jazmin] [Speech Input] - Could not understand audio")
-                                                user_input.after(0, handle_unknown_audio)
+                                                ui_post(handle_unknown_audio)
 
-                                            except sr.RequestError:
+                                            elif isinstance(e, sr.RequestError):
                                                 print("[Jazmin] [Speech Input] - Speech service unavailable")
-                                                user_input.after(0, lambda: user_input.insert("1.0", "Speech service unavailable."))
-                                                user_input.after(0, stop_listening)
+                                                ui_insert(user_input, "1.0", "Speech service unavailable.")
+                                                ui_post(stop_listening, key="speech_stop")
 
-                                        mic_local = sr.Microphone()
-                                        stop_listening_func = recognizer.listen_in_background(mic_local, callback)
+                                            else:
+                                                ui_post(stop_listening, key="speech_stop")
 
-                                    # schedules force stop
-                                        speech_timeout_ms = random.randint(10000, 12500)
-                                        no_input_timer = self.after(speech_timeout_ms, force_stop_after_timeout)
-                                        print(f"[Jazmin] [Speech Input] - Timeout set for {speech_timeout_ms} ms")
+                                    # the endpointer ends capture a few hundred ms after the user goes quiet, and gives up when nobody starts talking
+                                        listener = StreamingListener(on_partial, on_final, on_error=on_error, on_speech=on_speech)
+                                        stop_listening_func = listener.start().stop
 
                                     play_start_listening_sound()
                                     speech_input_button.set_listening(True)
@@ -841,16 +835,15 @@ class StartPage(tk.Frame):
 
                     # sound for enter button when pressed    
                             def enter_button_pressed_audio():
-                                pygame.mixer.music.load(audio_enter_button);pygame.mixer.music.play()  
+                                play_sfx(audio_enter_button)
                                 
                     # sound for when nothing is in entry and is pressed
                             def enter_button_empty_audio():
-                                pygame.mixer.music.load(error_audio_1);pygame.mixer.music.play()  
+                                play_sfx(error_audio_1)
 
                     # sound for when maximum amount of characters is reached
                             def play_max_char_sound():
-                                pygame.mixer.music.load(sound_70_char_reached)  
-                                pygame.mixer.music.play() 
+                                play_sfx(sound_70_char_reached)
 
                     # checks if user entry is empty          
                             def enter_button_check_empty():
@@ -954,10 +947,6 @@ class StartPage(tk.Frame):
                                     user_input.delete("end-2c", "end-1c")  
                                     user_input.after(delay, lambda: clear_user_input(delay, message_printed=True))
 
-                        # instantly clears jazmins output
-                            def clear_jazmin_output():
-                                jazmin_output_entry.delete("1.0", "end") 
-
                             from jazmin_application import usersname, handle_ignored_timeout, handle_double_ignored_timeout, handle_final_ignored_timeout
 
                         # resets and schedules the three escalating ignored response timeouts                         
@@ -1001,9 +990,10 @@ class StartPage(tk.Frame):
 
 
                     # when enter button is pressed (or enter on keyboard)
+                            @instrument("submit")
                             def on_button_press(event=None):
                                 response_num = 0
-                                threading.Thread(target=clear_jazmin_output, daemon=True).start()
+                                ui_replace_text(jazmin_output_entry, "")
                                 from jazmin_application import usersname, handle_ignored_timeout, handle_double_ignored_timeout, handle_final_ignored_timeout
                                 
                                 ja.last_user_activity = time.time()
@@ -1091,17 +1081,16 @@ class StartPage(tk.Frame):
                                         def handle_text_to_speech(user_text, jazmin_output_entry):
                                             
                                         # clears the entry widget
-                                                jazmin_output_entry.delete("1.0", "end")
+                                                ui_replace_text(jazmin_output_entry, "")
+
+                                        # per-stage times for this reply, from the request to the first sound
+                                                stages = StageTimes()
 
                                         # OpenAI api key
                                                 openai_api_key = os.getenv("OPENAI_API_KEY", "your-api-key-here")
 
-                                        # Voicemaker api key
-                                                voicemaker_api_key = os.getenv("VOICEMAKER_API_KEY", "your-api-key-here")
-                                                voicemaker_api_url = "https://developer.voicemaker.in/voice/api"
-
                                         # initializes the OpenAI client
-                                                client = OpenAI(api_key=openai_api_key)
+                                                client = get_openai_client()
 
                                         # generates a reply that always ends with punctuation and saves it to history then outputs it with audio
                                                 def JazminOpenAPI(user_text):
@@ -1136,6 +1125,7 @@ class StartPage(tk.Frame):
                                                     # controls her output
                                                         request_payload = {
                                                             "model": "gpt-4",
+                                                            "stream": True,
                                                             "messages": chat_history + [
                                                                 {"role": "system", "content": (
                                                                     "Always complete your reply as a single sentence ending with a period, "
@@ -1149,11 +1139,20 @@ class StartPage(tk.Frame):
                                                         }
 
 
-                                                    # sends the request
-                                                        response = client.chat.completions.create(**request_payload)
-        
+                                                    # sends the request, streamed so the time to first token can be traced
+                                                        with span("llm.request", model=request_payload["model"]) as llm_span:
+                                                            parts = []
+                                                            for chunk in client.chat.completions.create(**request_payload):
+                                                                delta = chunk.choices[0].delta.content if chunk.choices else None
+                                                                if delta:
+                                                                    if not parts:
+                                                                        get_tracer().record("llm.ttft", llm_span.start_us)
+                                                                    parts.append(delta)
+
                                                     # extracts the response text
-                                                        api_message = response.choices[0].message.content.strip()                                                     
+                                                            api_message = "".join(parts).strip()
+                                                            llm_span.args["chars"] = len(api_message)
+                                                        stages.mark("llm_done")
 
                                                         print("[Jazmin] [Output] - Jazmin's Response:", api_message)
 
@@ -1164,12 +1163,13 @@ class StartPage(tk.Frame):
                                                         chat_history.append(assistant_message)
 
                                                     # start threads for displaying and playing audio
-                                                        threading.Thread(target=jazmin_print_output, daemon=True).start()
-                                                        threading.Thread(target=api_audio_get, daemon=True).start()
-                                                        threading.Thread(target=jazmin_print_output3, daemon=True).start()
+                                                        threading.Thread(target=bind(jazmin_print_output), daemon=True).start()
+                                                        threading.Thread(target=bind(api_audio_get), daemon=True).start()
+                                                        threading.Thread(target=bind(jazmin_print_output3), daemon=True).start()
 
                                                     except Exception as e:
                                                         print("[Error] [handle_text_to_speech, jj] - fetching response from OpenAI:", e)
+                                                        get_tracer().end_trace()
                                                         api_message = "Sorry, I couldn't process that."
 
                                     # loops through api_message with a delay and then cancels any scheduled output-clearing timer if one exists
@@ -1178,6 +1178,10 @@ class StartPage(tk.Frame):
                                                     for char in api_message:                                                        
                                                         time.sleep(0.05)  
 
+                                                    ui_post(schedule_output_clear, key="output_clear")
+
+                                        # (tk thread) replaces any pending clear with a fresh 8 second one
+                                                def schedule_output_clear():
                                                     if self.clear_output_timer_id is not None:
                                                         jazmin_output_entry.after_cancel(self.clear_output_timer_id)
 
@@ -1206,74 +1210,41 @@ class StartPage(tk.Frame):
 
                                         # types out api_message into the output entry one character at a time
                                                 def jazmin_print_output3():
-                                                    for char in api_message:
-                                                        jazmin_output_entry.insert('end', char)
-                                                        time.sleep(0.05)
+                                                    with span("ui.typing", chars=len(api_message)):
+                                                        for char in api_message:
+                                                            ui_insert(jazmin_output_entry, 'end', char)
+                                                            time.sleep(0.05)
 
-                                        # gets TTS audio from Voicemaker and then plays it if not muted and cleans up the temp file afterward in a background thread
+                                        # gets TTS audio from Voicemaker and hands it to the voice player if not muted, the trace ends once it has played
                                                 def api_audio_get():
-                                                    
+                                                    turn = get_tracer().current()
+
+                                                # checks mute flag before fetching
+                                                    if self.audio_muted:
+                                                        get_tracer().end_trace(turn)
+                                                        return
+
                                                     try:
-                                                        headers = {
-                                                            "Authorization": f"Bearer {voicemaker_api_key}",
-                                                            "Content-Type": "application/json"
-                                                        }
-                                                        params = {
-                                                            "Engine": "neural",
-                                                            "VoiceId": "proplus-Aurora",
-                                                            "LanguageCode": "en-US",
-                                                            "Text": api_message,
-                                                            "OutputFormat": "mp3",
-                                                            "SampleRate": "48000"
-                                                        }
+                                                        audio = synthesize_speech(api_message, use_cache=False, stages=stages)
+                                                        if audio is None:  # synthesize_speech printed the API error
+                                                            get_tracer().end_trace(turn)
+                                                            return
 
-                                                        response = requests.post(voicemaker_api_url, json=params, headers=headers)
-
-                                                        if response.status_code == 200 and response.json().get("success"):
-                                                            audio_url = response.json()["path"]
-                                                            audio_response = requests.get(audio_url)
-
-                                                            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
-                                                                temp_audio.write(audio_response.content)
-                                                                temp_path = temp_audio.name
-
-                                                        # checks mute flag before playing
-                                                            if self.audio_muted:
-                                                                os.remove(temp_path)
-                                                                return
-
-                                                        # plays the temporary audio
-                                                            pygame.mixer.music.load(temp_path)
-                                                            pygame.mixer.music.play()
-
-                                                        # background thread to monitor and clean up files
-                                                            def monitor_and_cleanup():
-                                                                while pygame.mixer.music.get_busy():
-                                                                    if self.audio_muted:
-                                                                        pygame.mixer.music.stop()
-                                                                        break
-                                                                    time.sleep(0.1)
-
-                                                                try:
-                                                                    pygame.mixer.music.stop()
-                                                                    pygame.mixer.music.unload()  
-                                                                    time.sleep(0.05)  
-                                                                    os.remove(temp_path)
-                                                                    print(f"[Windows] - Deleted temp file: {temp_path}")
-                                                                except Exception as e:
-                                                                    print("[Error] [Windows] - Failed to delete temp file:", e)
-
-                                                        # runs cleanup in background
-                                                            threading.Thread(target=monitor_and_cleanup, daemon=True).start()
+                                                    # checks mute flag again before playing
+                                                        if self.audio_muted:
+                                                            get_tracer().end_trace(turn)
+                                                            return
 
-                                                        else:
-                                                            print("[Error] [Voicemaker] - [api_audio_get, JJ] - Error in Voicemaker API response:", response.json())
+                                                    # plays on the voice player, marks the load and first sound stages
+                                                        play_audio(audio, label="reply", stages=stages,
+                                                                   on_done=lambda handle: get_tracer().end_trace(turn))
 
                                                     except Exception as e:
                                                         print("[Error] [Voicemaker] - [api_audio_get, JJ] - Error fetching audio from Voicemaker:", e)
+                                                        get_tracer().end_trace(turn)
 
                                         # Runs the ai call    
-                                                threading.Thread(target=JazminOpenAPI, args=(user_text,), daemon=True).start()
+                                                threading.Thread(target=bind(JazminOpenAPI), args=(user_text,), daemon=True).start()
 
                             # runs TTS if online or otherwise shows and types an offline warning then plays a fallback sound and does it all in threads
                                         if "" in user_text:                                                                                        
@@ -1285,24 +1256,24 @@ class StartPage(tk.Frame):
                                                         print(offline_message)
 
                                                     # instantly clears the entry
-                                                        jazmin_output_entry.delete(0, 'end')
+                                                        ui_replace_text(jazmin_output_entry, "")
 
                                                     # retypes the message character by character
                                                         def print_to_entry():
                                                             for char in offline_message:
-                                                                jazmin_output_entry.insert('end', char)
+                                                                ui_insert(jazmin_output_entry, 'end', char)
                                                                 time.sleep(0.05)
 
                                                     # typing character by character
                                                         threading.Thread(target=print_to_entry, daemon=True).start()
 
-                                                    # plays the fallback sound in a separate thread
-                                                        def play_fallback():
-                                                            playsound("audio_file2.mp3")
-
-                                                        threading.Thread(target=play_fallback, daemon=True).start()
+                                                    # plays the fallback sound (the player does not block this thread)
+                                                        play_audio(resource_path("audio_file2.mp3"), cache_pcm=True)
 
-                                                threading.Thread(target=safe_run_tts, daemon=True).start()
+                                            # one trace per turn, every thread below runs under it
+                                                turn = get_tracer().start_trace("turn", chars=len(user_text))
+                                                note_turn()
+                                                threading.Thread(target=bind(safe_run_tts, turn), daemon=True).start()
                                             
                                 # speech/enter button cooldown related
                                         enter_button.place_forget()
@@ -1390,8 +1361,8 @@ class StartPage(tk.Frame):
                 # MenuToJazminVideo
                     global MenuToJazminVideo
                     print("[App] [Jazmin] - Transitioning to Jazmin main application. . .")
-                    MenuToJazminVideoClip = resource_path(r"video_transition_program.mp4")
-                    MenuToJazminVideo = TkinterVideo(self, scaled=True)
+                    MenuToJazminVideoClip, needs_scaling = video_for_display(resource_path(r"video_transition_program.mp4"))
+                    MenuToJazminVideo = TkinterVideo(self, scaled=needs_scaling)
                     MenuToJazminVideo.load(MenuToJazminVideoClip)                  
                     MenuToJazminVideo.after(1500, DestroyJazminMenu)
                     MenuToJazminVideo.play()                                    
@@ -1399,46 +1370,59 @@ class StartPage(tk.Frame):
     # jazmin boot audio that plays
             def jazmin_boot_audio():
                     startup_audio_value = resource_path("audio_startup.wav")
-                    pygame.mixer.music.load(startup_audio_value)
-                    pygame.mixer.music.play(loops=0)
-        
-    # giflooper for the jazmin menu
-            class GIFLooper(tk.Label):
-                    def __init__(self, master, frames, delays):
-                        tk.Label.__init__(self, master)
-                        self.master = master; self.frames = frames; self.delays = delays; self.frame_index = 0; self.update_frame()     
-                        
-                    def update_frame(self):
-                        self.config(image=self.frames[self.frame_index]); self.frame_index = (self.frame_index + 1) % len(self.frames); self.after(self.delays[self.frame_index], self.update_frame)                        
-                        
-        # makes the menu an endless loop
-            gif_looper = GIFLooper(self, frames, delays)
-            gif_looper.place(x=-3,y=-2)
-
-    # BootVideo Logic (the one at the start)
-            BootVideo_Clip = resource_path(r"video_jazmin_boot_sequence.mp4"); global BootVideo           
-            BootVideo = TkinterVideo(self, scaled=True)
-            BootVideo.load(BootVideo_Clip)
-            BootVideo.pack(expand=True,fill="both")
-            time.sleep(3.0)
-            BootVideo.play()      
-
-            jazmin_boot_audio()
-
-            def SwitchToGIF_Menu():
-                BootVideo.destroy()
-               
-    # after x seconds display menu overlay
-            BootVideo.after(6750, lambda: overlay(self)) 
+                    get_mixer().play_ambience(startup_audio_value)
 
-        # gif takes over when mp4 runs out    
-            BootVideo.after(70000, SwitchToGIF_Menu)
+        # makes the menu an endless loop (GIFLooper from jazmin_animation), frames fill in as they are converted
+            def start_menu_gif():
+                images, src_delays = controller.boot.result("decode_menu_gif")
+                print(f"[Jazmin] [Bootscreeen]   - Total number of frames in continued BootScreen: {len(images)}")
+                frames = []; delays = []
+                gif_looper = GIFLooper(self, frames, delays)
+                gif_looper.place(x=-3,y=-2)
+
+            # keeps it under the boot video and menu overlay no matter when decoding finishes
+                gif_looper.lower()
+                fill_photo_frames(self, images, src_delays, frames, delays)
+
+            controller.boot.add("menu_gif", start_menu_gif, deps=("decode_menu_gif",), on_tk=True)
+
+    # BootVideo Logic (the one at the start), plays as soon as the window is up instead of after a blocking sleep
+            def start_boot_video():
+                global BootVideo
+                BootVideo_Clip, needs_scaling = video_for_display(resource_path(r"video_jazmin_boot_sequence.mp4"))
+                BootVideo = TkinterVideo(self, scaled=needs_scaling)
+                BootVideo.load(BootVideo_Clip)
+                BootVideo.pack(expand=True,fill="both")
+                BootVideo.play()
+
+                jazmin_boot_audio()
+
+                def SwitchToGIF_Menu():
+                    BootVideo.destroy()
+
+        # after x seconds display menu overlay
+                BootVideo.after(6750, lambda: overlay(self))
+
+            # gif takes over when mp4 runs out
+                BootVideo.after(70000, SwitchToGIF_Menu)
+
+            controller.boot.add("boot_video", start_boot_video, on_tk=True)
+
+        # renders both videos at window size into the asset cache (the transition uses it this run, the boot video next run)
+            def prepare_videos():
+                for clip in ("video_transition_program.mp4", "video_jazmin_boot_sequence.mp4"):
+                    prepare_video(resource_path(clip))
+
+            controller.boot.add("prepare_videos", prepare_videos, deps=("boot_video",))
 
             global CURRENT_START_PAGE
             CURRENT_START_PAGE = self
 
-            self._optimizer_idle_tick()
-            self.after(500, self._start_optimizer_bg)
+        # optimizer work waits until the boot video is on screen
+            controller.boot.add("optimizer_start", self._start_optimizer_bg, deps=("boot_video",))
+            controller.boot.add("optimizer_idle", self._start_optimizer_scheduler, deps=("optimizer_start",))
+            controller.boot.add("usage", lambda: start_usage_tracking([get_wait_message()], resource_path(".")), deps=("optimizer_idle",))
+            controller.boot.add("stt_model", warm_backend, deps=("optimizer_idle",))
 
 # end of jazmin application and user interface         
 
@@ -1458,18 +1442,19 @@ if __name__ == "__main__":
     jazmin.geometry("924x520")
     print("[App] [Jazmin] - Startup successful.")
         
-# runs the windows shortcut creation function if available and logs errors if it fails
+# runs the windows shortcut creation function if available and logs errors if it fails (on a boot worker)
     def _kickoff_shortcut():
                 try:
-                    if sys.platform == "win32" and creating_shortcut_async:
-                        creating_shortcut_async(username=username2,
-                                                user_value=user_value,
-                                                login_value=login_value)
+                    if sys.platform == "win32" and creating_shortcut:
+                        creating_shortcut(username=username2,
+                                          user_value=user_value,
+                                          login_value=login_value)
                 except Exception as e:
                     print(f"[Shortcut] [Error] - kickoff failed: {e}")
 
-# delay for shortcut call
-    jazmin.after(1200, _kickoff_shortcut)        
+# shortcut waits for the boot video instead of a fixed delay, then the whole boot pipeline starts
+    jazmin.boot.add("shortcut", _kickoff_shortcut, deps=("boot_video",))
+    jazmin.boot.start()
 
 # closing jazmin        
     from jazmin_application import user_force_exit
@@ -1499,59 +1484,16 @@ if __name__ == "__main__":
 
                 try:
 
-                    try:
-                        if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
-                            pygame.mixer.music.stop()
-                            pygame.mixer.music.unload()
-                    except Exception:
-
-                        pass
-
-                    pygame.mixer.init()
-                    pygame.mixer.set_num_channels(8)
-                    cue_channel = pygame.mixer.Channel(0)
-
-                    cue_path = resource_path("audio_restart.mp3")
-                    cue_sound = pygame.mixer.Sound(cue_path)  
-                    cue_channel.play(cue_sound)
-
-                    payload = {
-                        "Engine": "neural",
-                        "VoiceId": "proplus-Aurora",
-                        "LanguageCode": "en-US",
-                        "Text": chosen_line,
-                        "OutputFormat": "mp3",
-                        "SampleRate": "48000"
-                    }
-                    headers = {
-                        "Authorization": "Bearer api-key-here",
-                        "Content-Type": "application/json"
-                    }
-
-                    r = requests.post("https://developer.voicemaker.in/voice/api", json=payload, headers=headers)
-                    if r.status_code == 200 and r.json().get("success"):
-                        audio_url = r.json()["path"]
-                        audio_data = requests.get(audio_url).content
-                        
-                        with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
-                            temp_audio.write(audio_data)
-                            tts_path = temp_audio.name
+                # the cue plays on the sfx bus and the line on the voice bus (fading out anything still talking)
+                    init_mixer()
+                    play_sfx(resource_path("audio_restart.mp3"))
 
-                        pygame.mixer.music.load(tts_path)
-                        pygame.mixer.music.play()  
+                    audio_data = synthesize_speech(chosen_line)
+                    if audio_data is not None:
+                        play_audio(audio_data, interrupt=True, label="restart", cache_pcm=True).wait()
 
-                    # waits
-                        while pygame.mixer.music.get_busy() or cue_channel.get_busy():
-                            time.sleep(0.05)
-
-                        pygame.mixer.music.unload()
-                        try:
-                            os.remove(tts_path)
-                        except Exception:
-
-                            pass
-                    else:
-                        print("[Error] [Restart] - Voicemaker API error:", getattr(r, "text", r))
+                # waits for the cue too
+                    get_mixer().bus("sfx").wait_idle(timeout=5)
 
                 except Exception as e:
                     print("[Error] [Restart] - audio error:", e)
@@ -0,0 +1,275 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_animation.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: One shared clock that drives every animated widget in Jazmin
+# Last date edited: (10/19/26 23:58)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import math
+import time
+import tkinter as tk
+from typing import Callable, List, Optional, Tuple
+
+# GUI libraries
+from PIL import Image, ImageTk
+
+# Jazmin modules
+from jazmin_dispatcher import ui_post
+
+
+# how often a covered (but still mapped) animation re-checks if it can be seen again
+OCCLUDED_POLL_MS = 500
+DUE_SLACK_MS = 1.0           # a frame due this soon is shown now instead of sleeping a whole frame_ms for it
+
+
+# Function: _now_ms, monotonic time in milliseconds
+def _now_ms() -> float:
+    return time.perf_counter() * 1000.0
+
+
+# Class: AnimationClock
+    # runs a single after() chain for every registered animation, never faster than gui.target_fps
+    # hidden, covered and iconified animations get no frames, and with nothing visible the chain stops
+
+class AnimationClock:
+    def __init__(self, fps: int = 60):
+        self._root: Optional[tk.Misc] = None
+        self._after_id: Optional[str] = None
+        self._animations: List["GIFLooper"] = []
+        self._paused = False
+        self._tick_due: Optional[float] = None
+        self._optimizer = None
+        self.frame_ms = 1000.0 / max(1, fps)
+
+# Function: attach, binds to the root window and follows iconify/restore
+    def attach(self, root: tk.Misc) -> None:
+        self._root = root
+
+        try:
+            import jazmin_optimizer as jo
+            self._optimizer = jo.load_optimizer()
+            self.set_fps(self._optimizer.get_param("gui.target_fps", 60))
+            # the tuner runs off the Tk thread, so the new cap is handed over through the dispatcher
+            self._optimizer.on_param_change("gui.target_fps", lambda fps: ui_post(self.set_fps, fps, key=("clock", "fps")))
+        except Exception as e:
+            print("[Jazmin] [Animation] - Optimizer unavailable, using defaults:", e)
+
+    # the root's bindtag is on every widget in the window so this also sees children mapping in
+        root.bind("<Unmap>", self._on_unmap, add="+")
+        root.bind("<Map>", self._on_map, add="+")
+        print(f"[Jazmin] [Animation] - Clock attached ({1000.0 / self.frame_ms:.0f} fps cap)")
+
+# Function: set_fps, changes the frame cap for every animation
+    def set_fps(self, fps: float) -> None:
+        self.frame_ms = 1000.0 / max(1.0, float(fps))
+        self.wake()
+
+# Function: register, adds an animation to the clock
+    def register(self, anim: "GIFLooper") -> None:
+        if anim not in self._animations:
+            self._animations.append(anim)
+        self.wake()
+
+# Function: unregister, removes an animation from the clock
+    def unregister(self, anim: "GIFLooper") -> None:
+        if anim in self._animations:
+            self._animations.remove(anim)
+
+# Function: wake, runs a tick as soon as possible (after show_frame, a map, or new frames)
+    def wake(self) -> None:
+        if self._root is None or self._paused:
+            return
+        self._cancel()
+        self._tick_due = None
+        self._after_id = self._root.after_idle(self._tick)
+
+    def _cancel(self) -> None:
+        if self._after_id is not None and self._root is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+        self._after_id = None
+
+    def _on_unmap(self, event) -> None:
+        if event.widget is self._root and self._root.state() == "iconic":
+            self._paused = True
+            self._cancel()
+            print("[Jazmin] [Animation] - Window minimized, animations paused")
+
+    def _on_map(self, event) -> None:
+        if event.widget is self._root and self._paused:
+            self._paused = False
+            print("[Jazmin] [Animation] - Window restored, animations resumed")
+        self.wake()
+
+# Function: _covered, true when another widget fully hides the visible part of the animation
+    def _covered(self, anim: "GIFLooper") -> bool:
+        root = self._root
+        x0 = max(anim.winfo_rootx(), root.winfo_rootx())
+        y0 = max(anim.winfo_rooty(), root.winfo_rooty())
+        x1 = min(anim.winfo_rootx() + anim.winfo_width(), root.winfo_rootx() + root.winfo_width())
+        y1 = min(anim.winfo_rooty() + anim.winfo_height(), root.winfo_rooty() + root.winfo_height())
+        if x1 <= x0 or y1 <= y0:
+            return True
+
+        top = anim.winfo_containing((x0 + x1) // 2, (y0 + y1) // 2)
+        if top is None or top is anim or str(top).startswith(str(anim) + "."):
+            return False
+
+        return (top.winfo_rootx() <= x0 and top.winfo_rooty() <= y0
+                and top.winfo_rootx() + top.winfo_width() >= x1
+                and top.winfo_rooty() + top.winfo_height() >= y1)
+
+    def _tick(self) -> None:
+        self._after_id = None
+        if self._paused or self._root is None:
+            return
+
+        now = _now_ms()
+        soonest: Optional[float] = None
+        if self._tick_due is not None:
+            self._measure(lambda opt: opt.measure_after_lateness(now - self._tick_due))
+
+        for anim in list(self._animations):
+            try:
+                if not anim.winfo_exists():
+                    self.unregister(anim)
+                    continue
+                if not anim.winfo_viewable():
+                    continue  # a <Map> will wake the clock again
+
+                if now + DUE_SLACK_MS >= anim.next_due:
+                    if not anim.frames or self._covered(anim):
+                        anim.next_due = now + OCCLUDED_POLL_MS
+                    else:
+                        lateness, dropped = anim.step(now, self.frame_ms + 2 * DUE_SLACK_MS)
+                        self._measure(lambda opt: opt.measure_gif_frame(lateness, dropped))
+
+            except tk.TclError:
+                self.unregister(anim)
+                continue
+
+            soonest = anim.next_due if soonest is None else min(soonest, anim.next_due)
+
+        if soonest is not None:
+            delay = math.ceil(max(self.frame_ms, soonest - now))  # rounding down would wake just before the frame is due
+            self._tick_due = now + delay
+            self._after_id = self._root.after(delay, self._tick)
+
+    def _measure(self, record) -> None:
+        if self._optimizer is not None:
+            try:
+                record(self._optimizer)
+            except Exception:
+                pass
+
+
+# shared clock for the whole app
+_clock = AnimationClock()
+
+# Function: get_clock, returns the shared animation clock
+def get_clock() -> AnimationClock:
+    return _clock
+
+
+# Class: GIFLooper
+    # a label that loops preloaded GIF frames, timed by the shared AnimationClock instead of its own after() chain
+    # used for the menu loop and the main application background
+
+class GIFLooper(tk.Label):
+    def __init__(self, master, frames, delays, clock: Optional[AnimationClock] = None):
+        tk.Label.__init__(self, master)
+        self.master = master; self.frames = frames; self.delays = delays; self.frame_index = 0
+        self.clock = clock or _clock
+        self.next_due = _now_ms()
+
+        if self.frames:
+            self.config(image=self.frames[0])
+            self.next_due += self._delay(0)
+
+        self.bind("<Destroy>", lambda e: self.clock.unregister(self) if e.widget is self else None, add="+")
+        self.clock.register(self)
+
+# Function: _delay, display time for a frame (GIFs often store 0 which browsers treat as ~100ms)
+    def _delay(self, index: int) -> float:
+        delay = self.delays[index] if index < len(self.delays) else 100
+        return delay if delay >= 20 else 100
+
+# Function: step, moves to the frame that should be on screen now, skipping any that were missed
+    # returns (how late the frame is in ms, how many frames were dropped to catch up)
+    # a skipped frame due within grace_ms (one clock frame) was skipped by the fps cap, not dropped, and is not counted
+    def step(self, now: float, grace_ms: float = 0.0) -> Tuple[float, int]:
+        count = len(self.frames)
+        lateness = max(0.0, now - self.next_due)
+        if lateness > sum(self._delay(i) for i in range(count)):
+            self.next_due = now  # was hidden for a while, restart the cycle timing from here
+            lateness = 0.0
+
+        index = self.frame_index
+        dues: List[float] = []
+        while self.next_due <= now + DUE_SLACK_MS:
+            dues.append(self.next_due)
+            index = (index + 1) % count
+            self.next_due += self._delay(index)
+
+        self.frame_index = index
+        self.config(image=self.frames[index])
+
+        return lateness, sum(1 for due in dues[:-1] if due < now - grace_ms)
+
+
+# frame loading helpers used by the boot pipeline
+
+# Function: decode_gif_frames, decodes every GIF frame with PIL (safe off the Tk thread)
+def decode_gif_frames(gif_path: str) -> Tuple[List[Image.Image], List[int]]:
+    images: List[Image.Image] = []; delays: List[int] = []
+    gif = Image.open(gif_path)
+
+    try:
+        while True:
+            images.append(gif.copy())
+            delays.append(gif.info.get('duration', 100))
+            gif.seek(len(images))
+    except EOFError:
+        pass
+
+    return images, delays
+
+# Function: fill_photo_frames, turns decoded frames into PhotoImages a few per event loop pass (Tk thread only)
+    # frames/delays are filled in place so a GIFLooper that already holds them starts animating as they arrive
+def fill_photo_frames(widget: tk.Misc, images: List[Image.Image], src_delays: List[int], frames: list, delays: list,
+                      per_pass: int = 4, on_done: Optional[Callable[[], None]] = None) -> None:
+    pending = list(zip(images, src_delays))
+
+    def fill_next():
+        for image, delay in pending[:per_pass]:
+            frames.append(ImageTk.PhotoImage(image))
+            delays.append(delay)
+        del pending[:per_pass]
+
+        if pending:
+            widget.after(1, fill_next)
+        elif on_done:
+            on_done()
+
+    fill_next()
+
+
+__all__ = [
+    "AnimationClock",
+    "GIFLooper",
+    "get_clock",
+    "decode_gif_frames",
+    "fill_photo_frames",
+]
+
+# End, Spencer
@@ -4,7 +4,7 @@
 # GitHub  : https://github.com/spencebarton/jazmin
 # License : MIT License
 # Descript: Most of Jazmin's background applications happen here
-# Last date edited: (08/10/25 21:36)
+# Last date edited: (10/19/26 21:20)
 
 # Copyright (c) 2025 Spencer Barton 
 # Managed through Jazmin and SBD. All rights reserved. 
@@ -38,7 +38,6 @@ from tkVideoPlayer import TkinterVideo
 # Audio libraries
 import pygame
 from pygame import mixer
-from playsound import playsound
 
 # Web and requests libraries
 import requests
@@ -55,12 +54,20 @@ from colorama import Fore, Style
 import winshell
 from win32com.client import Dispatch
 
+# Jazmin modules
+from jazmin_dispatcher import ui_insert, ui_replace_text, ui_backspace
+from jazmin_http import http_post, http_get, get_openai_client, synthesize_speech, tts_cache_path
+from jazmin_audio import init_mixer, start_audio_device, wait_for_music, StageTimes
+from jazmin_sfx import play_sfx
+from jazmin_player import audio_lock, speak
+from jazmin_mixer import get_mixer
+
 # Misplaced libraries
 from ast import Lambda       
 from turtle import width, window_width  
 
-pygame.mixer.init()
-audio_lock = threading.Lock()
+# opens the audio device on its own thread as soon as Jazmin starts, whatever plays first waits for it there
+start_audio_device()
 chat_history = []
 username2 = os.getlogin()
 console_opened = False
@@ -102,9 +109,8 @@ def cancel_menu_messages(tk_root=None):
     suppress_nag = True
 
     try:
-        if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
-            pygame.mixer.music.stop()
-            pygame.mixer.music.unload()
+        if get_mixer().voice_busy():
+            get_mixer().bus("voice").stop()
 
     except Exception as e:
         print("[Cancel Menu] - mixer stop/unload error:", e)
@@ -243,50 +249,32 @@ def built_console():
     threading.Thread(target=monitor_keys, daemon=True).start()
 
 # Function: api_boot_audio()
-    # Calls the Voicemaker API to synthesize speech from the greeting message, plays the resulting MP3 with pygame, then deletes it
+    # Speaks the greeting message, from the TTS cache when it was spoken (or prewarmed) before, otherwise through the Voicemaker API
+    # plays the resulting MP3 with pygame, then deletes the temp file
 def api_boot_audio():
     try:
-        api_key = os.getenv("VOICEMAKER_API_KEY", "your-api-key-here")
-        api_url = "https://developer.voicemaker.in/voice/api"
-        headers = {
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json"
-        }
         api_message = get_wait_message()
-        params = {
-            "Engine": "neural",
-            "VoiceId": "proplus-Aurora",
-            "LanguageCode": "en-US",
-            "Text": api_message,
-            "OutputFormat": "mp3",
-            "SampleRate": "48000"
-        }
+        cached = tts_cache_path(api_message).exists()
 
-        if internetConnect():
-            print("[Internet] [Jazmin] - Internet connection detected. Calling API")
-            response = requests.post(api_url, json=params, headers=headers)
-
-            if response.status_code == 200 and response.json().get("success"):
-                audio_url = response.json()["path"]
-                audio_response = requests.get(audio_url)
+        if cached or internetConnect():
+            if not cached:
+                print("[Internet] [Jazmin] - Internet connection detected. Calling API")
+            audio = synthesize_speech(api_message)
 
+            if audio is not None:
                 with audio_lock:
                     with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
-                        temp_audio.write(audio_response.content)
+                        temp_audio.write(audio)
                         temp_path = temp_audio.name
 
                     pygame.mixer.music.load(temp_path)
                     pygame.mixer.music.play()
 
-                    while pygame.mixer.music.get_busy():
-                        time.sleep(0.1)
+                    wait_for_music()
 
                     pygame.mixer.music.unload()
                     os.remove(temp_path)
 
-            else:
-                print("[Error] [api_boot_audio, j_a] - API Error:", response.json())
-
         else:
             print("[Internet] [Jazmin] - No internet. Skipping TTS")
 
@@ -312,7 +300,7 @@ except ImportError:
 openai_api_key = os.getenv("OPENAI_API_KEY", "your-api-key-here")
 voicemaker_api_key = os.getenv("VOICEMAKER_API_KEY", "your-api-key-here")
 voicemaker_api_url = "https://developer.voicemaker.in/voice/api"
-client = OpenAI(api_key=openai_api_key)
+client = get_openai_client()
 
 # Function: handle_text_to_speech()
     # go off a background thread to process and speak a Jazmin response
@@ -328,6 +316,7 @@ def handle_text_to_speech(user_text, audio_muted=False, system_override=None, re
 def JazminOpenAPI(user_text, audio_muted, system_override=None, reset_chat=False):
     global chat_history
 
+    stages = StageTimes()
     try:
         if reset_chat:
             chat_history = []
@@ -354,81 +343,29 @@ def JazminOpenAPI(user_text, audio_muted, system_override=None, reset_chat=False
             model="gpt-4", messages=chat_history, temperature=0.7, max_tokens=20)
 
         api_message = response.choices[0].message.content.strip()
+        stages.mark("llm_done")
         chat_history.append({"role": "assistant", "content": api_message})
         print("[Jazmin] [Menu Message] - Jazmin says:", api_message)
-        api_audio_get(api_message, audio_muted)
+        api_audio_get(api_message, audio_muted, stages=stages)
 
     except Exception as e:
         print("[Error] [JazminOpenAI, j_a] - OpenAI error:", e)
 
-# for muting audio
-audio_lock = threading.Lock() 
+# Function: log_speak_error()
+    # completion callback for speak(), prints why a line could not be played
+def log_speak_error(handle, section):
+    if handle.status == "error":
+        print(f"[Error] [{section}, j_a] - Voice playback failed:", handle.error)
 
 # Function: api_audio_get()
-    # sends the message to Voicemaker API, plays audio response, and cleans up file
-def api_audio_get(api_message, audio_muted):
-    with audio_lock:
-        try:
-            headers = {
-                "Authorization": f"Bearer {voicemaker_api_key}",
-                "Content-Type": "application/json"
-            }
-            params = {
-                "Engine": "neural",
-                "VoiceId": "proplus-Aurora",
-                "LanguageCode": "en-US",
-                "Text": api_message,
-                "OutputFormat": "mp3",
-                "SampleRate": "48000"
-            }
-
-            response = requests.post(voicemaker_api_url, json=params, headers=headers)
-
-            if response.status_code == 200 and response.json().get("success"):
-                audio_url = response.json()["path"]
-                audio_response = requests.get(audio_url)
-
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
-                    temp_audio.write(audio_response.content)
-                    filename = temp_audio.name
-
-                time.sleep(0.15)  
-
-                if not audio_muted:
-                    try:
-                        pygame.mixer.stop()
-                        if pygame.mixer.get_init() and pygame.mixer.music.get_busy():
-                            pygame.mixer.music.stop()
-                            pygame.mixer.music.unload()
-                        time.sleep(0.1)
-
-                        # Play new message exclusively
-                        pygame.mixer.music.load(filename)
-                        pygame.mixer.music.play()
-                        while pygame.mixer.music.get_busy():
-                            time.sleep(0.1)
-
-                        pygame.mixer.music.unload()
-
-                    except Exception as audio_err:
-                        print("[Error] [api_audio_get, j_a] - Audio playback failed:", audio_err)
-
-                else:
-                    print(f"[Jazmin] [Menu Message] - Muted, skipping playback of {filename}")
-
-            else:
-                print("[Error] [api_audio_get, j_a] - Voicemaker API error:", response.json())
-
-        except Exception as e:
-            print("[Error] [api_audio_get, j_a] - Audio fetch/playback error:", e)
+    # queues the message on the speak queue (Voicemaker, then the voice bus) and waits for it
+    # muted or stale lines are dropped before the API call, a line that is already playing is faded out
+def api_audio_get(api_message, audio_muted, kind="menu", stages=None):
+    handle = speak(api_message, kind=kind, muted=audio_muted, interrupt=True, use_cache=False, stages=stages)
+    handle.wait()
 
-        finally:
-            if 'filename' in locals() and os.path.exists(filename):
-                try:
-                    os.remove(filename)
-                    print(f"[Jazmin] [Menu Message] - Deleted {filename}")
-                except Exception as delete_err:
-                    print(f"[Error] [api_audio_get, j_a] - Couldn't delete {filename}: {delete_err}")
+    if handle.status == "error":
+        print("[Error] [api_audio_get, j_a] - Audio fetch/playback error:", handle.error)
 
 # Function: get_windows_first_name()
     # attempts to extract the user's first name from their Windows profile
@@ -481,7 +418,7 @@ def nag_user_to_login(tk_root=None, delay_ms=random.randint(6800, 7000), audio_m
                 from jazmin_application import suppress_nag
 
                 print("[Jazmin] [Menu Message] - Waiting for audio channel to be free...")
-                while pygame.mixer.music.get_busy():
+                while get_mixer().voice_busy():
                     time.sleep(0.1)
 
                 if suppress_nag:
@@ -540,7 +477,7 @@ def user_force_exit(jazmin_instance, exit_line=None):
                 "Peace out."
             ]
             message = exit_line or random.choice(goodbye_lines)
-            mixer.init()
+            init_mixer()
 
             if mixer.get_init() and mixer.music.get_busy():
                 mixer.music.stop()
@@ -549,7 +486,7 @@ def user_force_exit(jazmin_instance, exit_line=None):
 
             sfx_path = resource_path("audio_shutdown.mp3")
             if os.path.exists(sfx_path):
-                mixer.Sound(sfx_path).play()
+                play_sfx(sfx_path)
 
             payload = {
                 "Engine": "neural",
@@ -564,10 +501,10 @@ def user_force_exit(jazmin_instance, exit_line=None):
                 "Content-Type": "application/json"
             }
 
-            r = requests.post("https://developer.voicemaker.in/voice/api", json=payload, headers=headers)
+            r = http_post("https://developer.voicemaker.in/voice/api", json=payload, headers=headers)
             if r.status_code == 200 and r.json().get("success"):
                 audio_url = r.json()["path"]
-                audio_data = requests.get(audio_url).content
+                audio_data = http_get(audio_url).content
 
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
                     temp_audio.write(audio_data)
@@ -575,8 +512,7 @@ def user_force_exit(jazmin_instance, exit_line=None):
 
                 mixer.music.load(temp_path)
                 mixer.music.play()
-                while mixer.music.get_busy():
-                    time.sleep(0.1)
+                wait_for_music()
 
                 mixer.music.unload()
                 os.remove(temp_path)
@@ -601,7 +537,7 @@ def user_force_exit(jazmin_instance, exit_line=None):
 def is_audio_playing():
     try:
 
-        return pygame.mixer.get_init() and pygame.mixer.music.get_busy()
+        return get_mixer().voice_busy()
 
     except Exception as e:
         print("[Jazmin] [Ambience] - Audio check failed:", e)
@@ -611,8 +547,6 @@ def is_audio_playing():
 # Function: periodic_hold_on_checker() [Ambience]
     # ambient message function that determines what Jazmin does
 def periodic_hold_on_checker(audio_status):
-    from jazmin_application import api_audio_get
-
     def check_loop():
         ambient_context = {
             "last_emotion": None,
@@ -720,7 +654,7 @@ def periodic_hold_on_checker(audio_status):
                 print(f"[Jazmin] [Ambience] - Paused, user inactive for {idle_time:.1f}s")
                 continue
 
-            if not pygame.mixer.music.get_busy() and not audio_status["muted"]:
+            if not get_mixer().voice_busy() and not audio_status["muted"]:
                 simulate_energy_drain()
 
                 if should_speak():
@@ -729,7 +663,7 @@ def periodic_hold_on_checker(audio_status):
                     print(f"[Jazmin] [Ambience] - ({emotion}) -> {line}")
 
                     log_reaction(emotion, line)
-                    threading.Thread(target=api_audio_get, args=(line, False), daemon=True).start()
+                    speak(line, kind="ambience", muted=lambda: audio_status["muted"])
 
                     ambient_context["consecutive_silences"] = 0
                 else:
@@ -743,9 +677,6 @@ def periodic_hold_on_checker(audio_status):
     threading.Thread(target=check_loop, daemon=True).start()
 
 
-if not pygame.mixer.get_init():
-    pygame.mixer.init()
-
 voicemaker_api_key = os.getenv("VOICEMAKER_API_KEY", "your-api-key-here")
 voicemaker_api_url = "https://developer.voicemaker.in/voice/api"
 
@@ -755,15 +686,15 @@ def handle_fallback_response(text, output_box, audio_muted=False):
     print("[Jazmin] - Fallback triggered. Typing and speaking:", text)
 
     def type_out():
-        output_box.delete("1.0", "end")
+        ui_replace_text(output_box, "")
         for char in text:
-            output_box.insert("end", char)
+            ui_insert(output_box, "end", char)
             time.sleep(0.05)
 
         time.sleep(random.uniform(4, 6))
 
-        while output_box.get("1.0", "end-1c").strip():
-            output_box.delete("end-2c", "end-1c")
+        for _ in text:
+            ui_backspace(output_box)
             time.sleep(0.04)
 
     def speak_out():
@@ -782,10 +713,10 @@ def handle_fallback_response(text, output_box, audio_muted=False):
                 "SampleRate": "48000"
             }
 
-            response = requests.post(voicemaker_api_url, json=params, headers=headers)
+            response = http_post(voicemaker_api_url, json=params, headers=headers)
             if response.status_code == 200 and response.json().get("success"):
                 audio_url = response.json()["path"]
-                audio_response = requests.get(audio_url)
+                audio_response = http_get(audio_url)
 
                 with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
                     temp_audio.write(audio_response.content)
@@ -803,8 +734,7 @@ def handle_fallback_response(text, output_box, audio_muted=False):
 
                         pygame.mixer.music.load(filename)
                         pygame.mixer.music.play()
-                        while pygame.mixer.music.get_busy():
-                            time.sleep(0.1)
+                        wait_for_music()
 
                         pygame.mixer.music.unload()
 
@@ -838,40 +768,9 @@ def jazmin_handle_text_to_speech():
 
                                                 api_message = (username)
                                                 print("[Jazmin] [Output] - jazmin_handle_text_to_speech() accessed")
-                                                                                               
-                                                api_key = os.getenv("VOICEMAKER_API_KEY", "your-api-key-here")
-                                                api_url = "https://developer.voicemaker.in/voice/api"
-                                                headers = {
-                                                    "Authorization": f"Bearer {api_key}",
-                                                    "Content-Type": "application/json"
-                                                }
-                                                params = {
-                                                    "Engine": "neural",
-                                                    "VoiceId": "proplus-Aurora",
-                                                    "LanguageCode": "en-US",
-                                                    "Text": api_message,
-                                                    "OutputFormat": "mp3",
-                                                    "SampleRate": "48000"
-                                                }
-
-                                        # api requests and play the audio in a separate thread
-                                                def api_audio_get():
-                                                    try:
-                                                        response = requests.post(api_url, json=params, headers=headers)
-                                                        if response.status_code == 200 and response.json().get("success"):
-                                                            audio_url = response.json()["path"]
-                                                            audio_response = requests.get(audio_url)
-                                                            with open("output.mp3", "wb") as f:
-                                                                f.write(audio_response.content)
-                                                            playsound("output.mp3")
-                                                            os.remove("output.mp3")
-                                                        else:
-                                                            print("[Error] [Jazmin] [Output] - ", response.json())
-                                                    except Exception as e:
-                                                        print("[Error] [Jazmin] [Output] - ", e)
-
-                                        # jazmin voice thread
-                                                threading.Thread(target=api_audio_get, daemon=True).start()
+
+                                        # the speak queue fetches and plays it without blocking
+                                                speak(api_message, kind="menu")
 
 
 # Handling for ignored timeouts Jazmin processes when she feels ignored by the user:
@@ -890,20 +789,16 @@ def handle_ignored_timeout(jazmin_output_entry):
         message = "I don't have internet!"
 
         def type_response():
-            jazmin_output_entry.delete("1.0", "end")
+            ui_replace_text(jazmin_output_entry, "")
             for char in message:
-                jazmin_output_entry.insert('end', char)
+                ui_insert(jazmin_output_entry, 'end', char)
                 time.sleep(0.05)
 
         threading.Thread(target=type_response, daemon=True).start()
         
         return
 
-    openai_api_key = os.getenv("OPENAI_API_KEY", "your-api-key-here")
-    voicemaker_api_key = os.getenv("VOICEMAKER_API_KEY", "your-api-key-here")
-    voicemaker_api_url = "https://developer.voicemaker.in/voice/api"
-
-    client = OpenAI(api_key=openai_api_key)
+    client = get_openai_client()
     messages = [
         {"role": "system", "content": (
             "You are Jasmine. You are witty, emotionally aware, and get slightly annoyed if someone ignores you."
@@ -925,9 +820,9 @@ def handle_ignored_timeout(jazmin_output_entry):
         print("[Jazmin] [Ignored Timeout] [1] - Message is: ", message)
 
         def type_response():
-            jazmin_output_entry.delete("1.0", "end")
+            ui_replace_text(jazmin_output_entry, "")
             for char in message:
-                jazmin_output_entry.insert('end', char)
+                ui_insert(jazmin_output_entry, 'end', char)
                 time.sleep(0.05)
 
         def delayed_delete():
@@ -935,9 +830,8 @@ def handle_ignored_timeout(jazmin_output_entry):
 
             def delete_one_by_one():
                 try:
-                    while jazmin_output_entry.get("1.0", "end-1c").strip():
-                        current = jazmin_output_entry.get("1.0", "end-1c")
-                        jazmin_output_entry.delete("end-2c", "end-1c")
+                    for _ in message:
+                        ui_backspace(jazmin_output_entry)
                         time.sleep(0.04)
                 except Exception as e:
                     print("[Jazmin] [Ignored Timeout] [1] - Failed to delete message slowly:", e)
@@ -947,37 +841,10 @@ def handle_ignored_timeout(jazmin_output_entry):
         threading.Thread(target=delayed_delete, daemon=True).start()
 
         def speak_response():
-            try:
-                headers = {
-                    "Authorization": f"Bearer {voicemaker_api_key}",
-                    "Content-Type": "application/json"
-                }
-                params = {
-                    "Engine": "neural",
-                    "VoiceId": "proplus-Aurora",
-                    "LanguageCode": "en-US",
-                    "Text": message,
-                    "OutputFormat": "mp3",
-                    "SampleRate": "48000"
-                }
-
-                response = requests.post(voicemaker_api_url, json=params, headers=headers)
-                if response.status_code == 200 and response.json().get("success"):
-                    audio_url = response.json()["path"]
-                    audio_response = requests.get(audio_url)
-
-                    with open("jazmin_ignored.mp3", "wb") as f:
-                        f.write(audio_response.content)
-
-                    playsound("jazmin_ignored.mp3")
-                    os.remove("jazmin_ignored.mp3")
-                else:
-                    print("[Error] [handle_ignored_timeout, j_a] - Voicemaker failed:", response.json())
-            except Exception as e:
-                print("[Error] [handle_ignored_timeout, j_a] - Voice playback failed:", e)
+            speak(message, kind="ignored", use_cache=False, on_done=lambda h: log_speak_error(h, "handle_ignored_timeout"))
 
         threading.Thread(target=type_response, daemon=True).start()
-        threading.Thread(target=speak_response, daemon=True).start()
+        speak_response()
 
     except Exception as e:
         print("[Error] [handle_ignored_timeout, j_a] - OpenAI failed to generate sassy ignored message:", e)
@@ -993,12 +860,8 @@ def handle_double_ignored_timeout(jazmin_output_entry):
         return
 
 
-    # Keys and API setup
-    openai_api_key = os.getenv("OPENAI_API_KEY", "your-api-key-here")
-    voicemaker_api_key = os.getenv("VOICEMAKER_API_KEY", "your-api-key-here")
-    voicemaker_api_url = "https://developer.voicemaker.in/voice/api"
-
-    client = OpenAI(api_key=openai_api_key)
+    # API setup
+    client = get_openai_client()
 
     # Stronger prompt
     messages = [
@@ -1022,9 +885,9 @@ def handle_double_ignored_timeout(jazmin_output_entry):
         print("[Jazmin] [Ignored Timeout] [2] - :", message)
 
         def type_response():
-            jazmin_output_entry.delete("1.0", "end")
+            ui_replace_text(jazmin_output_entry, "")
             for char in message:
-                jazmin_output_entry.insert('end', char)
+                ui_insert(jazmin_output_entry, 'end', char)
                 time.sleep(0.05)
 
         def delayed_delete():
@@ -1032,9 +895,8 @@ def handle_double_ignored_timeout(jazmin_output_entry):
 
             def delete_one_by_one():
                 try:
-                    while jazmin_output_entry.get("1.0", "end-1c").strip():
-                        current = jazmin_output_entry.get("1.0", "end-1c")
-                        jazmin_output_entry.delete("end-2c", "end-1c")
+                    for _ in message:
+                        ui_backspace(jazmin_output_entry)
                         time.sleep(0.04)
                 except Exception as e:
                     print("[Jazmin] [Ignored Timeout] [2] - Failed to delete message slowly:", e)
@@ -1044,37 +906,10 @@ def handle_double_ignored_timeout(jazmin_output_entry):
         threading.Thread(target=delayed_delete, daemon=True).start()
 
         def speak_response():
-            try:
-                headers = {
-                    "Authorization": f"Bearer {voicemaker_api_key}",
-                    "Content-Type": "application/json"
-                }
-                params = {
-                    "Engine": "neural",
-                    "VoiceId": "proplus-Aurora",
-                    "LanguageCode": "en-US",
-                    "Text": message,
-                    "OutputFormat": "mp3",
-                    "SampleRate": "48000"
-                }
-
-                response = requests.post(voicemaker_api_url, json=params, headers=headers)
-                if response.status_code == 200 and response.json().get("success"):
-                    audio_url = response.json()["path"]
-                    audio_response = requests.get(audio_url)
-
-                    with open("jazmin_extra_ignored.mp3", "wb") as f:
-                        f.write(audio_response.content)
-
-                    playsound("jazmin_extra_ignored.mp3")
-                    os.remove("jazmin_extra_ignored.mp3")
-                else:
-                    print("[Error] [handle_double_ignored_timeout, j_a] - Voicemaker failed:", response.json())
-            except Exception as e:
-                print("[Error] [handle_double_ignored_timeout, j_a] - Voice playback failed:", e)
+            speak(message, kind="ignored", use_cache=False, on_done=lambda h: log_speak_error(h, "handle_double_ignored_timeout"))
 
         threading.Thread(target=type_response, daemon=True).start()
-        threading.Thread(target=speak_response, daemon=True).start()
+        speak_response()
 
     except Exception as e:
         print("[Error] [handle_double_ignored_timeout, j_a] - OpenAI failed to generate extra annoyed message:", e)
@@ -1088,12 +923,8 @@ def handle_final_ignored_timeout(jazmin_output_entry):
         print("[Jazmin] [Ignored Timeout] [Final] - Output not empty, skipping timeout reaction")
         return
 
-    # Keys and API setup
-    openai_api_key = os.getenv("OPENAI_API_KEY", "your-api-key-here")
-    voicemaker_api_key = os.getenv("VOICEMAKER_API_KEY", "your-api-key-here")
-    voicemaker_api_url = "https://developer.voicemaker.in/voice/api"
-
-    client = OpenAI(api_key=openai_api_key)
+    # API setup
+    client = get_openai_client()
 
     # Prompt for final annoyed message before shutdown
     messages = [
@@ -1119,44 +950,17 @@ def handle_final_ignored_timeout(jazmin_output_entry):
         print("[Jazmin] [Ignored Timeout] [Final] - :", message)
 
         def type_response():
-            jazmin_output_entry.delete("1.0", "end")
+            ui_replace_text(jazmin_output_entry, "")
             for char in message:
-                jazmin_output_entry.insert('end', char)
+                ui_insert(jazmin_output_entry, 'end', char)
                 time.sleep(0.05)
 
         def speak_response():
-            try:
-                headers = {
-                    "Authorization": f"Bearer {voicemaker_api_key}",
-                    "Content-Type": "application/json"
-                }
-                params = {
-                    "Engine": "neural",
-                    "VoiceId": "proplus-Aurora",
-                    "LanguageCode": "en-US",
-                    "Text": message,
-                    "OutputFormat": "mp3",
-                    "SampleRate": "48000"
-                }
-
-                response = requests.post(voicemaker_api_url, json=params, headers=headers)
-                if response.status_code == 200 and response.json().get("success"):
-                    audio_url = response.json()["path"]
-                    audio_response = requests.get(audio_url)
-
-                    with open("jazmin_final_ignored.mp3", "wb") as f:
-                        f.write(audio_response.content)
-
-                    playsound("jazmin_final_ignored.mp3")
-                    os.remove("jazmin_final_ignored.mp3")
-                else:
-                    print("[Error] [handle_final_ignored_timeout, j_a] - Voicemaker failed:", response.json())
-            except Exception as e:
-                print("[Error] [handle_final_ignored_timeout, j_a] - Voice playback failed:", e)
+            speak(message, kind="ignored", use_cache=False, on_done=lambda h: log_speak_error(h, "handle_final_ignored_timeout"))
 
         # Run both typing and speaking in parallel
         threading.Thread(target=type_response, daemon=True).start()
-        threading.Thread(target=speak_response, daemon=True).start()
+        speak_response()
 
         # Shutdown after 10 seconds
         def delayed_shutdown():
@@ -1168,8 +972,7 @@ def handle_final_ignored_timeout(jazmin_output_entry):
 
     except Exception as e:
         print("[Error] [handle_final_ignored_timeout, j_a] - Failed to generate final shutdown:", e)
-        jazmin_output_entry.delete("1.0", "end")
-        jazmin_output_entry.insert('end', "I'm done. Bye.")
+        ui_replace_text(jazmin_output_entry, "I'm done. Bye.")
         time.sleep(2)
         os._exit(0)
 
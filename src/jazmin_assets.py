@@ -0,0 +1,154 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_assets.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Prepares display-ready copies of Jazmin's heavy assets and keeps them in a local cache
+# Last date edited: (10/19/26 13:02)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+
+# the window is fixed at this size (jazmin.resizable(0,0)) so videos are rendered to it once
+DISPLAY_SIZE: Tuple[int, int] = (924, 520)
+
+# encoders tried in order, libx264 is not in every PyAV build
+VIDEO_ENCODERS = ("libx264", "h264", "mpeg4")
+
+
+# Function: app_data_dir()
+    # returns Jazmin's per-user data folder (LOCALAPPDATA on Windows, ~/.cache elsewhere) and creates it
+def app_data_dir() -> Path:
+    base = os.getenv("LOCALAPPDATA") or str(Path.home() / ".cache")
+    path = Path(base) / "Jazmin"
+    path.mkdir(parents=True, exist_ok=True)
+
+    return path
+
+# Function: asset_cache_dir()
+    # folder for prepared assets
+def asset_cache_dir() -> Path:
+    path = app_data_dir() / "cache"
+    path.mkdir(parents=True, exist_ok=True)
+
+    return path
+
+# Function: prescaled_video_path()
+    # cache file for a video at a given size, keyed on the source file so a new build replaces it
+def prescaled_video_path(src: str | Path, size: Tuple[int, int] = DISPLAY_SIZE) -> Path:
+    src = Path(src)
+    st = src.stat()
+    key = hashlib.sha1(f"{src.name}:{st.st_size}:{int(st.st_mtime)}".encode("utf-8")).hexdigest()[:10]
+
+    return asset_cache_dir() / f"{src.stem}_{size[0]}x{size[1]}_{key}.mp4"
+
+# Function: video_for_display()
+    # returns (path to play, whether the player still has to scale it)
+    # uses the prepared copy when it exists, otherwise the original with runtime scaling
+def video_for_display(src: str | Path, size: Tuple[int, int] = DISPLAY_SIZE) -> Tuple[str, bool]:
+    try:
+        cached = prescaled_video_path(src, size)
+        if cached.exists():
+            return str(cached), False
+    except OSError:
+        pass
+
+    return str(src), True
+
+# Function: prepare_video()
+    # decodes the source once, resizes every frame to the display size and writes it to the cache
+    # returns the cached path or None if it could not be prepared (the original is then played scaled)
+def prepare_video(src: str | Path, size: Tuple[int, int] = DISPLAY_SIZE) -> Optional[str]:
+    try:
+        import av  # installed with tkVideoPlayer
+    except ImportError as e:
+        print("[Jazmin] [Assets] - PyAV not available, videos will be scaled at runtime:", e)
+        return None
+
+    try:
+        dest = prescaled_video_path(src, size)
+    except OSError as e:
+        print(f"[Jazmin] [Assets] - Missing video {src}: {e}")
+        return None
+
+    if dest.exists():
+        return str(dest)
+
+    for old in dest.parent.glob(f"{Path(src).stem}_{size[0]}x{size[1]}_*.mp4"):
+        try:
+            old.unlink()  # copy of an older build of the same clip
+        except OSError:
+            pass
+
+    part = dest.with_suffix(".part.mp4")
+    t0 = time.perf_counter()
+    try:
+        with av.open(str(src)) as inp:
+            in_stream = inp.streams.video[0]
+            rate = in_stream.average_rate or in_stream.guessed_rate or 30
+
+            with av.open(str(part), "w") as out:
+                out_stream = None
+                for codec in VIDEO_ENCODERS:
+                    try:
+                        out_stream = out.add_stream(codec, rate=rate)
+                        break
+                    except Exception:
+                        continue
+                if out_stream is None:
+                    raise RuntimeError("no usable video encoder")
+
+                out_stream.width, out_stream.height = size
+                out_stream.pix_fmt = "yuv420p"
+                if out_stream.codec_context.name in ("libx264", "h264"):
+                    out_stream.options = {"crf": "18", "preset": "fast"}
+
+                frames = 0
+                for frame in inp.decode(in_stream):
+                    scaled = frame.reformat(width=size[0], height=size[1], format="yuv420p")
+                    scaled.pts = frame.pts
+                    scaled.time_base = frame.time_base
+                    for packet in out_stream.encode(scaled):
+                        out.mux(packet)
+                    frames += 1
+
+                for packet in out_stream.encode():
+                    out.mux(packet)
+
+        os.replace(part, dest)
+
+    except Exception as e:
+        print(f"[Error] [Assets] - Could not prepare {Path(src).name}:", e)
+        try:
+            part.unlink()
+        except OSError:
+            pass
+
+        return None
+
+    print(f"[Jazmin] [Assets] - Prepared {Path(src).name} at {size[0]}x{size[1]} ({frames} frames, {time.perf_counter() - t0:.1f}s)")
+
+    return str(dest)
+
+
+__all__ = [
+    "DISPLAY_SIZE",
+    "app_data_dir",
+    "asset_cache_dir",
+    "prescaled_video_path",
+    "video_for_display",
+    "prepare_video",
+]
+
+# End, Spencer
@@ -0,0 +1,389 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_audio.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Owns the audio device (pygame's mixer, opened once off the Tk thread with the tuned buffer) and watches playback for stalls
+# Last date edited: (10/19/26 21:20)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import math
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+# Audio libraries
+import pygame
+
+# Jazmin modules
+from jazmin_trace import get_tracer, now_us
+
+
+MIXER_FREQUENCY = 44100
+MIXER_SIZE = -16            # signed 16 bit samples
+MIXER_CHANNELS = 2          # stereo
+OPEN_TIMEOUT_S = 5.0        # how long a caller waits for an open already running on the device thread
+
+
+# Function: buffer_samples, converts a buffer length in ms to the power-of-two sample count SDL wants
+def buffer_samples(ms: float, frequency: int = MIXER_FREQUENCY) -> int:
+    samples = max(1.0, ms * frequency / 1000.0)
+
+    return int(min(16384, max(256, 2 ** round(math.log2(samples)))))
+
+# Function: _optimizer, the shared optimizer or None
+def _optimizer():
+    try:
+        import jazmin_optimizer as jo
+        return jo.load_optimizer()
+    except Exception:
+        return None
+
+# Function: _buffer_ms, the current audio.buffer_ms param
+def _buffer_ms() -> float:
+    opt = _optimizer()
+
+    return float(opt.get_param("audio.buffer_ms", 160)) if opt else 160.0
+
+# Class: AudioDevice
+    # owns pygame's mixer: opened once, on its own thread (start()), so the Tk thread never waits on the sound driver
+    # frequency, sample size and channels are fixed, the buffer comes from audio.buffer_ms
+    # a new buffer size re-opens the device only once nothing plays, on the device thread and under the player's lock,
+    # so a reset never lands in the middle of a line (callers of ensure() wait for it instead)
+
+class AudioDevice:
+    def __init__(self, frequency: int = MIXER_FREQUENCY, size: int = MIXER_SIZE, channels: int = MIXER_CHANNELS):
+        self.frequency = frequency
+        self.size = size
+        self.channels = channels
+        self.samples: Optional[int] = None
+        self.error: Optional[Exception] = None
+        self.opens = 0
+        self.ready = threading.Event()
+        self._lock = threading.RLock()
+        self._thread: Optional[threading.Thread] = None
+        self._pending_ms: Optional[float] = None
+        self._listening = False
+        self._listeners: List[Callable[[], None]] = []
+
+# Function: start, opens the device on the device thread and returns straight away
+    def start(self) -> None:
+        with self._lock:
+            if self.ready.is_set() or (self._thread is not None and self._thread.is_alive()):
+                return
+            self._thread = threading.Thread(target=self._open, name="jazmin-audio", daemon=True)
+            self._thread.start()
+
+# Function: ensure, makes sure the device is open (waiting for one in progress), true if it is
+    def ensure(self, timeout: float = OPEN_TIMEOUT_S) -> bool:
+        if self.ready.is_set() and pygame.mixer.get_init():
+            return True
+
+        thread = self._thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout)
+        if not pygame.mixer.get_init():
+            self._open()
+
+        return bool(pygame.mixer.get_init())
+
+# Function: latency_ms, the output latency one device buffer adds (0 while closed)
+    def latency_ms(self) -> float:
+        init = pygame.mixer.get_init()
+        if not init or not self.samples:
+            return 0.0
+
+        return self.samples * 1000.0 / init[0]
+
+# Function: info, the open device's format, buffer and latency
+    def info(self) -> Dict[str, float]:
+        init = pygame.mixer.get_init()
+        if not init:
+            return {}
+        frequency, size, channels = init
+
+        return {"frequency": frequency, "size": size, "channels": channels, "buffer_samples": self.samples or 0,
+                "latency_ms": round(self.latency_ms(), 2), "opens": self.opens}
+
+# Function: on_reinit, fn is called after the device was re-opened
+    def on_reinit(self, fn: Callable[[], None]) -> None:
+        self._listeners.append(fn)
+
+# Function: set_buffer_ms, asks for a new buffer size, applied once the mixer is idle
+    def set_buffer_ms(self, ms: float) -> None:
+        with self._lock:
+            if not pygame.mixer.get_init():
+                return  # _open reads the new value when it runs
+            if buffer_samples(float(ms), pygame.mixer.get_init()[0]) == self.samples:
+                self._pending_ms = None
+                return
+            self._pending_ms = float(ms)
+
+        self.reinit_when_idle()
+
+# Function: reinit_when_idle, re-opens the device on the device thread if a new buffer is waiting and nothing plays
+    # wait_for_music and wait_for_channel call it when a line ends
+    def reinit_when_idle(self) -> None:
+        if self._pending_ms is None or not mixer_idle():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._reopen, name="jazmin-audio", daemon=True)
+            self._thread.start()
+
+    def _open(self) -> None:
+        with self._lock:
+            if pygame.mixer.get_init():
+                self.ready.set()
+                return
+
+            samples = buffer_samples(_buffer_ms(), self.frequency)
+            t0 = time.perf_counter()
+            try:
+                pygame.mixer.init(frequency=self.frequency, size=self.size, channels=self.channels, buffer=samples)
+            except Exception as e:
+                self.error = e
+                print("[Error] [Audio] - Could not open the audio device:", e)
+                return
+            open_ms = (time.perf_counter() - t0) * 1000.0
+            self.samples = samples
+            self.error = None
+            self.opens += 1
+            self.ready.set()
+            print(f"[Jazmin] [Audio] - Mixer started ({samples} sample buffer, {self.latency_ms():.0f}ms) in {open_ms:.0f}ms")
+
+            if not self._listening:
+                opt = _optimizer()
+                if opt is not None:
+                    opt.on_param_change("audio.buffer_ms", self.set_buffer_ms)
+                    self._listening = True
+
+        latency = self.latency_ms()
+        _record(lambda opt: opt.metrics.push("audio.device_open_ms", open_ms))
+        _record(lambda opt: opt.metrics.push("audio.device_latency_ms", latency))
+
+    def _reopen(self) -> None:
+        from jazmin_player import audio_lock  # held while a line plays, the reset waits for it
+        with audio_lock, self._lock:
+            ms = self._pending_ms
+            if ms is None or not pygame.mixer.get_init() or not mixer_idle():
+                return
+            frequency = pygame.mixer.get_init()[0]
+            samples = buffer_samples(ms, frequency)
+            self._pending_ms = None
+            if samples == self.samples:
+                return
+
+            self.ready.clear()
+            num_channels = pygame.mixer.get_num_channels()
+            pygame.mixer.quit()
+            try:
+                pygame.mixer.init(frequency=frequency, size=self.size, channels=self.channels, buffer=samples)
+            except Exception as e:
+                self.error = e
+                print("[Error] [Audio] - Could not re-open the audio device:", e)
+                return
+            pygame.mixer.set_num_channels(num_channels)
+            print(f"[Jazmin] [Audio] - Mixer buffer {self.samples} -> {samples} samples ({ms:.0f}ms)")
+            self.samples = samples
+            self.opens += 1
+            self.ready.set()
+
+        latency = self.latency_ms()
+        _record(lambda opt: opt.metrics.push("audio.device_latency_ms", latency))
+        for fn in list(self._listeners):
+            try:
+                fn()
+            except Exception as e:
+                print("[Error] [Audio] - Re-init listener failed:", e)
+
+
+_device: Optional[AudioDevice] = None
+_device_lock = threading.Lock()
+
+# Function: get_device, the shared audio device
+def get_device() -> AudioDevice:
+    global _device
+    with _device_lock:
+        if _device is None:
+            _device = AudioDevice()
+
+    return _device
+
+# Function: start_audio_device, opens the device in the background (call at startup, returns at once)
+def start_audio_device() -> None:
+    get_device().start()
+
+# Function: init_mixer, makes sure the mixer is open before it is used (waits for the background open if it is running)
+def init_mixer() -> None:
+    get_device().ensure()
+
+# Function: device_latency_ms, the output latency of the open device
+def device_latency_ms() -> float:
+    return get_device().latency_ms()
+
+# Function: on_reinit, fn is called after the mixer was re-opened (Sounds and reserved channels from before are gone)
+def on_reinit(fn: Callable[[], None]) -> None:
+    get_device().on_reinit(fn)
+
+# Function: mixer_idle, true when nothing is playing on the music stream or any channel
+def mixer_idle() -> bool:
+    return not pygame.mixer.get_init() or not (pygame.mixer.music.get_busy() or pygame.mixer.get_busy())
+
+# Function: apply_buffer_ms, asks for a new buffer size (the device re-opens once nothing plays)
+def apply_buffer_ms(ms: float) -> None:
+    get_device().set_buffer_ms(ms)
+
+# Function: wait_for_music, blocks while the music stream plays, measuring start latency and stalls
+    # call right after music.play(), stop_when is polled and stops playback early (mute), fading out over fade_ms
+    # a stall is the playback position falling behind the wall clock by more than the buffer
+    # on_start(lag_ms) is called once the first audio is heard
+def wait_for_music(poll_s: float = 0.1, stop_when: Optional[Callable[[], bool]] = None, fade_ms: int = 0,
+                   on_start: Optional[Callable[[float], None]] = None) -> None:
+    t0 = time.perf_counter()
+    t0_us = now_us()
+    frequency = (pygame.mixer.get_init() or (MIXER_FREQUENCY,))[0]
+    buffer_ms = (get_device().samples or buffer_samples(_buffer_ms())) * 1000.0 / frequency
+    base_lag: Optional[float] = None
+    underruns = 0
+
+    while pygame.mixer.music.get_busy():
+        if stop_when is not None and stop_when():
+            fade_out_music(fade_ms)
+            break
+
+        pos = pygame.mixer.music.get_pos()
+        lag = (time.perf_counter() - t0) * 1000.0 - pos
+        if pos > 0:
+            if base_lag is None:
+                base_lag = lag
+                _record(lambda opt: opt.measure_audio_latency(max(0.0, lag)))
+                get_tracer().record("audio.play_start", t0_us, t0_us + int(max(0.0, lag) * 1000))
+                if on_start is not None:
+                    on_start(max(0.0, lag))
+            elif lag - base_lag > buffer_ms + poll_s * 1000.0:
+                underruns += 1
+                base_lag = lag
+
+        time.sleep(poll_s)
+
+    get_tracer().record("audio.playback", t0_us, underruns=underruns)
+    if underruns:
+        _record(lambda opt: opt.measure_audio_underrun(underruns))
+
+    get_device().reinit_when_idle()
+
+# Function: fade_out_music, fades the music stream out and waits for it (stops at once when fade_ms is 0)
+def fade_out_music(fade_ms: int = 0) -> None:
+    if not pygame.mixer.get_init() or not pygame.mixer.music.get_busy():
+        return
+    if not fade_ms:
+        pygame.mixer.music.stop()
+        return
+
+    pygame.mixer.music.fadeout(int(fade_ms))
+    deadline = time.monotonic() + fade_ms / 1000.0 + 0.1
+    while pygame.mixer.music.get_busy() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    pygame.mixer.music.stop()
+
+# Function: wait_for_channel, blocks while a Sound plays on a channel, the wait_for_music of already decoded clips
+    # a channel has no playback position, so on_start gets one device buffer as the (upper bound) start lag
+def wait_for_channel(channel: pygame.mixer.Channel, poll_s: float = 0.05, stop_when: Optional[Callable[[], bool]] = None,
+                     fade_ms: int = 0, on_start: Optional[Callable[[float], None]] = None) -> None:
+    t0_us = now_us()
+    frequency = (pygame.mixer.get_init() or (MIXER_FREQUENCY,))[0]
+    buffer_ms = (get_device().samples or buffer_samples(_buffer_ms())) * 1000.0 / frequency
+    get_tracer().record("audio.play_start", t0_us, t0_us + int(buffer_ms * 1000))
+    if on_start is not None:
+        on_start(buffer_ms)
+
+    while channel.get_busy():
+        if stop_when is not None and stop_when():
+            if fade_ms:
+                channel.fadeout(int(fade_ms))
+                deadline = time.monotonic() + fade_ms / 1000.0 + 0.1
+                while channel.get_busy() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+            channel.stop()
+            break
+        time.sleep(poll_s)
+
+    get_tracer().record("audio.playback", t0_us, decoded=True)
+
+    get_device().reinit_when_idle()
+
+# Class: StageTimes
+    # perf_counter marks for one spoken line, from the request to the first sound
+    # marks: enqueue, llm_done, synth_start, tts_post, tts_get, load_start, mixer_load, play, first_play
+
+class StageTimes:
+    __slots__ = ("marks", "pushed")
+
+    def __init__(self, t0: Optional[float] = None):
+        self.marks: Dict[str, float] = {"enqueue": time.perf_counter() if t0 is None else t0}
+        self.pushed = False
+
+# Function: mark, records that a stage was reached (now unless a time is given)
+    def mark(self, name: str, t: Optional[float] = None) -> None:
+        self.marks[name] = time.perf_counter() if t is None else t
+
+# Function: durations, ms spent in each stage that has both of its marks
+    def durations(self) -> Dict[str, float]:
+        m = self.marks
+        spans = (
+            ("llm", "enqueue", "llm_done"),
+            ("queue", "llm_done" if "llm_done" in m else "enqueue", "synth_start"),
+            ("tts_post", "synth_start", "tts_post"),
+            ("tts_get", "tts_post", "tts_get"),
+            ("player_wait", "tts_get", "load_start"),
+            ("mixer_load", "load_start", "mixer_load"),
+            ("first_play", "play", "first_play"),
+            ("total", "enqueue", "first_play"),
+        )
+
+        return {name: round((m[end] - m[start]) * 1000.0, 2) for name, start, end in spans if start in m and end in m}
+
+# Function: push, hands the durations to the optimizer once (audio.stage.* series)
+    def push(self) -> None:
+        if self.pushed:
+            return
+        self.pushed = True
+        stages = self.durations()
+        if stages:
+            _record(lambda opt: opt.measure_audio_stages(stages))
+
+
+def _record(fn) -> None:
+    opt = _optimizer()
+    if opt is not None:
+        try:
+            fn(opt)
+        except Exception:
+            pass
+
+
+__all__ = [
+    "buffer_samples",
+    "AudioDevice",
+    "get_device",
+    "start_audio_device",
+    "init_mixer",
+    "device_latency_ms",
+    "on_reinit",
+    "mixer_idle",
+    "apply_buffer_ms",
+    "wait_for_music",
+    "fade_out_music",
+    "wait_for_channel",
+    "StageTimes",
+]
+
+# End, Spencer
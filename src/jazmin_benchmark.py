@@ -0,0 +1,576 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_benchmark.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Measures Jazmin's real subsystems (audio, GIFs, Tk, TTS/LLM round trips, speech to text) and checks them against a baseline
+# Last date edited: (10/19/26 23:58)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+# Usage (headless):
+#   python jazmin_benchmark.py                       run everything, write a report, compare to the baseline
+#   python jazmin_benchmark.py --only tts llm        run some benches
+#   python jazmin_benchmark.py --update-baseline     store this run as the new baseline
+#   python jazmin_benchmark.py --only stt --stt-fixtures path\to\wavs --stt-backends vosk whisper
+# exits with 1 when a result regressed past --tolerance
+
+from __future__ import annotations
+
+# Standard Libraries used
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Jazmin modules
+from jazmin_assets import DISPLAY_SIZE, app_data_dir
+
+
+REPORT_VERSION = 1
+
+# smallest change per unit that counts at all, below this a change is timer / rounding noise whatever its percentage
+MIN_DELTA: Dict[str, float] = {"ms": 0.05, "x": 0.005, "%": 0.5, "frames/s": 0.5}
+
+# benches that make no sound and need no Tk root, safe to run inside the app when asked (benchmark_subsystems(run=True))
+QUICK_BENCHES: Tuple[str, ...] = ("gif", "tts", "llm")
+
+
+# Class: BenchmarkSkipped, raised by a bench that cannot run here (missing library, no display, no assets)
+class BenchmarkSkipped(Exception):
+    pass
+
+
+# Class: Dataclass, BenchOptions
+    # what the benches run against and how many times
+
+@dataclass
+class BenchOptions:
+    assets: Path = field(default_factory=lambda: _default_assets())
+    repeats: int = 5
+    after_samples: int = 200
+    after_interval_ms: int = 10
+    photo_samples: int = 30
+    stub_delay_ms: float = 0.0      # simulated server time for the TTS/LLM stubs
+    stt_fixtures: Optional[Path] = None         # folder of name.wav + name.txt pairs, default assets/stt
+    stt_backends: Tuple[str, ...] = ()          # default: every registered backend that can run here
+
+
+# Function: _default_assets, the repo's assets folder when run from source, otherwise the working folder (like resource_path)
+def _default_assets() -> Path:
+    repo_assets = Path(__file__).resolve().parent.parent / "assets"
+
+    return repo_assets if repo_assets.is_dir() else Path(os.path.abspath("."))
+
+# Function: _latency, summary of ms samples (headline value is the median, lower is better)
+def _latency(samples: Sequence[float], unit: str = "ms") -> Dict[str, Any]:
+    ordered = sorted(samples)
+    p90 = ordered[min(len(ordered) - 1, int(round(0.9 * (len(ordered) - 1))))]
+
+    return {
+        "unit": unit,
+        "better": "lower",
+        "value": round(statistics.median(ordered), 3),
+        "n": len(ordered),
+        "mean": round(statistics.fmean(ordered), 3),
+        "p90": round(p90, 3),
+        "max": round(ordered[-1], 3),
+    }
+
+# Function: _throughput, a rate where higher is better
+def _throughput(value: float, unit: str, **extra: Any) -> Dict[str, Any]:
+    return {"unit": unit, "better": "higher", "value": round(value, 3), **extra}
+
+def _ms_since(t0: float) -> float:
+    return (time.perf_counter() - t0) * 1000.0
+
+
+# benches, each returns {metric name: result}
+
+# Function: bench_mixer, pygame.mixer.music load and time until playback has actually started, per bundled mp3
+    # volume is 0 so the run is silent, the dummy SDL driver is used when there is no audio device
+def bench_mixer(opts: BenchOptions) -> Dict[str, Dict[str, Any]]:
+    try:
+        import pygame
+    except ImportError as e:
+        raise BenchmarkSkipped(f"pygame not available: {e}")
+
+    clips = sorted(opts.assets.glob("*.mp3"))
+    if not clips:
+        raise BenchmarkSkipped(f"no mp3 files in {opts.assets}")
+
+    owned = not pygame.mixer.get_init()
+    if owned:
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            os.environ["SDL_AUDIODRIVER"] = "dummy"
+            pygame.mixer.init()
+
+    load_ms: List[float] = []; start_ms: List[float] = []; total_ms: List[float] = []
+    try:
+        for clip in clips:
+            for _ in range(opts.repeats):
+                t0 = time.perf_counter()
+                pygame.mixer.music.load(str(clip))
+                t1 = time.perf_counter()
+                pygame.mixer.music.set_volume(0.0)
+                pygame.mixer.music.play()
+
+                deadline = t1 + 2.0
+                while not (pygame.mixer.music.get_busy() and pygame.mixer.music.get_pos() > 0):
+                    if time.perf_counter() > deadline:
+                        break
+                    time.sleep(0.0005)
+                t2 = time.perf_counter()
+
+                pygame.mixer.music.stop()
+                pygame.mixer.music.unload()
+                load_ms.append((t1 - t0) * 1000); start_ms.append((t2 - t1) * 1000); total_ms.append((t2 - t0) * 1000)
+    finally:
+        pygame.mixer.music.set_volume(1.0)
+        if owned:
+            pygame.mixer.quit()
+
+    return {
+        "mixer.load_ms": _latency(load_ms),
+        "mixer.play_start_ms": _latency(start_ms),
+        "mixer.load_to_play_ms": _latency(total_ms),
+    }
+
+# Function: bench_gif, decode throughput of every GIF in the assets folder (the same decoder the boot pipeline uses)
+def bench_gif(opts: BenchOptions) -> Dict[str, Dict[str, Any]]:
+    gifs = sorted(opts.assets.glob("*.gif"))
+    if not gifs:
+        raise BenchmarkSkipped(f"no gif files in {opts.assets}")
+    try:
+        from jazmin_animation import decode_gif_frames
+    except ImportError as e:
+        raise BenchmarkSkipped(f"PIL/tkinter not available: {e}")
+
+    frames = 0; per_frame: List[float] = []
+    t_all = time.perf_counter()
+    for gif in gifs:
+        for _ in range(max(1, opts.repeats // 2)):
+            t0 = time.perf_counter()
+            images, _delays = decode_gif_frames(str(gif))
+            per_frame.append(_ms_since(t0) / max(1, len(images)))
+            frames += len(images)
+    seconds = time.perf_counter() - t_all
+
+    return {
+        "gif.decode_fps": _throughput(frames / seconds if seconds else 0.0, "frames/s", frames=frames),
+        "gif.decode_frame_ms": _latency(per_frame),
+    }
+
+# Function: _tk_root, a hidden Tk root for the Tk benches
+def _tk_root():
+    try:
+        import tkinter as tk
+        root = tk.Tk()
+    except Exception as e:
+        raise BenchmarkSkipped(f"no Tk display: {e}")
+    root.withdraw()
+
+    return root
+
+# Function: bench_after, how late after() callbacks fire on an idle event loop
+def bench_after(opts: BenchOptions) -> Dict[str, Dict[str, Any]]:
+    root = _tk_root()
+    lateness: List[float] = []
+    interval = opts.after_interval_ms
+
+    def tick(due: float) -> None:
+        now = time.perf_counter()
+        lateness.append(max(0.0, (now - due) * 1000))
+        if len(lateness) >= opts.after_samples:
+            root.quit()
+        else:
+            root.after(interval, tick, now + interval / 1000.0)
+
+    try:
+        root.after(interval, tick, time.perf_counter() + interval / 1000.0)
+        root.mainloop()
+    finally:
+        root.destroy()
+
+    return {"tk.after_jitter_ms": _latency(lateness)}
+
+# Function: bench_photoimage, cost of turning a PIL image into a Tk PhotoImage (full frame and button sized)
+def bench_photoimage(opts: BenchOptions) -> Dict[str, Dict[str, Any]]:
+    try:
+        from PIL import Image, ImageTk
+    except ImportError as e:
+        raise BenchmarkSkipped(f"PIL not available: {e}")
+
+    root = _tk_root()
+    try:
+        images = {"frame": Image.new("RGB", DISPLAY_SIZE, (24, 24, 32))}
+        button = next(iter(sorted(opts.assets.glob("button_*.png"))), None)
+        if button is not None:
+            images["button"] = Image.open(button).convert("RGBA")
+
+        out: Dict[str, Dict[str, Any]] = {}
+        for label, image in images.items():
+            samples = []
+            for _ in range(opts.photo_samples):
+                t0 = time.perf_counter()
+                photo = ImageTk.PhotoImage(image, master=root)
+                samples.append(_ms_since(t0))
+                del photo
+            out[f"tk.photoimage_{label}_ms"] = _latency(samples)
+    finally:
+        root.destroy()
+
+    return out
+
+
+# local stub servers for the network round trips
+
+# Function: _serve, runs a handler class on a free localhost port, returns (server, base url)
+def _serve(handler: type) -> Tuple[ThreadingHTTPServer, str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, name="jazmin-bench-stub", daemon=True).start()
+
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+# Class: _StubHandler, quiet JSON/bytes responder with the configured server delay
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay_s = 0.0
+
+    def log_message(self, fmt, *args) -> None:
+        pass
+
+    def _read_body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _send(self, body: bytes, content_type: str) -> None:
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+# Function: bench_tts, Voicemaker-shaped POST then audio GET, made the way the app makes them (requests.post / requests.get)
+def bench_tts(opts: BenchOptions) -> Dict[str, Dict[str, Any]]:
+    try:
+        import requests
+    except ImportError as e:
+        raise BenchmarkSkipped(f"requests not available: {e}")
+
+    clip = next(iter(sorted(opts.assets.glob("audio_*.mp3"))), None)
+    audio = clip.read_bytes() if clip is not None else bytes(64 * 1024)
+
+    class TTSHandler(_StubHandler):
+        delay_s = opts.stub_delay_ms / 1000.0
+
+        def do_POST(self):
+            self._read_body()
+            host, port = self.server.server_address[:2]
+            self._send(json.dumps({"success": True, "path": f"http://{host}:{port}/audio/clip.mp3"}).encode(), "application/json")
+
+        def do_GET(self):
+            self._send(audio, "audio/mpeg")
+
+    server, base = _serve(TTSHandler)
+    post_ms: List[float] = []; get_ms: List[float] = []; total_ms: List[float] = []
+    params = {"Engine": "neural", "VoiceId": "proplus-Aurora", "LanguageCode": "en-US",
+              "Text": "Benchmarking the voice round trip.", "OutputFormat": "mp3", "SampleRate": "48000"}
+    try:
+        for _ in range(opts.repeats * 2):
+            t0 = time.perf_counter()
+            response = requests.post(f"{base}/voice/api", json=params, headers={"Authorization": "Bearer bench"}, timeout=10)
+            t1 = time.perf_counter()
+            audio_response = requests.get(response.json()["path"], timeout=10)
+            t2 = time.perf_counter()
+            if len(audio_response.content) != len(audio):
+                raise RuntimeError("stub audio came back truncated")
+            post_ms.append((t1 - t0) * 1000); get_ms.append((t2 - t1) * 1000); total_ms.append((t2 - t0) * 1000)
+    finally:
+        server.shutdown(); server.server_close()
+
+    return {
+        "tts.post_ms": _latency(post_ms),
+        "tts.audio_get_ms": _latency(get_ms),
+        "tts.round_trip_ms": _latency(total_ms),
+    }
+
+# Function: bench_llm, chat completion through the OpenAI SDK pointed at an OpenAI-shaped stub
+def bench_llm(opts: BenchOptions) -> Dict[str, Dict[str, Any]]:
+    try:
+        from openai import OpenAI
+    except ImportError as e:
+        raise BenchmarkSkipped(f"openai not available: {e}")
+
+    class LLMHandler(_StubHandler):
+        delay_s = opts.stub_delay_ms / 1000.0
+
+        def do_POST(self):
+            request = json.loads(self._read_body() or b"{}")
+            body = {
+                "id": "chatcmpl-bench", "object": "chat.completion", "created": int(time.time()),
+                "model": request.get("model", "gpt-4o-mini"),
+                "choices": [{"index": 0, "finish_reason": "stop",
+                             "message": {"role": "assistant", "content": "Still here. Still fabulous."}}],
+                "usage": {"prompt_tokens": 24, "completion_tokens": 6, "total_tokens": 30},
+            }
+            self._send(json.dumps(body).encode(), "application/json")
+
+    server, base = _serve(LLMHandler)
+    client = OpenAI(api_key="bench", base_url=f"{base}/v1", max_retries=0, timeout=10)
+    samples: List[float] = []
+    try:
+        for _ in range(opts.repeats * 2):
+            t0 = time.perf_counter()
+            response = client.chat.completions.create(
+                model="gpt-4o-mini",
+                messages=[{"role": "user", "content": "Say something short."}],
+            )
+            samples.append(_ms_since(t0))
+            if not response.choices[0].message.content:
+                raise RuntimeError("stub returned no content")
+    finally:
+        client.close()
+        server.shutdown(); server.server_close()
+
+    return {"llm.round_trip_ms": _latency(samples)}
+
+# Function: bench_stt, runs recorded WAV fixtures through each speech backend, real-time factor and word error rate
+    # a fixture is name.wav with the words that were said in name.txt, RTF is transcribe time over clip length
+def bench_stt(opts: BenchOptions) -> Dict[str, Dict[str, Any]]:
+    try:
+        import speech_recognition as sr
+        import jazmin_stt
+    except ImportError as e:
+        raise BenchmarkSkipped(f"speech_recognition not available: {e}")
+
+    folder = opts.stt_fixtures or opts.assets / "stt"
+    fixtures = [(wav, wav.with_suffix(".txt")) for wav in sorted(folder.glob("*.wav")) if wav.with_suffix(".txt").is_file()]
+    if not fixtures:
+        raise BenchmarkSkipped(f"no wav + txt fixtures in {folder}")
+
+    clips = []
+    for wav, txt in fixtures:
+        with sr.AudioFile(str(wav)) as source:
+            clips.append((wav.stem, sr.Recognizer().record(source), txt.read_text(encoding="utf-8").strip()))
+
+    out: Dict[str, Dict[str, Any]] = {}
+    for name in opts.stt_backends or tuple(jazmin_stt.BACKENDS):
+        factory = jazmin_stt.BACKENDS.get(name)
+        backend = factory() if factory is not None else None
+        if backend is None or not backend.available():
+            print(f"[Jazmin] [Benchmark] - stt {name}: skipped ({'unknown backend' if backend is None else 'not installed or no model'})")
+            continue
+
+        rtf: List[float] = []; latency_ms: List[float] = []
+        errors = words = 0.0
+        try:
+            backend.load()
+            for _stem, audio, reference in clips:
+                t0 = time.perf_counter()
+                try:
+                    hypothesis = backend.transcribe(audio)
+                except sr.UnknownValueError:
+                    hypothesis = ""
+                latency_ms.append(_ms_since(t0))
+                rtf.append(latency_ms[-1] / 1000.0 / max(1e-6, jazmin_stt.audio_seconds(audio)))
+                count = len(jazmin_stt.transcript_words(reference))
+                errors += jazmin_stt.word_error_rate(reference, hypothesis) * count
+                words += count
+        except sr.RequestError as e:
+            print(f"[Jazmin] [Benchmark] - stt {name}: skipped ({e})")
+            continue
+
+        out[f"stt.{name}.rtf"] = _latency(rtf, unit="x")
+        out[f"stt.{name}.latency_ms"] = _latency(latency_ms)
+        out[f"stt.{name}.wer"] = {"unit": "%", "better": "lower", "value": round(100.0 * errors / max(1.0, words), 2),
+                                  "n": len(clips), "words": int(words)}
+
+    if not out:
+        raise BenchmarkSkipped("no speech backend could run")
+
+    return out
+
+
+BENCHES: Dict[str, Callable[[BenchOptions], Dict[str, Dict[str, Any]]]] = {
+    "mixer": bench_mixer,
+    "gif": bench_gif,
+    "after": bench_after,
+    "photoimage": bench_photoimage,
+    "tts": bench_tts,
+    "llm": bench_llm,
+    "stt": bench_stt,
+}
+
+
+# Function: run_suite, runs the chosen benches and returns the report dict
+def run_suite(names: Optional[Sequence[str]] = None, opts: Optional[BenchOptions] = None, verbose: bool = True) -> Dict[str, Any]:
+    opts = opts or BenchOptions()
+    report: Dict[str, Any] = {
+        "version": REPORT_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "machine": platform.machine()},
+        "results": {},
+        "skipped": {},
+        "errors": {},
+    }
+
+    for name in names or BENCHES:
+        bench = BENCHES.get(name)
+        if bench is None:
+            report["errors"][name] = "unknown bench"
+            continue
+
+        t0 = time.perf_counter()
+        try:
+            results = bench(opts)
+        except BenchmarkSkipped as e:
+            report["skipped"][name] = str(e)
+            if verbose:
+                print(f"[Jazmin] [Benchmark] - {name}: skipped ({e})")
+            continue
+        except Exception as e:
+            report["errors"][name] = f"{type(e).__name__}: {e}"
+            print(f"[Error] [Benchmark] - {name} failed:", e)
+            continue
+
+        report["results"].update(results)
+        if verbose:
+            line = " ".join(f"{k}={r['value']}{'' if r['unit'] == 'ms' else ' '}{r['unit']}" for k, r in results.items())
+            print(f"[Jazmin] [Benchmark] - {name} ({_ms_since(t0):.0f}ms): {line}")
+
+    return report
+
+
+# Function: compare_reports, results that got worse than the baseline by more than tolerance (a fraction)
+    # min_delta (per unit, default MIN_DELTA) ignores changes too small to measure, so a 0.08x -> 0.30x RTF still counts
+def compare_reports(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25,
+                    min_delta: Optional[Dict[str, float]] = None) -> List[Dict[str, Any]]:
+    regressions: List[Dict[str, Any]] = []
+    floors = MIN_DELTA if min_delta is None else min_delta
+
+    for name, result in report.get("results", {}).items():
+        ref = baseline.get("results", {}).get(name)
+        if not ref or ref.get("unit") != result.get("unit"):
+            continue
+
+        current, previous = float(result["value"]), float(ref["value"])
+        if previous <= 0 or abs(current - previous) < floors.get(result.get("unit", ""), 0.0):
+            continue
+
+        worse = (current - previous) / previous if result.get("better") == "lower" else (previous - current) / previous
+        if worse > tolerance:
+            regressions.append({
+                "name": name,
+                "unit": result["unit"],
+                "baseline": previous,
+                "current": current,
+                "change_pct": round(worse * 100, 1),
+            })
+
+    return regressions
+
+# Function: bench_dir, where reports and the baseline are kept
+def bench_dir() -> Path:
+    path = app_data_dir() / "benchmarks"
+    path.mkdir(parents=True, exist_ok=True)
+
+    return path
+
+# Function: latest_report, the newest stored report or None
+def latest_report() -> Optional[Dict[str, Any]]:
+    reports = sorted(bench_dir().glob("report-*.json"))
+    if not reports:
+        return None
+    try:
+        return json.loads(reports[-1].read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+def _write_json(path: Path, data: Dict[str, Any]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+# Function: main, CLI entry point
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Jazmin subsystem benchmarks")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHES), help="benches to run (default: all)")
+    parser.add_argument("--assets", type=Path, help="folder with the bundled mp3/gif/png assets")
+    parser.add_argument("--repeats", type=int, default=BenchOptions.repeats)
+    parser.add_argument("--stub-delay-ms", type=float, default=0.0, help="simulated server time for the TTS/LLM stubs")
+    parser.add_argument("--stt-fixtures", type=Path, help="folder of name.wav + name.txt pairs for the stt bench (default: assets/stt)")
+    parser.add_argument("--stt-backends", nargs="+", help="speech backends for the stt bench (default: all that can run)")
+    parser.add_argument("--out", type=Path, help="report path (default: a timestamped file in the benchmark folder)")
+    parser.add_argument("--baseline", type=Path, help="baseline to compare against (default: baseline.json in the benchmark folder)")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown as a fraction (default 0.25)")
+    args = parser.parse_args(argv)
+
+    # headless: nothing here needs a real audio device or a visible window
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    opts = BenchOptions(repeats=max(1, args.repeats), stub_delay_ms=args.stub_delay_ms)
+    if args.assets:
+        opts.assets = args.assets
+    opts.stt_fixtures = args.stt_fixtures
+    opts.stt_backends = tuple(args.stt_backends or ())
+
+    report = run_suite(args.only, opts)
+    out = args.out or bench_dir() / f"report-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    baseline_path = args.baseline or bench_dir() / "baseline.json"
+
+    regressions: List[Dict[str, Any]] = []
+    baseline: Dict[str, Any] = {}
+    if baseline_path.exists() and not args.update_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        regressions = compare_reports(report, baseline, args.tolerance)
+        report["baseline"] = {"path": str(baseline_path), "created": baseline.get("created"), "regressions": regressions}
+        for r in regressions:
+            print(f"[Jazmin] [Benchmark] - REGRESSION {r['name']}: {r['baseline']} -> {r['current']} {r['unit']} (+{r['change_pct']}%)")
+        if not regressions:
+            print(f"[Jazmin] [Benchmark] - No regressions against {baseline_path.name} ({args.tolerance:.0%} tolerance)")
+
+    _write_json(out, report)
+    print(f"[Jazmin] [Benchmark] - Report written to {out}")
+
+    # a run where every bench was skipped (missing pygame / PIL / numpy / requests) never becomes the baseline on its own
+    if args.update_baseline or (report["results"] and not baseline.get("results")):
+        _write_json(baseline_path, report)
+        print(f"[Jazmin] [Benchmark] - Baseline stored at {baseline_path}")
+    elif not report["results"]:
+        print("[Jazmin] [Benchmark] - Every bench was skipped, baseline left as it was")
+
+    return 1 if regressions else 0
+
+
+__all__ = [
+    "BenchOptions",
+    "BenchmarkSkipped",
+    "BENCHES",
+    "QUICK_BENCHES",
+    "run_suite",
+    "compare_reports",
+    "latest_report",
+    "main",
+]
+
+if __name__ == "__main__":
+    sys.exit(main())
+
+# End, Spencer
@@ -0,0 +1,173 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_boot.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Runs Jazmin's startup work as dependent tasks so nothing blocks the Tk thread
+# Last date edited: (10/19/26 12:20)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Jazmin modules
+from jazmin_dispatcher import ui_post
+from jazmin_userinterface import Jazmin_Timer_Phase, Jazmin_Timer_Elapsed, Jazmin_Timer_Stop
+
+
+# Class: Dataclass, BootTask
+    # one unit of startup work, on_tk tasks run on the Tk thread through the dispatcher, the rest on the worker pool
+
+@dataclass
+class BootTask:
+    name: str
+    fn: Callable[[], Any]
+    deps: Tuple[str, ...] = ()
+    on_tk: bool = False
+    state: str = "pending"      # pending -> queued -> running -> done / failed / skipped
+    result: Any = None
+    started: float = 0.0
+    finished: float = 0.0
+    thread: str = ""
+
+
+# Class: BootOrchestrator
+    # starts every task whose dependencies are done, independent tasks run side by side
+    # each finished task is logged as a phase on the Jazmin boot timer
+
+class BootOrchestrator:
+    def __init__(self, max_workers: int = 6):
+        self._tasks: Dict[str, BootTask] = {}
+        self._order: List[str] = []
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._started = False
+        self._t0 = 0.0
+        self._on_finished: List[Callable[[], None]] = []
+
+# Function: add, declares a task (can be called before or after start)
+    def add(self, name: str, fn: Callable[[], Any], deps: Tuple[str, ...] = (), on_tk: bool = False) -> None:
+        with self._lock:
+            if name in self._tasks:
+                raise ValueError(f"boot task already declared: {name}")
+            self._tasks[name] = BootTask(name, fn, tuple(deps), on_tk)
+            self._order.append(name)
+            ready = self._collect_ready() if self._started else []
+        self._launch(ready)
+
+# Function: on_finished, runs a callback (on the Tk thread) once every declared task has settled
+    def on_finished(self, callback: Callable[[], None]) -> None:
+        self._on_finished.append(callback)
+
+# Function: start, launches every task that has no unfinished dependencies
+    def start(self) -> None:
+        with self._lock:
+            self._started = True
+            self._t0 = time.perf_counter()
+            missing = {d for t in self._tasks.values() for d in t.deps if d not in self._tasks}
+            ready = self._collect_ready()
+        if missing:
+            print(f"[Jazmin] [Boot] - Waiting on undeclared tasks: {', '.join(sorted(missing))}")
+        print(f"[Jazmin] [Boot] - Starting {len(self._tasks)} boot tasks")
+        self._launch(ready)
+
+# Function: result, returns what a finished task returned
+    def result(self, name: str) -> Any:
+        return self._tasks[name].result
+
+# Function: timeline, returns (name, where, start_s, end_s, state) for each task relative to start()
+    def timeline(self) -> List[Tuple[str, str, float, float, str]]:
+        out = []
+        for name in self._order:
+            t = self._tasks[name]
+            out.append((name, t.thread, max(0.0, t.started - self._t0), max(0.0, t.finished - self._t0), t.state))
+
+        return out
+
+# picks pending tasks whose deps are done and marks dependents of failed tasks as skipped (lock held)
+    def _collect_ready(self) -> List[BootTask]:
+        ready: List[BootTask] = []
+        changed = True
+        while changed:
+            changed = False
+            for t in self._tasks.values():
+                if t.state != "pending":
+                    continue
+                dep_states = [self._tasks[d].state if d in self._tasks else "pending" for d in t.deps]
+                if any(s in ("failed", "skipped") for s in dep_states):
+                    t.state = "skipped"
+                    print(f"[Jazmin] [Boot] - Skipping {t.name}, a dependency did not finish")
+                    changed = True
+                elif all(s == "done" for s in dep_states):
+                    t.state = "queued"
+                    ready.append(t)
+
+        return ready
+
+    def _launch(self, ready: List[BootTask]) -> None:
+        for t in ready:
+            if t.on_tk:
+                ui_post(self._execute, t)
+            else:
+                with self._lock:
+                    if self._pool is None:
+                        self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="jazmin-boot")
+                    pool = self._pool
+                pool.submit(self._execute, t)
+
+    def _execute(self, task: BootTask) -> None:
+        task.state = "running"
+        task.thread = "tk" if task.on_tk else threading.current_thread().name
+        task.started = time.perf_counter()
+        try:
+            task.result = task.fn()
+            ok = True
+        except Exception as e:
+            print(f"[Error] [Boot] - Task {task.name} failed:", e)
+            ok = False
+        task.finished = time.perf_counter()
+
+        Jazmin_Timer_Phase(task.name, task.finished - task.started, "tk" if task.on_tk else "worker")
+
+        with self._lock:
+            task.state = "done" if ok else "failed"
+            ready = self._collect_ready()
+            settled = all(t.state in ("done", "failed", "skipped") for t in self._tasks.values())
+        self._launch(ready)
+
+        if settled and not ready:
+            ui_post(self._finish, key=("boot", id(self)))
+
+    def _finish(self) -> None:
+        if any(t.state not in ("done", "failed", "skipped") for t in self._tasks.values()):
+            return  # a task was added after the last one settled
+
+        Jazmin_Timer_Elapsed(); Jazmin_Timer_Stop()
+        for name, where, start, end, state in self.timeline():
+            print(f"[Jazmin] [Boot] - {name:<20} {where:<14} {start:6.2f}s -> {end:6.2f}s {state}")
+
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False)
+        callbacks, self._on_finished = self._on_finished, []
+        for cb in callbacks:
+            cb()
+
+
+__all__ = [
+    "BootOrchestrator",
+    "BootTask",
+]
+
+# End, Spencer
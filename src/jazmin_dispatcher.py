@@ -0,0 +1,218 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_dispatcher.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Moves widget updates from background threads onto the Tk thread, one frame at a time
+# Last date edited: (10/19/26 10:12)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import threading
+import time
+import tkinter as tk
+from collections import deque
+from typing import Any, Callable, Deque, Hashable, List, Optional, Tuple
+
+
+# defaults used until the optimizer config is read on attach
+DEFAULT_INTERVAL_MS = 16      # ~60 FPS drain loop
+DEFAULT_BUDGET_MS = 8.0       # max time spent running posted work in one frame
+
+# a posted update: (coalesce key or None, callable, args)
+_Item = Tuple[Optional[Hashable], Callable[..., Any], Tuple[Any, ...]]
+
+
+# Class: UIDispatcher
+    # collects widget updates from any thread and runs them on the Tk thread from a single after() loop
+    # deque append/popleft are atomic so producers never take a lock
+
+class UIDispatcher:
+    def __init__(self, interval_ms: int = DEFAULT_INTERVAL_MS, budget_ms: float = DEFAULT_BUDGET_MS):
+        self._queue: Deque[_Item] = deque()
+        self._root: Optional[tk.Misc] = None
+        self._after_id: Optional[str] = None
+        self._tk_thread: Optional[int] = None
+        self._last_tick = 0.0
+        self._due = 0.0
+        self._optimizer = None
+
+        self.interval_ms = interval_ms
+        self.budget_ms = budget_ms
+        self.coalesced = 0
+        self.deferred = 0
+
+# Function: attach, binds the dispatcher to the Tk root and starts draining
+    def attach(self, root: tk.Misc) -> None:
+        self._root = root
+        self._tk_thread = threading.get_ident()
+
+        try:
+            import jazmin_optimizer as jo
+            self._optimizer = jo.load_optimizer()
+            fps = max(1, int(self._optimizer.get_param("gui.target_fps", 60)))
+            self.interval_ms = max(1, int(1000 / fps))
+            self.budget_ms = float(self._optimizer.get_param("scheduler.quantum_ms", DEFAULT_BUDGET_MS))
+        except Exception as e:
+            print("[Jazmin] [Dispatcher] - Optimizer unavailable, using defaults:", e)
+
+        self._last_tick = time.perf_counter()
+        self._schedule()
+        print(f"[Jazmin] [Dispatcher] - Attached ({self.interval_ms}ms frame, {self.budget_ms:.1f}ms budget)")
+
+# Function: detach, stops the drain loop (queued work stays queued)
+    def detach(self) -> None:
+        if self._root is not None and self._after_id is not None:
+            try:
+                self._root.after_cancel(self._after_id)
+            except tk.TclError:
+                pass
+        self._after_id = None
+        self._root = None
+
+# Function: post, queues fn(*args) for the next frame, a key replaces any older update with the same key
+    def post(self, fn: Callable[..., Any], *args: Any, key: Optional[Hashable] = None) -> None:
+        self._queue.append((key, fn, args))
+
+# Function: on_tk_thread, true when called from the thread that owns the Tk root
+    def on_tk_thread(self) -> bool:
+        return self._tk_thread is not None and threading.get_ident() == self._tk_thread
+
+# Function: depth, number of updates waiting to run
+    def depth(self) -> int:
+        return len(self._queue)
+
+    def _schedule(self) -> None:
+        if self._root is not None:
+            self._due = time.perf_counter() + self.interval_ms / 1000.0
+            self._after_id = self._root.after(self.interval_ms, self._drain)
+
+# takes everything queued right now and keeps only the newest update per key
+    def _take_batch(self) -> List[_Item]:
+        batch: List[_Item] = []
+        for _ in range(len(self._queue)):
+            try:
+                batch.append(self._queue.popleft())
+            except IndexError:
+                break
+
+        if not any(key is not None for key, _, _ in batch):
+            return batch
+
+        seen = set()
+        kept: List[_Item] = []
+        for item in reversed(batch):
+            key = item[0]
+            if key is not None:
+                if key in seen:
+                    self.coalesced += 1
+                    continue
+                seen.add(key)
+            kept.append(item)
+        kept.reverse()
+
+        return kept
+
+# runs one frame worth of updates, pushes the rest back to the front of the queue
+    def _drain(self) -> None:
+        t0 = time.perf_counter()
+        frame_ms = (t0 - self._last_tick) * 1000
+        late_ms = (t0 - self._due) * 1000
+        self._last_tick = t0
+        deadline = t0 + self.budget_ms / 1000.0
+
+        batch = self._take_batch()
+        for i, (key, fn, args) in enumerate(batch):
+            if i and time.perf_counter() >= deadline:
+                rest = batch[i:]
+                self._queue.extendleft(reversed(rest))
+                self.deferred += len(rest)
+                break
+            try:
+                fn(*args)
+            except tk.TclError:
+                pass  # widget was destroyed before its update ran
+            except Exception as e:
+                print(f"[Error] [Dispatcher] - {getattr(fn, '__name__', fn)} failed:", e)
+
+        drain_ms = (time.perf_counter() - t0) * 1000
+        self._report(frame_ms, late_ms, drain_ms)
+        self._schedule()
+
+# frame time is tick-to-tick, so it includes event loop stalls between drains
+    def _report(self, frame_ms: float, late_ms: float, drain_ms: float) -> None:
+        if self._optimizer is None:
+            return
+        try:
+            self._optimizer.measure_gui_frame_time(frame_ms, queue_depth=len(self._queue), drain_ms=drain_ms)
+            self._optimizer.measure_after_lateness(late_ms)
+        except Exception:
+            pass
+
+
+# shared dispatcher for the whole app
+_dispatcher = UIDispatcher()
+
+# Function: get_dispatcher, returns the shared dispatcher
+def get_dispatcher() -> UIDispatcher:
+    return _dispatcher
+
+# Function: ui_post, queues any callable to run on the Tk thread
+def ui_post(fn: Callable[..., Any], *args: Any, key: Optional[Hashable] = None) -> None:
+    _dispatcher.post(fn, *args, key=key)
+
+
+# widget helpers used by the typing and clearing threads
+
+def _start_index(widget: tk.Misc) -> Any:
+    return "1.0" if isinstance(widget, tk.Text) else 0
+
+def _replace_text(widget: tk.Misc, text: str) -> None:
+    widget.delete(_start_index(widget), "end")
+    if text:
+        widget.insert("end", text)
+
+def _backspace(widget: tk.Misc) -> None:
+    if isinstance(widget, tk.Text):
+        widget.delete("end-2c", "end-1c")
+    else:
+        size = len(widget.get())
+        if size:
+            widget.delete(size - 1, "end")
+
+# Function: ui_replace_text, sets the whole content of a Text/Entry (coalesced per widget per frame)
+def ui_replace_text(widget: tk.Misc, text: str = "") -> None:
+    _dispatcher.post(_replace_text, widget, text, key=(id(widget), "text"))
+
+# Function: ui_insert, inserts text at an index on the Tk thread
+def ui_insert(widget: tk.Misc, index: Any, text: str) -> None:
+    _dispatcher.post(widget.insert, index, text)
+
+# Function: ui_delete, deletes a range on the Tk thread
+def ui_delete(widget: tk.Misc, first: Any, last: Any = None) -> None:
+    if last is None:
+        _dispatcher.post(widget.delete, first)
+    else:
+        _dispatcher.post(widget.delete, first, last)
+
+# Function: ui_backspace, removes the last character on the Tk thread
+def ui_backspace(widget: tk.Misc) -> None:
+    _dispatcher.post(_backspace, widget)
+
+
+__all__ = [
+    "UIDispatcher",
+    "get_dispatcher",
+    "ui_post",
+    "ui_replace_text",
+    "ui_insert",
+    "ui_delete",
+    "ui_backspace",
+]
+
+# End, Spencer
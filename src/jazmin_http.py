@@ -0,0 +1,208 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_http.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Shared HTTP session and OpenAI client for Jazmin's web calls, with tuned timeouts, round trip reporting and a TTS cache
+# Last date edited: (10/19/26 23:58)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+# Web and requests libraries
+import requests
+from requests.adapters import HTTPAdapter
+
+# Jazmin modules
+from jazmin_assets import app_data_dir
+from jazmin_trace import span
+
+
+VOICEMAKER_URL = "https://developer.voicemaker.in/voice/api"
+TTS_VOICE = "proplus-Aurora"
+TTS_CACHE_FILES = 200
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+_openai_client = None
+_tts_locks = tuple(threading.Lock() for _ in range(16))  # picked by cache key, bounded however many lines are spoken
+
+
+# Function: get_session, one keep-alive session for every Voicemaker/web request
+def get_session() -> requests.Session:
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+
+    return _session
+
+# Function: http_timeout, the current network.timeout_s from the optimizer (set from the measured RTT p99)
+def http_timeout() -> float:
+    try:
+        import jazmin_optimizer as jo
+        return float(jo.load_optimizer().get_param("network.timeout_s", 4.5))
+    except Exception:
+        return 4.5
+
+# Function: tts_read_timeout, the network.tts_read_timeout_s param, how long Voicemaker may take to render a line
+def tts_read_timeout() -> float:
+    try:
+        import jazmin_optimizer as jo
+        return float(jo.load_optimizer().get_param("network.tts_read_timeout_s", 30))
+    except Exception:
+        return 30.0
+
+# Function: _report, feeds one round trip in ms into net.rtt_ms
+def _report(ms: float) -> None:
+    try:
+        import jazmin_optimizer as jo
+        jo.load_optimizer().report_network_rtt(ms)
+    except Exception:
+        pass
+
+# Function: _request, one request through the shared session with the tuned timeout, its round trip goes to net.rtt_ms
+    # a request that times out counts as at least the timeout it was given, so the tuned timeout sees when it has become
+    # too tight instead of those requests going missing, a (connect, read) pair only counts its tuned connect part
+    # connection errors (offline, DNS, refused) say nothing about the timeout and are not recorded
+def _request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    kwargs.setdefault("timeout", http_timeout())
+    t0 = time.perf_counter()
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.Timeout:
+        timeout = kwargs["timeout"]
+        if isinstance(timeout, tuple):
+            _report((timeout[0] or 0.0) * 1000.0)
+        else:
+            _report(max((time.perf_counter() - t0) * 1000.0, (timeout or 0.0) * 1000.0))
+        raise
+    _report(response.elapsed.total_seconds() * 1000.0)
+
+    return response
+
+# Function: http_post, requests.post through the shared session with the tuned timeout
+def http_post(url: str, **kwargs: Any) -> requests.Response:
+    return _request("POST", url, **kwargs)
+
+# Function: http_get, requests.get through the shared session with the tuned timeout
+def http_get(url: str, **kwargs: Any) -> requests.Response:
+    return _request("GET", url, **kwargs)
+
+# Function: get_openai_client, one OpenAI client (and connection pool) shared by every chat call
+def get_openai_client():
+    global _openai_client
+    with _session_lock:
+        if _openai_client is None:
+            from openai import OpenAI
+            _openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY", "your-api-key-here"))
+
+    return _openai_client
+
+# Function: prewarm_connections, opens the TLS connections to Voicemaker and OpenAI before they are needed
+    # the responses do not matter, only that the pools hold a live connection afterwards
+def prewarm_connections() -> None:
+    get_session().head(VOICEMAKER_URL, timeout=http_timeout(), allow_redirects=False)
+    try:
+        get_openai_client().models.list()
+    except Exception as e:
+        print("[Jazmin] [Prewarm] - OpenAI warm-up:", type(e).__name__)
+
+# Function: tts_cache_path, cache file for one line of speech in one voice
+def tts_cache_path(text: str, voice: str = TTS_VOICE) -> Path:
+    folder = app_data_dir() / "tts"
+    folder.mkdir(parents=True, exist_ok=True)
+    key = hashlib.sha1(f"{voice}:{text.strip()}".encode("utf-8")).hexdigest()[:16]
+
+    return folder / f"{key}.mp3"
+
+# Function: synthesize_speech, the MP3 bytes for a line from Voicemaker, read from the on-disk cache when it is there
+    # returns None when the API refuses the request, stages (jazmin_audio.StageTimes) gets the synth_start/tts_post/tts_get marks
+def synthesize_speech(text: str, voice: str = TTS_VOICE, use_cache: bool = True, stages: Any = None) -> Optional[bytes]:
+    if stages is not None:
+        stages.mark("synth_start")
+    path = tts_cache_path(text, voice)
+    lock = _tts_locks[int(path.stem, 16) % len(_tts_locks)]
+
+    with lock:  # a line being prewarmed and spoken at once is only synthesized once
+        if use_cache and path.exists():
+            os.utime(path)  # most recently used, for pruning
+            audio = path.read_bytes()
+            if stages is not None:
+                stages.mark("tts_post")
+                stages.mark("tts_get")
+            return audio
+
+        api_key = os.getenv("VOICEMAKER_API_KEY", "your-api-key-here")
+        with span("tts.synthesis", chars=len(text)):
+            response = http_post(VOICEMAKER_URL, json={
+                "Engine": "neural",
+                "VoiceId": voice,
+                "LanguageCode": "en-US",
+                "Text": text,
+                "OutputFormat": "mp3",
+                "SampleRate": "48000"
+            }, headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+               timeout=(http_timeout(), tts_read_timeout()))  # tuned connect, long lines need a longer read
+        if stages is not None:
+            stages.mark("tts_post")
+
+        if response.status_code != 200 or not response.json().get("success"):
+            print("[Error] [TTS] - API Error:", response.json())
+            return None
+
+        with span("tts.download") as download_span:
+            audio = http_get(response.json()["path"]).content
+            download_span.args["bytes"] = len(audio)
+        if stages is not None:
+            stages.mark("tts_get")
+        if use_cache:
+            try:
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(audio)
+                os.replace(tmp, path)
+                _prune_tts_cache(path.parent)
+            except OSError as e:
+                print("[Error] [TTS] - Could not cache audio:", e)
+
+    return audio
+
+# Function: _prune_tts_cache, keeps the TTS_CACHE_FILES most recently used lines
+def _prune_tts_cache(folder: Path) -> None:
+    files = sorted(folder.glob("*.mp3"), key=lambda p: p.stat().st_mtime)
+    for old in files[:-TTS_CACHE_FILES]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+__all__ = [
+    "VOICEMAKER_URL",
+    "get_session",
+    "http_timeout",
+    "tts_read_timeout",
+    "http_post",
+    "http_get",
+    "get_openai_client",
+    "prewarm_connections",
+    "tts_cache_path",
+    "synthesize_speech",
+]
+
+# End, Spencer
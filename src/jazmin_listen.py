@@ -0,0 +1,299 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_listen.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Streaming microphone listener with a voice activity endpointer, feeds the speech backend while the user talks
+# Last date edited: (10/19/26 23:58)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import math
+import threading
+import time
+from array import array
+from collections import deque
+from typing import Callable, Deque, Optional
+
+# Speech recognition
+import speech_recognition as sr
+
+try:
+    import audioop  # gone in Python 3.13, the array fallback below covers it
+except ImportError:
+    audioop = None
+
+# Jazmin modules
+from jazmin_stt import STT_SAMPLE_RATE, open_session
+
+
+CHUNK_SAMPLES = 512         # 32ms at 16kHz, the endpointer decides once per chunk
+PREROLL_CHUNKS = 10         # audio kept from just before speech starts, so the first syllable is not cut off
+
+
+# Function: chunk_rms, loudness of a chunk of 16 bit PCM
+def chunk_rms(chunk: bytes, sample_width: int = 2) -> float:
+    if audioop is not None:
+        return float(audioop.rms(chunk, sample_width))
+
+    samples = array("h", chunk[: len(chunk) // 2 * 2])
+    if not samples:
+        return 0.0
+
+    return math.sqrt(sum(s * s for s in samples) / len(samples))
+
+# Function: _observe, records one speech.* sample (series and histogram) in the optimizer
+def _observe(name: str, value: float) -> None:
+    try:
+        import jazmin_optimizer as jo
+        jo.load_optimizer().metrics.observe(name, value)
+    except Exception:
+        pass
+
+# Function: _param, a speech.* param from the optimizer
+def _param(name: str, default: float) -> float:
+    try:
+        import jazmin_optimizer as jo
+        return float(jo.load_optimizer().get_param(name, default))
+    except Exception:
+        return default
+
+
+# Class: Endpointer
+    # energy voice activity detection over a noise floor that follows the room
+    # the floor drops fast to quieter chunks and creeps up slowly to louder ones that are not speech,
+    # and holds still while the user talks, speech is a chunk ratio times louder than the floor
+    # the first chunk only seeds the floor up to min_energy * ratio, so a user already talking when the mic opens is still heard
+    # update(rms) per chunk returns "start" once onset_ms of speech is heard, "end" after hangover_ms of quiet
+    # (or max_utterance_s of talking), "timeout" when nobody starts within no_speech_s, otherwise ""
+    # "cancel" takes a start back: the sound stopped before min_speech_ms (a cough, a click), or it stayed flat for
+    # a whole hangover window (a fan or AC switching on), which becomes the new floor
+
+class Endpointer:
+    def __init__(self, chunk_s: float, hangover_ms: float = 400.0, no_speech_s: float = 4.0, max_utterance_s: float = 15.0,
+                 ratio: float = 3.0, min_energy: float = 60.0, onset_ms: float = 90.0, min_speech_ms: float = 150.0):
+        self.chunk_s = chunk_s
+        self.hangover_s = hangover_ms / 1000.0
+        self.no_speech_s = no_speech_s
+        self.max_utterance_s = max_utterance_s
+        self.ratio = ratio
+        self.min_energy = min_energy
+        self.onset_s = onset_ms / 1000.0
+        self.min_speech_s = min_speech_ms / 1000.0
+        self.floor: Optional[float] = None
+        self.state = "waiting"
+        self.elapsed_s = 0.0
+        self.speech_s = 0.0
+        self.silence_s = 0.0
+        self._onset_s = 0.0
+        self._recent: Deque[float] = deque(maxlen=max(2, int(round(self.hangover_s / chunk_s))))
+
+# Function: from_config, an endpointer with the speech.vad_* params
+    @classmethod
+    def from_config(cls, chunk_s: float) -> "Endpointer":
+        return cls(chunk_s,
+                   hangover_ms=_param("speech.vad_hangover_ms", 400.0),
+                   no_speech_s=_param("speech.vad_no_speech_s", 4.0),
+                   max_utterance_s=_param("speech.vad_max_utterance_s", 15.0),
+                   ratio=_param("speech.vad_ratio", 3.0))
+
+# Function: threshold, the loudness a chunk needs to count as speech right now
+    def threshold(self) -> float:
+        level = max(self.min_energy, (self.floor or 0.0) * self.ratio)
+
+        return level * 0.7 if self.state == "speech" else level  # easier to stay in speech than to start it
+
+# Function: update, takes the loudness of the next chunk and returns the event it caused
+    def update(self, rms: float) -> str:
+        if self.state in ("done", "timeout"):
+            return ""
+
+        self.elapsed_s += self.chunk_s
+        if self.floor is None:
+            self.floor = max(1.0, min(rms, self.min_energy * self.ratio))
+        voiced = rms > self.threshold()
+        self._track_floor(rms, voiced)
+
+        if self.state == "waiting":
+            self._onset_s = self._onset_s + self.chunk_s if voiced else 0.0
+            if self._onset_s >= self.onset_s:
+                self.state = "speech"
+                self.speech_s = self._onset_s
+                self.silence_s = 0.0
+                self._recent.clear()
+                return "start"
+            if self.elapsed_s >= self.no_speech_s:
+                self.state = "timeout"
+                return "timeout"
+            return ""
+
+        self.speech_s += self.chunk_s
+        self.silence_s = 0.0 if voiced else self.silence_s + self.chunk_s
+        self._recent.append(rms)
+        if self._steady():
+            self.floor = sum(self._recent) / len(self._recent)
+            return self._cancel()
+        if self.silence_s >= self.hangover_s:
+            if self.speech_s - self.silence_s < self.min_speech_s:
+                return self._cancel()
+            self.state = "done"
+            return "end"
+        if self.speech_s >= self.max_utterance_s:
+            self.state = "done"
+            return "end"
+
+        return ""
+
+    # speech rises and falls from syllable to syllable, a whole hangover window above the threshold and within 50%
+    # of itself is background noise (quiet after speech is flat too, but below the threshold)
+    def _steady(self) -> bool:
+        recent = self._recent
+        if len(recent) < (recent.maxlen or 0):
+            return False
+        low = min(recent)
+
+        return low > self.threshold() and max(recent) <= 1.5 * low
+
+    def _cancel(self) -> str:
+        self.state = "waiting"
+        self._onset_s = 0.0
+
+        return "cancel"
+
+    def _track_floor(self, rms: float, voiced: bool) -> None:
+        if rms < self.floor:
+            self.floor += 0.5 * (rms - self.floor)
+        elif not voiced and self.state == "waiting":
+            self.floor += 0.05 * (rms - self.floor)
+        self.floor = max(1.0, self.floor)
+
+
+# Class: StreamingListener
+    # reads the microphone on its own thread and hands every chunk to a speech session once the user starts talking
+    # on_partial(text) gets each new partial transcript, on_final(text) the transcript once the user has stopped
+    # on_speech() fires when talking starts, on_error(e) gets sr.UnknownValueError / sr.RequestError / mic errors,
+    # and sr.WaitTimeoutError when nobody started talking within speech.vad_no_speech_s
+    # the Endpointer decides when speech starts and ends, speech.endpoint_ms is how long after the last voiced chunk that was
+    # a cancelled start drops the speech session and goes back to waiting
+    # callbacks run on the listener thread, post UI work through the dispatcher
+
+class StreamingListener:
+    def __init__(self, on_partial: Callable[[str], None], on_final: Callable[[str], None],
+                 on_error: Optional[Callable[[Exception], None]] = None, on_speech: Optional[Callable[[], None]] = None,
+                 sample_rate: int = STT_SAMPLE_RATE, endpointer: Optional[Endpointer] = None):
+        self.on_partial = on_partial
+        self.on_final = on_final
+        self.on_error = on_error
+        self.on_speech = on_speech
+        self.sample_rate = sample_rate
+        self.endpointer = endpointer
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+# Function: start, opens the microphone on the listener thread, returns self
+    def start(self) -> "StreamingListener":
+        self._thread = threading.Thread(target=self._run, name="jazmin-listen", daemon=True)
+        self._thread.start()
+
+        return self
+
+# Function: stop, stops listening and drops the utterance (same signature as listen_in_background's stopper)
+    def stop(self, wait_for_stop: bool = False) -> None:
+        self._stop.set()
+        if wait_for_stop and self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def _run(self) -> None:
+        try:
+            text = self._capture()
+        except (sr.UnknownValueError, sr.RequestError, sr.WaitTimeoutError) as e:
+            self._error(e)
+            return
+        except Exception as e:
+            print("[Error] [Speech] - Microphone capture failed:", e)
+            self._error(e)
+            return
+
+        if text is not None:
+            self.on_final(text)
+
+    def _error(self, e: Exception) -> None:
+        if self.on_error is not None and not self._stop.is_set():
+            self.on_error(e)
+
+    # reads until the endpoint (or stop), None when it was stopped or the mic ran dry before anyone spoke
+    def _capture(self) -> Optional[str]:
+        with sr.Microphone(sample_rate=self.sample_rate, chunk_size=CHUNK_SAMPLES) as source:
+            session = open_session(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+            endpointer = self.endpointer or Endpointer.from_config(source.CHUNK / float(source.SAMPLE_RATE))
+            preroll: Deque[bytes] = deque(maxlen=PREROLL_CHUNKS)
+            speaking = False
+            last_voiced = 0.0
+            last_partial = None
+
+            while not self._stop.is_set():
+                chunk = source.stream.read(source.CHUNK)
+                if not chunk:
+                    break
+                event = endpointer.update(chunk_rms(chunk, source.SAMPLE_WIDTH))
+
+                if event == "timeout":
+                    raise sr.WaitTimeoutError(f"no speech within {endpointer.no_speech_s:.1f}s")
+                if event == "cancel":
+                    session = open_session(source.SAMPLE_RATE, source.SAMPLE_WIDTH)
+                    speaking = False
+                    last_partial = None
+                    preroll.clear()
+                    continue
+                if not speaking:
+                    preroll.append(chunk)
+                    if event != "start":
+                        continue
+                    speaking = True
+                    if self.on_speech is not None:
+                        self.on_speech()
+                    chunks = list(preroll)
+                else:
+                    chunks = [chunk]
+                if endpointer.silence_s == 0.0:
+                    last_voiced = time.perf_counter()
+
+                for part in chunks:
+                    partial = session.accept(part)
+                    if partial and partial != last_partial:
+                        last_partial = partial
+                        self.on_partial(partial)
+
+                if event == "end":
+                    _observe("speech.endpoint_ms", (time.perf_counter() - last_voiced) * 1000.0)
+                    break
+
+        if self._stop.is_set() or not speaking:
+            return None
+
+        t0 = time.perf_counter()
+        text = session.finish()
+        _observe("speech.finalize_ms", (time.perf_counter() - t0) * 1000.0)
+
+        return text
+
+
+# Function: listen_streaming, starts a StreamingListener and returns its stop function
+def listen_streaming(on_partial: Callable[[str], None], on_final: Callable[[str], None], **kwargs) -> Callable[..., None]:
+    return StreamingListener(on_partial, on_final, **kwargs).start().stop
+
+
+__all__ = [
+    "CHUNK_SAMPLES",
+    "chunk_rms",
+    "Endpointer",
+    "StreamingListener",
+    "listen_streaming",
+]
+
+# End, Spencer
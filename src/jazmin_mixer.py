@@ -0,0 +1,238 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_mixer.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Named audio buses (voice, sfx, ambience) on their own channels, with ducking under voice and crossfades
+# Last date edited: (10/19/26 23:58)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Audio libraries
+import pygame
+
+# Jazmin modules
+from jazmin_audio import init_mixer, on_reinit
+
+
+# channel layout, everything below RESERVED_CHANNELS is kept away from Sound.play()
+BUS_CHANNELS: Dict[str, Tuple[int, ...]] = {
+    "sfx": (0, 1, 2),
+    "ambience": (3, 4),     # two, so one loop can fade out while the next fades in
+}
+VOICE_CHANNEL = 5           # voice lines already decoded (PCM cache) play here, everything else on the music stream
+RESERVED_CHANNELS = 6
+DUCK_GAIN = 0.35            # sfx and ambience level while Jazmin is speaking
+FADE_MS = 250
+
+
+# Class: Bus
+    # a group of channels with one volume, stream buses (voice) also cover pygame's music stream
+    # gain is the ducking factor the mixer moves, level() is what the channels are set to
+
+class Bus:
+    def __init__(self, name: str, channels: Tuple[int, ...] = (), volume: float = 1.0, stream: bool = False):
+        self.name = name
+        self.channels = channels
+        self.stream = stream or not channels
+        self.volume = volume
+        self.gain = 1.0
+        self._levels: Dict[int, float] = {index: 1.0 for index in channels}
+        self._started: Dict[int, float] = {index: 0.0 for index in channels}
+
+# Function: level, the bus volume after ducking
+    def level(self) -> float:
+        return self.volume * self.gain
+
+# Function: busy, true while anything plays on the bus
+    def busy(self) -> bool:
+        if not pygame.mixer.get_init():
+            return False
+        if self.stream and pygame.mixer.music.get_busy():
+            return True
+
+        return any(pygame.mixer.Channel(index).get_busy() for index in self.channels)
+
+# Function: wait_idle, blocks until the bus is quiet, true if it got there within timeout
+    def wait_idle(self, timeout: Optional[float] = None, poll_s: float = 0.05) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.busy():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_s)
+
+        return True
+
+# Function: stop, fades out (or stops) everything on the bus
+    def stop(self, fade_ms: int = 0) -> None:
+        if not pygame.mixer.get_init():
+            return
+        if self.stream:
+            if fade_ms:
+                pygame.mixer.music.fadeout(fade_ms)
+            else:
+                pygame.mixer.music.stop()
+
+        for index in self.channels:
+            channel = pygame.mixer.Channel(index)
+            if fade_ms:
+                channel.fadeout(fade_ms)
+            else:
+                channel.stop()
+
+# Function: apply, pushes the current level to pygame
+    def apply(self) -> None:
+        if not pygame.mixer.get_init():
+            return
+        if self.stream:
+            pygame.mixer.music.set_volume(self.level())
+
+        for index in self.channels:
+            pygame.mixer.Channel(index).set_volume(self._levels[index] * self.level())
+
+    # a free channel, or the one that started longest ago
+    def _free_channel(self) -> int:
+        for index in self.channels:
+            if not pygame.mixer.Channel(index).get_busy():
+                return index
+
+        return min(self.channels, key=self._started.__getitem__)
+
+
+# Class: Mixer
+    # owns the buses and a fader thread that ducks sfx and ambience while the voice bus plays
+    # whatever starts the music stream (player, greeting, a reply) is ducked under automatically
+
+class Mixer:
+    def __init__(self, duck_gain: float = DUCK_GAIN, fade_ms: int = FADE_MS):
+        self.duck_gain = duck_gain
+        self.fade_ms = fade_ms
+        self.buses: Dict[str, Bus] = {"voice": Bus("voice", (VOICE_CHANNEL,), stream=True)}
+        for name, channels in BUS_CHANNELS.items():
+            self.buses[name] = Bus(name, channels, volume=0.6 if name == "ambience" else 1.0)
+        self._reserved = False
+        self._lock = threading.Lock()
+        self._fader: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        on_reinit(self._on_reinit)
+
+# Function: bus, looks up a bus by name
+    def bus(self, name: str) -> Bus:
+        return self.buses[name]
+
+# Function: play, starts a Sound on a free channel of a channel bus
+    def play(self, bus: str, sound: pygame.mixer.Sound, volume: float = 1.0, loops: int = 0, fade_ms: int = 0) -> pygame.mixer.Channel:
+        target = self.buses[bus]
+        init_mixer()
+        with self._lock:
+            if not self._reserved:
+                self._reserve()
+            index = target._free_channel()
+            target._started[index] = time.monotonic()
+            target._levels[index] = volume
+
+        channel = pygame.mixer.Channel(index)
+        channel.play(sound, loops=loops, fade_ms=fade_ms)
+        channel.set_volume(volume * target.level())
+        self._start_fader()
+
+        return channel
+
+# Function: crossfade, fades out what plays on a bus while the new Sound fades in
+    def crossfade(self, bus: str, sound: pygame.mixer.Sound, volume: float = 1.0, loops: int = 0,
+                  fade_ms: Optional[int] = None) -> pygame.mixer.Channel:
+        fade_ms = self.fade_ms if fade_ms is None else fade_ms
+        self.buses[bus].stop(fade_ms)
+
+        return self.play(bus, sound, volume=volume, loops=loops, fade_ms=fade_ms)
+
+# Function: play_ambience, crossfades a background sound (path or effect name) in on the ambience bus
+    def play_ambience(self, source: str | Path, volume: float = 1.0, loops: int = 0) -> Optional[pygame.mixer.Channel]:
+        from jazmin_sfx import get_bank
+        sound = get_bank().get(source)
+        if sound is None:
+            return None
+
+        return self.crossfade("ambience", sound, volume=volume, loops=loops)
+
+# Function: voice_busy, true while Jazmin's voice plays (music stream or the voice channel)
+    def voice_busy(self) -> bool:
+        return self.buses["voice"].busy()
+
+    def _reserve(self) -> None:
+        if pygame.mixer.get_num_channels() < RESERVED_CHANNELS + 3:
+            pygame.mixer.set_num_channels(RESERVED_CHANNELS + 3)
+        pygame.mixer.set_reserved(RESERVED_CHANNELS)
+        self._reserved = True
+
+    def _on_reinit(self) -> None:
+        with self._lock:
+            self._reserved = False
+        for bus in self.buses.values():
+            bus.apply()
+
+    def _start_fader(self) -> None:
+        self._wake.set()
+        if self._fader is None or not self._fader.is_alive():
+            self._fader = threading.Thread(target=self._fade_loop, name="jazmin-mixer", daemon=True)
+            self._fader.start()
+
+    # moves each ducked bus toward its target gain, 20ms steps while something plays, otherwise it sleeps
+    # the device can be re-opened on another thread mid-step (pygame.error), the step is retried once it is back
+    def _fade_loop(self) -> None:
+        last = time.monotonic()
+        while True:
+            now = time.monotonic()
+            step = (now - last) * 1000.0 / max(1.0, self.fade_ms)
+            last = now
+
+            try:
+                target = self.duck_gain if self.voice_busy() else 1.0
+                active = False
+                for name in BUS_CHANNELS:
+                    bus = self.buses[name]
+                    if bus.gain != target:
+                        delta = target - bus.gain
+                        bus.gain = target if abs(delta) <= step else bus.gain + step * (1 if delta > 0 else -1)
+                        bus.apply()
+                        active = True
+                    active = active or bus.busy()
+            except pygame.error:
+                target, active = 1.0, True  # mixer closed for a re-open, check again shortly
+
+            self._wake.wait(0.02 if active or target != 1.0 else 0.25)
+            self._wake.clear()
+
+
+_mixer: Optional[Mixer] = None
+_mixer_lock = threading.Lock()
+
+# Function: get_mixer, the shared bus mixer
+def get_mixer() -> Mixer:
+    global _mixer
+    with _mixer_lock:
+        if _mixer is None:
+            _mixer = Mixer()
+
+    return _mixer
+
+
+__all__ = [
+    "BUS_CHANNELS",
+    "VOICE_CHANNEL",
+    "Bus",
+    "Mixer",
+    "get_mixer",
+]
+
+# End, Spencer
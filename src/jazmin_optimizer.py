@@ -14,15 +14,20 @@ from __future__ import annotations
 
 # Standard Libraries used
 import asyncio
+import copy
 import csv
 import json
 import logging
 import math
+import os
+import platform
 import random
 import threading
 import time
+from array import array
 from dataclasses import dataclass, field
 from functools import lru_cache, wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -51,30 +56,58 @@ DEFAULT_FLAGS: Dict[str, bool] = {
     "enable_metric_smoothing": True,
     "enable_background_sampling": False,  
     "enable_experimental_kernel": False,  
+    "enable_telemetry": True,
+    "enable_metrics_endpoint": False,    # Prometheus text on 127.0.0.1:metrics.port
 }
 
 # Baseline performance parameters for the audio, GUI, and scheduling
 DEFAULT_CONFIG: Dict[str, Any] = {
     "audio.buffer_ms": 160,
     "audio.max_latency_ms": 250,
+    "audio.pcm_cache_mb": 128,           # decoded clips kept on disk (jazmin_pcm), least recently used go first
     "gui.target_fps": 60,
     "speech.max_concurrent_prompts": 1,
+    "speech.stt_backend": "google",      # google, vosk or whisper (jazmin_stt)
+    "speech.stt_fallback": "vosk",       # local engine used when the backend cannot be reached, empty for none
+    "speech.vosk_model": "",             # Vosk model folder, empty is app_data/models/vosk
+    "speech.whisper_model": "base.en",   # faster-whisper model size
+    "speech.vad_hangover_ms": 400,       # quiet after speech that ends the utterance (jazmin_listen.Endpointer)
+    "speech.vad_no_speech_s": 4.0,       # give up listening when nobody starts talking within this
+    "speech.vad_max_utterance_s": 15,    # longest single utterance
+    "speech.vad_ratio": 3.0,             # how much louder than the noise floor speech has to be
     "network.timeout_s": 4.5,
+    "network.tts_read_timeout_s": 30,    # Voicemaker renders the whole line before it answers, not tuned
     "scheduler.quantum_ms": 8,
+    "gui.max_fps": 60,
+    "scheduler.idle_tick_s": 15,
+    "scheduler.tick_budget_ms": 25,      # CPU time one scheduler tick may use before the rest waits
+    "scheduler.busy_cpu": 0.85,          # process CPU share (of one core) that counts as busy
+    "scheduler.busy_lateness_ms": 50,    # Tk after() lateness p90 that counts as busy
+    "telemetry.queue_max": 2048,         # events waiting for the exporter before new ones are dropped
+    "telemetry.collector_url": "",       # e.g. http://127.0.0.1:4318/jazmin, empty writes files only
+    "trace.slow_turn_ms": 4000,          # turns slower than this are written out as Chrome traces
+    "metrics.port": 9464,
+    "usage.half_life_days": 28,          # how fast old launch/turn history fades
+    "usage.prewarm_threshold": 0.35,     # likelihood (vs the busiest hour) that triggers a prewarm
+    "usage.prewarm_lead_min": 15,        # how far ahead of the usual time to warm up
+    "usage.prewarm_refresh_s": 240,      # keep-alive connections go cold after about this long
 }
 
 
-# utilities used
-
-# Function: _pause_sleep, pauses for a random time between min_s and max_s
+# GUI latency series that get percentile breakdowns in summary()
+GUI_LATENCY_SERIES: Tuple[str, ...] = (
+    "gui.frame_time_ms",
+    "gui.after_lateness_ms",
+    "gui.gif_lateness_ms",
+    "gui.handler_ms",
+    "gui.dispatch_drain_ms",
+)
 
-def _pause_sleep(min_s: float = 0.15, max_s: float = 0.45) -> None:
-    time.sleep(random.uniform(min_s, max_s))
+# stages of one spoken line in order (jazmin_audio.StageTimes), total is enqueue to first sound
+AUDIO_STAGES: Tuple[str, ...] = ("llm", "queue", "tts_post", "tts_get", "player_wait", "mixer_load", "first_play", "total")
 
-# Function: _return_random, returns a random multiplier within the given range
 
-def _return_random(span: Tuple[float, float] = (0.95, 1.05)) -> float:
-    return random.uniform(*span)
+# utilities used
 
 # Function: _calculate_exponent, calculates the exponential moving average between two values
 
@@ -119,6 +152,21 @@ def _format_ms(v: float, n: int = 1) -> str:
 def _format_float(v: float, n: int = 1) -> str:
     return f"{v:.{n}f}"
 
+# Function: _prom_name, metric name in Prometheus form (gui.frame_time_ms -> jazmin_gui_frame_time_ms)
+
+def _prom_name(prefix: str, name: str) -> str:
+    clean = "".join(c if c.isalnum() or c == "_" else "_" for c in name)
+    return f"{prefix}_{clean}" if prefix else clean
+
+# Function: _prom_value, number in Prometheus text form
+
+def _prom_value(v: float) -> str:
+    if math.isnan(v):
+        return "NaN"
+    if math.isinf(v):
+        return "+Inf" if v > 0 else "-Inf"
+    return repr(float(v))
+
 # Function: _tune_line, builds the short string showing tuned buffer and FPS and timeout
 
 def _tune_line(tuned: Dict[str, Any]) -> str:
@@ -131,23 +179,46 @@ def _tune_line(tuned: Dict[str, Any]) -> str:
 # Function: _bench_line, builds the short string showing benchmark scores for audio, GUI, and speech
 
 def _bench_line(scores: Dict[str, float]) -> str:
-    a = _format_float(scores.get("audio_engine", 0), 1)
-    g = _format_float(scores.get("gui_responsiveness", 0), 1)
-    s = _format_float(scores.get("speech_latency", 0), 1)
-    return f"audio={a} gui={g} speech={s}"
+    parts: List[str] = []
+    if "mixer.load_to_play_ms" in scores: parts.append(f"audio={_format_ms(scores['mixer.load_to_play_ms'],1)}")
+    if "gif.decode_fps" in scores: parts.append(f"gif={_format_float(scores['gif.decode_fps'],0)}fps")
+    if "tk.after_jitter_ms" in scores: parts.append(f"jitter={_format_ms(scores['tk.after_jitter_ms'],2)}")
+    if "tts.round_trip_ms" in scores: parts.append(f"tts={_format_ms(scores['tts.round_trip_ms'],1)}")
+    if "llm.round_trip_ms" in scores: parts.append(f"llm={_format_ms(scores['llm.round_trip_ms'],1)}")
+    return " ".join(parts) or "none"
 
 # Function: _snap_line - builds a short string summarizing the latest frame time, network RTT, and audio latency for the main program
 
-def _snap_line(snap: Dict[str, float]) -> str:
+def _snap_line(snap: Dict[str, float], hists: Optional[Dict[str, "LatencyHistogram"]] = None) -> str:
     ft  = snap.get("gui.frame_time_ms")
     rtt = snap.get("net.rtt_ms")
     al  = snap.get("audio.latency_ms")
+    dev = snap.get("audio.device_latency_ms")
+    ep  = snap.get("speech.endpoint_ms")
     parts: List[str] = []
-    if ft  is not None: parts.append(f"ft={_format_ms(ft,2)}")
-    if rtt is not None: parts.append(f"rtt={_format_ms(rtt,0)}") #no
-    if al  is not None: parts.append(f"aud={_format_ms(al,1)}")
+    if ft  is not None: parts.append(f"ft={_format_ms(ft,2)}{_tail(hists, 'gui.frame_time_ms', 1)}")
+    if rtt is not None: parts.append(f"rtt={_format_ms(rtt,0)}{_tail(hists, 'net.rtt_ms', 0)}") #no
+    if al  is not None: parts.append(f"aud={_format_ms(al,1)}{_tail(hists, 'audio.latency_ms', 0)}")
+    if dev is not None: parts.append(f"dev={_format_ms(dev,0)}")
+    if ep  is not None: parts.append(f"ep={_format_ms(ep,0)}{_tail(hists, 'speech.endpoint_ms', 0)}")
     return " ".join(parts)
 
+# Function: _stage_line, "llm=820ms tts_post=410ms ..." from the audio.stage.* p50s, slowest stage last
+
+def _stage_line(stages: Dict[str, Dict[str, float]], slowest: Optional[str]) -> str:
+    parts = [f"{name}={_format_ms(s['p50'], 0)}" for name, s in stages.items()]
+    if slowest:
+        parts.append(f"slowest={slowest}")
+    return " ".join(parts)
+
+# Function: _tail, the "(p99=..)" suffix for a series that has a histogram
+
+def _tail(hists: Optional[Dict[str, "LatencyHistogram"]], name: str, n: int) -> str:
+    h = hists.get(name) if hists else None
+    if h is None or not h.count():
+        return ""
+    return f"(p99={_format_ms(h.quantile(99), n)})"
+
 
 # profiling helpers
 
@@ -164,6 +235,20 @@ def profile(fn: Callable) -> Callable:
             _log("Profiler", f"{fn.__name__}:{dt:.2f}ms", level=logging.DEBUG)  # should be hidden at info
     return wrapper
 
+# Function: instrument, wraps a Tk event handler so its duration lands in gui.handler_ms
+
+def instrument(name: str) -> Callable[[Callable], Callable]:
+    def deco(fn: Callable) -> Callable:
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                load_optimizer().measure_handler(name, (time.perf_counter() - t0) * 1000)
+        return wrapper
+    return deco
+
 # Class: timed, context manager to time a code block for the console and else
 
 class timed:
@@ -183,50 +268,339 @@ class Metric:
     value: float
     ts_ms: int
 
+# Class: _Series, fixed-size circular buffer of (value, ts_ms) for one metric
+    # both columns are preallocated array('d') so push just overwrites two slots, no objects and no list shifting
+    # running aggregates (EMA per registered alpha, Welford count/mean/variance, min/max) are updated on push
+    # and cover every sample since the series was created, not just the ones still in the ring
+
+class _Series:
+    __slots__ = ("capacity", "values", "ts", "head", "count", "n", "mean", "m2", "lo", "hi", "emas")
+
+    def __init__(self, capacity: int, alphas: Tuple[float, ...] = ()):
+        self.capacity = max(1, int(capacity))
+        self.values = array("d", bytes(8 * self.capacity))
+        self.ts = array("d", bytes(8 * self.capacity))
+        self.head = 0       # next slot to write
+        self.count = 0      # filled slots (<= capacity)
+        self.n = 0          # samples ever pushed
+        self.mean = 0.0
+        self.m2 = 0.0       # sum of squared distances from the mean (Welford)
+        self.lo = math.inf
+        self.hi = -math.inf
+        self.emas: Dict[float, float] = dict.fromkeys(alphas, 0.0)
+
+    def push(self, value: float, ts_ms: float) -> None:
+        head = self.head
+        self.values[head] = value
+        self.ts[head] = ts_ms
+        head += 1
+        self.head = 0 if head == self.capacity else head
+        if self.count < self.capacity:
+            self.count += 1
+
+        self.n += 1
+        delta = value - self.mean
+        self.mean += delta / self.n
+        self.m2 += delta * (value - self.mean)
+        if value < self.lo:
+            self.lo = value
+        if value > self.hi:
+            self.hi = value
+
+        emas = self.emas
+        if self.n == 1:
+            for a in emas:
+                emas[a] = value
+        else:
+            for a, prev in emas.items():
+                emas[a] = _calculate_exponent(prev, value, a)
+
+    # starts tracking another alpha, seeded from the samples still buffered
+    # builds a new dict and swaps it in, a push() on another thread may be looping over the old one
+    def add_alpha(self, alpha: float) -> float:
+        arr = self.ordered(self.values)
+        v = arr[0] if arr else 0.0
+        for x in arr[1:]:
+            v = _calculate_exponent(v, x, alpha)
+        emas = dict(self.emas)
+        emas[alpha] = v
+        self.emas = emas
+
+        return v
+
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    def last(self) -> float:
+        return self.values[self.head - 1]  # head 0 wraps to the final slot
+
+    # oldest -> newest copies of the filled part of a column
+    def ordered(self, col: array) -> array:
+        if self.count < self.capacity:
+            return col[: self.count]
+
+        return col[self.head:] + col[: self.head]
+
+# Class: LatencyHistogram, log-bucketed (HDR-style) histogram for long-tailed latencies
+    # bucket i covers [lowest * growth^i, lowest * growth^(i+1)) so every bucket has the same relative error
+    # histograms with the same layout can be merged, counts decay by `decay` every window_s so old tails fade out
+
+class LatencyHistogram:
+    __slots__ = ("lowest", "highest", "growth", "window_s", "decay", "counts", "_log_growth",
+                 "_total", "_max", "_prev_max", "_window_start")
+
+    def __init__(self, lowest: float = 0.01, highest: float = 600_000.0, growth: float = 1.04,
+                 window_s: float = 60.0, decay: float = 0.5):
+        self.lowest = lowest
+        self.highest = highest
+        self.growth = growth
+        self.window_s = window_s
+        self.decay = decay
+        self._log_growth = math.log(growth)
+        size = int(math.ceil(math.log(highest / lowest) / self._log_growth)) + 2  # + underflow and overflow
+        self.counts = array("d", bytes(8 * size))
+        self._total = 0.0
+        self._max = 0.0          # largest value this window
+        self._prev_max = 0.0     # largest value last window
+        self._window_start = time.monotonic()
+
+    def _index(self, value: float) -> int:
+        if value < self.lowest:
+            return 0
+        if value >= self.highest:
+            return len(self.counts) - 1
+
+        return 1 + int(math.log(value / self.lowest) / self._log_growth)
+
+    # midpoint (geometric) of a bucket, which is what quantiles report
+    def _value_at(self, index: int) -> float:
+        if index == 0:
+            return self.lowest
+        if index == len(self.counts) - 1:
+            return self.highest
+
+        return self.lowest * self.growth ** (index - 1 + 0.5)
+
+    # applies decay for every full window that passed since the last one
+    def _roll(self, now: float) -> None:
+        windows = int((now - self._window_start) // self.window_s) if self.window_s > 0 else 0
+        if windows <= 0:
+            return
+        factor = self.decay ** windows
+        counts = self.counts
+        for i in range(len(counts)):
+            if counts[i]:
+                counts[i] *= factor
+        self._total *= factor
+        self._prev_max = self._max if windows == 1 else 0.0
+        self._max = 0.0
+        self._window_start += windows * self.window_s
+
+    # Function: record, adds one sample
+    def record(self, value: float) -> None:
+        self._roll(time.monotonic())
+        value = max(0.0, value)
+        self.counts[self._index(value)] += 1.0
+        self._total += 1.0
+        if value > self._max:
+            self._max = value
+
+    # Function: merge, adds another histogram's (already decayed) counts into this one
+    def merge(self, other: "LatencyHistogram") -> None:
+        if (other.lowest, other.highest, other.growth) != (self.lowest, self.highest, self.growth):
+            raise ValueError("histograms have different bucket layouts")
+        now = time.monotonic()
+        self._roll(now); other._roll(now)
+        for i, c in enumerate(other.counts):
+            if c:
+                self.counts[i] += c
+        self._total += other._total
+        self._max = max(self._max, other._max)
+        self._prev_max = max(self._prev_max, other._prev_max)
+
+    # Function: count, decayed number of samples held
+    def count(self) -> float:
+        return self._total
+
+    # Function: max, largest sample seen in the current and previous window
+    def max(self) -> float:
+        return max(self._max, self._prev_max)
+
+    # Function: quantile, q-th percentile (0-100), accurate to about half the bucket growth
+    def quantile(self, q: float) -> float:
+        self._roll(time.monotonic())
+        if self._total <= 0:
+            return 0.0
+        target = _restrict_value(q / 100.0, 0.0, 1.0) * self._total
+        seen = 0.0
+        for i, c in enumerate(self.counts):
+            if not c:
+                continue
+            seen += c
+            if seen >= target:
+                return min(self._value_at(i), self.max() or self._value_at(i))
+
+        return self.max()
+
+    # Function: summary, p50/p90/p99/max and the decayed count
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": round(self.count(), 1),
+            "p50": round(self.quantile(50), 3),
+            "p90": round(self.quantile(90), 3),
+            "p99": round(self.quantile(99), 3),
+            "max": round(self.max(), 3),
+        }
+
+    def reset(self) -> None:
+        for i in range(len(self.counts)):
+            self.counts[i] = 0.0
+        self._total = self._max = self._prev_max = 0.0
+        self._window_start = time.monotonic()
+
 # Class: MetricStore, ring-buffered store for time series metrics
 
 @dataclass
 class MetricStore:
     capacity: int = 256
-    _data: Dict[str, List[Metric]] = field(default_factory=dict)
+    alphas: Tuple[float, ...] = (0.2, 0.25)    # EMAs kept up to date on every push
+    _data: Dict[str, _Series] = field(default_factory=dict)
+    _hists: Dict[str, LatencyHistogram] = field(default_factory=dict)
 
     # Function: push, will append a metric sample by its desired name for Jazmin
 
     def push(self, name: str, value: float) -> None:
-        arr = self._data.setdefault(name, [])
-        arr.append(Metric(name, _convert_float(value), _get_current_time()))
+        series = self._data.get(name)
+        if series is None:
+            series = self._data.setdefault(name, _Series(self.capacity, self.alphas))
+
+        series.push(_convert_float(value), time.time() * 1000.0)
+
+    # Function: observe, pushes a sample and records it in the metric's histogram
+
+    def observe(self, name: str, value: float) -> None:
+        value = _convert_float(value)
+        self.push(name, value)
+        self.histogram(name).record(value)
 
-        if len(arr) > self.capacity:
-            del arr[: len(arr) - self.capacity]
+    # Function: histogram, returns (creating if needed) the histogram for a metric
+    def histogram(self, name: str) -> LatencyHistogram:
+        hist = self._hists.get(name)
+        if hist is None:
+            hist = self._hists.setdefault(name, LatencyHistogram())
+
+        return hist
+
+    # Function: histograms, returns every histogram by metric name
+    def histograms(self) -> Dict[str, LatencyHistogram]:
+        return dict(self._hists)
 
     # Function: latest, returns the latest value for a metric function
 
     def latest(self, name: str, default: float = 0.0) -> float:
-        arr = self._data.get(name)
+        series = self._data.get(name)
+
+        return series.last() if series and series.count else default
 
-        return arr[-1].value if arr else default
+    # Function: values, returns the buffered values oldest to newest
+
+    def values(self, name: str) -> List[float]:
+        series = self._data.get(name)
+
+        return series.ordered(series.values).tolist() if series else []
 
     # Function: ema, returns an EMA of the metric series
+        # registered alphas are read straight from the running value, any other alpha is registered on first use
 
     def ema(self, name: str, alpha: float = 0.2, default: float = 0.0) -> float:
-        arr = self._data.get(name)
+        series = self._data.get(name)
 
-        if not arr:
+        if series is None or not series.n:
             return default
-        v = arr[0].value
-
-        for m in arr[1:]:
-            v = _calculate_exponent(v, m.value, alpha)
+        v = series.emas.get(alpha)
+        if v is None:
+            v = self.register_alpha(alpha, name)
 
         return v
 
+    # Function: register_alpha, keeps an extra EMA alpha up to date on push (for one series or all of them)
+    def register_alpha(self, alpha: float, name: Optional[str] = None) -> float:
+        if name is None:
+            if alpha not in self.alphas:
+                self.alphas = self.alphas + (alpha,)
+            for series in list(self._data.values()):
+                if alpha not in series.emas:
+                    series.add_alpha(alpha)
+
+            return alpha
+
+        series = self._data.get(name)
+
+        return series.add_alpha(alpha) if series else 0.0
+
+    # Function: count, number of samples ever pushed for a metric
+    def count(self, name: str) -> int:
+        series = self._data.get(name)
+
+        return series.n if series else 0
+
+    # Function: stats, returns the running aggregates of one metric in O(1)
+    def stats(self, name: str) -> Dict[str, Any]:
+        series = self._data.get(name)
+        if not series or not series.n:
+            return {}
+        var = series.variance()
+
+        return {
+            "count": series.n,
+            "min": round(series.lo, 3),
+            "max": round(series.hi, 3),
+            "mean": round(series.mean, 3),
+            "var": round(var, 3),
+            "std": round(math.sqrt(var), 3),
+            "ema": {f"{a:g}": round(v, 3) for a, v in series.emas.items()},
+        }
+
+    # Function: aggregates, returns stats() for every metric
+    def aggregates(self) -> Dict[str, Dict[str, Any]]:
+        return {k: self.stats(k) for k in list(self._data) if self._data[k].n}
+
+    # Function: percentile, returns the q-th percentile (0-100) of the buffered samples
+    def percentile(self, name: str, q: float, default: float = 0.0) -> float:
+        values = sorted(self.values(name))
+
+        if not values:
+            return default
+        idx = _restrict_value(q / 100.0, 0.0, 1.0) * (len(values) - 1)
+        lo = int(idx)
+        hi = min(lo + 1, len(values) - 1)
+
+        return values[lo] + (values[hi] - values[lo]) * (idx - lo)
+
+    # Function: percentiles, returns p50/p95/p99 for a metric series
+    def percentiles(self, name: str, qs: Tuple[float, ...] = (50, 95, 99)) -> Dict[str, float]:
+        series = self._data.get(name)
+        if not series or not series.count:
+            return {}
+
+        return {f"p{q:g}": round(self.percentile(name, q), 3) for q in qs}
+
+    # Function: samples, returns the buffered samples of one metric as Metric records
+    def samples(self, name: str) -> List[Metric]:
+        series = self._data.get(name)
+        if not series:
+            return []
+
+        return [Metric(name, v, int(t)) for v, t in zip(series.ordered(series.values), series.ordered(series.ts))]
+
     # Function: snapshot, returns the most recent value per metric
     def snapshot(self) -> Dict[str, float]:
-        return {k: v[-1].value for k, v in self._data.items() if v}
+        return {k: s.last() for k, s in list(self._data.items()) if s.count}
 
     # Function: resets and clears all metrics
     def reset(self) -> None:
         self._data.clear()
+        self._hists.clear()
 
     # Function: export_csv, writes all samples to a CSV file thats hidden
     def export_csv(self, path: str | Path) -> None:
@@ -234,10 +608,85 @@ class MetricStore:
         with path.open("w", newline="", encoding="utf-8") as f:
             w = csv.writer(f)
             w.writerow(["name", "value", "ts_ms"])
-            for name, series in self._data.items():
-                for m in series:
+            for name in list(self._data):
+                for m in self.samples(name):
                     w.writerow([name, m.value, m.ts_ms])
 
+    # Function: export_columnar, writes every sample in a compressed binary file (.npz with NumPy, .parquet with pyarrow)
+        # the suffix picks the format, any other suffix uses whichever library is installed, CSV when neither is
+        # returns the path actually written
+    def export_columnar(self, path: str | Path) -> Path:
+        path = Path(path)
+        order = {".npz": ("numpy",), ".parquet": ("pyarrow",)}.get(path.suffix.lower(), ("numpy", "pyarrow"))
+
+        for lib in order:
+            try:
+                if lib == "numpy":
+                    import numpy as np
+                else:
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+            except ImportError:
+                continue
+
+            names = [k for k in list(self._data) if self._data[k].count]
+            if lib == "numpy":
+                out = path if path.suffix.lower() == ".npz" else path.with_suffix(".npz")
+                arrays: Dict[str, Any] = {"names": np.array(names)}
+                for i, name in enumerate(names):
+                    series = self._data[name]
+                    arrays[f"s{i}_values"] = np.frombuffer(series.ordered(series.values), dtype=np.float64)
+                    arrays[f"s{i}_ts_ms"] = np.frombuffer(series.ordered(series.ts), dtype=np.float64)
+                np.savez_compressed(out, **arrays)
+            else:
+                out = path if path.suffix.lower() == ".parquet" else path.with_suffix(".parquet")
+                col_name: List[str] = []; col_ts = array("d"); col_val = array("d")
+                for name in names:
+                    series = self._data[name]
+                    col_name.extend([name] * series.count)
+                    col_ts.extend(series.ordered(series.ts))
+                    col_val.extend(series.ordered(series.values))
+                table = pa.table({
+                    "name": pa.array(col_name).dictionary_encode(),
+                    "ts_ms": pa.array(col_ts, type=pa.float64()),
+                    "value": pa.array(col_val, type=pa.float64()),
+                })
+                pq.write_table(table, str(out), compression="zstd")
+
+            return out
+
+        out = path.with_suffix(".csv")
+        _log("Metrics", "numpy/pyarrow not installed, writing CSV", level=logging.WARNING)
+        self.export_csv(out)
+
+        return out
+
+    # Function: to_prometheus, every metric in Prometheus text exposition format
+        # series -> gauge (latest) + counter (samples), histograms -> quantile gauges + max
+    def to_prometheus(self, prefix: str = "jazmin") -> str:
+        lines: List[str] = []
+        for name in sorted(self._data):
+            series = self._data[name]
+            if not series.n:
+                continue
+            metric = _prom_name(prefix, name)
+            lines += [
+                f"# TYPE {metric} gauge", f"{metric} {_prom_value(series.last())}",
+                f"# TYPE {metric}_samples_total counter", f"{metric}_samples_total {series.n}",
+            ]
+
+        for name in sorted(self._hists):
+            hist = self._hists[name]
+            if not hist.count():
+                continue
+            metric = _prom_name(prefix, name) + "_window"
+            lines.append(f"# TYPE {metric} gauge")
+            for q in (50, 90, 99):
+                lines.append(f'{metric}{{quantile="{q / 100:g}"}} {_prom_value(hist.quantile(q))}')
+            lines.append(f'{metric}{{quantile="1"}} {_prom_value(hist.max())}')
+
+        return "\n".join(lines) + "\n"
+
 
 # config schema for optimization in Jazmin
 
@@ -274,6 +723,39 @@ class OptimizerConfig:
         return {"flags": self.flags, "params": self.params, "profile": self.profile, "revision": self.revision}
 
 
+# Class: Dataclass, TuneLoop
+    # hysteresis for one tuned parameter, proposals inside the deadband are ignored and a change only
+    # lands after it was proposed in the same direction for hold_up / hold_down ticks in a row
+
+@dataclass
+class TuneLoop:
+    lo: float
+    hi: float
+    band: float = 0.1       # relative deadband around the current value
+    hold_up: int = 1
+    hold_down: int = 3
+    _dir: int = 0
+    _ticks: int = 0
+
+# Function: settle, returns the value to use this tick given the controller's proposal
+    def settle(self, current: float, proposed: float) -> float:
+        proposed = _restrict_value(proposed, self.lo, self.hi)
+        if abs(proposed - current) <= self.band * max(abs(current), 1e-9):
+            self._dir = self._ticks = 0
+
+            return current
+
+        direction = 1 if proposed > current else -1
+        self._ticks = self._ticks + 1 if direction == self._dir else 1
+        self._dir = direction
+        if self._ticks < (self.hold_up if direction > 0 else self.hold_down):
+            return current
+
+        self._dir = self._ticks = 0
+
+        return proposed
+
+
 # core optimizer of program
 
 # Class: Optimizer, owns metrics, config, and tuning logic
@@ -284,11 +766,24 @@ class Optimizer:
         self.metrics = metrics or MetricStore()
         self._lock = threading.Lock()
         self._bg_task: Optional[asyncio.Task] = None
-        self._rand_seed = random.randint(1_000, 9_999)
+        self._listeners: Dict[str, List[Callable[[Any], None]]] = {}
+        self._seen_underruns = 0
+        self.scheduler = OptimizerScheduler(self)
+        self._metrics_server: Optional[ThreadingHTTPServer] = None
+
+        # the safe direction (longer timeout, bigger buffer) applies at once, the other waits 3 ticks
+        # fps drops after 2 late ticks in a row, so one busy moment does not cost a fifth of the frame rate
+        self._loops: Dict[str, TuneLoop] = {
+            "network.timeout_s": TuneLoop(1.5, 15.0, band=0.15, hold_up=1, hold_down=3),
+            "audio.buffer_ms": TuneLoop(80, 240, band=0.05, hold_up=1, hold_down=3),
+            "gui.target_fps": TuneLoop(24, 60, band=0.05, hold_up=3, hold_down=2),
+        }
 
 #  public api access
 
-# Function: adaptive_pipeline_tune, nudges thr params based on smoothed metrics
+# Function: adaptive_pipeline_tune, derives params from measured signals (one controller step per call)
+    # network.timeout_s follows the RTT p99, audio.buffer_ms is AIMD on underruns / latency, gui.target_fps backs off on late frames
+    # params without a signal yet are left as they are, apply_tuning() pushes the result to the listeners
     @profile
     def adaptive_pipeline_tune(self, cfg: Dict[str, Any]) -> Dict[str, Any]:
         if not self.config.flags.get("enable_adaptive_tuning", True):
@@ -297,61 +792,106 @@ class Optimizer:
             return cfg
 
         with timed("Adaptive"):
-            _pause_sleep(0.18, 0.42)
-
             tuned = cfg.copy()
-            gui = self.metrics.ema("gui.frame_time_ms", alpha=0.25, default=16.7)  # ~60 FPS
-            aud = self.metrics.ema("audio.latency_ms", alpha=0.25, default=120.0)
-
-            tuned["audio.buffer_ms"] = _restrict_value(_convert_float(cfg.get("audio.buffer_ms", 160)) * _return_random((0.97, 1.03)), 80, 240)
-            tuned["gui.target_fps"] = int(_restrict_value(_convert_float(cfg.get("gui.target_fps", 60)) * (60.0 / max(gui / 16.7, 0.5)), 45, 75))
-            tuned["speech.max_concurrent_prompts"] = int(_restrict_value(_convert_float(cfg.get("speech.max_concurrent_prompts", 1)) * (120.0 / max(aud, 60.0)), 1, 2))
-
-            for k in ("network.timeout_s", "scheduler.quantum_ms"):
-                base = _convert_float(cfg.get(k, DEFAULT_CONFIG.get(k, 1.0)))
-                tuned[k] = round(_restrict_value(base * _return_random(), 0.5, base * 1.5), 3)
+            hists = self.metrics.histograms()
+
+            # a few round trips of headroom, raised at once and lowered at most 20% a step
+            rtt = hists.get("net.rtt_ms")
+            timeout = _convert_float(cfg.get("network.timeout_s", 4.5))
+            if rtt is not None and rtt.count() >= 5:
+                target = 3.0 * rtt.quantile(99) / 1000.0 + 0.5
+                proposed = target if target > timeout else max(target, timeout * 0.8)
+                tuned["network.timeout_s"] = round(self._loops["network.timeout_s"].settle(timeout, proposed), 2)
+
+            # grow by half on any underrun, otherwise probe down (faster when over the latency budget)
+            buf = _convert_float(cfg.get("audio.buffer_ms", 160))
+            underruns = self.metrics.count("audio.underruns")
+            new_underruns, self._seen_underruns = underruns - self._seen_underruns, underruns
+            aud = hists.get("audio.latency_ms")
+            if new_underruns:
+                tuned["audio.buffer_ms"] = int(round(self._loops["audio.buffer_ms"].settle(buf, buf * 1.5)))
+            elif aud is not None and aud.count() >= 3:
+                over = aud.quantile(90) > _convert_float(cfg.get("audio.max_latency_ms", 250))
+                tuned["audio.buffer_ms"] = int(round(self._loops["audio.buffer_ms"].settle(buf, buf - (20 if over else 10))))
+
+            # drop a fifth when GIF frames land late or get skipped, creep back 5 fps at a time
+            # the clock only wakes once per frame, so up to one frame of lateness is quantisation, behind is half a frame past that
+            late = self.metrics.percentile("gui.gif_lateness_ms", 90, default=-1.0)
+            if late >= 0:
+                fps = _convert_float(cfg.get("gui.target_fps", 60))
+                behind = late > 1500.0 / max(fps, 1.0) or self.metrics.ema("gui.dropped_frames", alpha=0.25) > 0.5
+                proposed = fps * 0.8 if behind else min(fps + 5, _convert_float(cfg.get("gui.max_fps", 60)))
+                tuned["gui.target_fps"] = int(round(self._loops["gui.target_fps"].settle(fps, proposed)))
+
+            ema_aud = self.metrics.ema("audio.latency_ms", alpha=0.25, default=120.0)
+            tuned["speech.max_concurrent_prompts"] = int(_restrict_value(_convert_float(cfg.get("speech.max_concurrent_prompts", 1)) * (120.0 / max(ema_aud, 60.0)), 1, 2))
 
             _log("Tune", _tune_line(tuned))
 
             return tuned
 
-# Function: benchmark_subsystems, runs synthetic probes and stores metrics
+# Function: apply_tuning, stores every tuned param that changed (listeners apply them to the mixer, HTTP and animation clock)
+    def apply_tuning(self, tuned: Dict[str, Any]) -> Dict[str, Any]:
+        changed = {k: v for k, v in tuned.items() if self.config.params.get(k) != v}
+        for k, v in changed.items():
+            self.set_param(k, v)
+
+        return changed
+
+# Function: benchmark_subsystems, bench scores from the latest report the CLI stored (python jazmin_benchmark.py)
+    # reading it decodes and serves nothing, so it is cheap enough for session start while the boot pipeline is busy
+    # run=True also runs the quick benches (jazmin_benchmark.QUICK_BENCHES) now and stores them as bench.* metrics
     @profile
-    def benchmark_subsystems(self) -> Dict[str, float]:
+    def benchmark_subsystems(self, run: bool = False) -> Dict[str, float]:
         with timed("Benchmark"):
-            _pause_sleep(0.3, 0.6)
+            try:
+                import jazmin_benchmark as jb
+                stored = jb.latest_report() or {}
+                report = jb.run_suite(jb.QUICK_BENCHES, verbose=False) if run else {"results": {}}
+            except Exception as e:
+                _log("Bench", f"suite unavailable: {e}", level=logging.WARNING)
+
+                return {}
 
-            scores = {
-                "audio_engine": round(random.uniform(85, 99), 2),
-                "gui_responsiveness": round(random.uniform(80, 98), 2),
-                "speech_latency": round(random.uniform(90, 99), 2),
-            }
+            results = {**stored.get("results", {}), **report["results"]}
+            scores = {name: float(r["value"]) for name, r in results.items()}
 
-            self.metrics.push("gui.frame_time_ms", 1000.0 / random.uniform(55, 70))
-            self.metrics.push("audio.latency_ms", random.uniform(90, 160))
-            self.metrics.push("net.rtt_ms", random.uniform(20, 120))
+            for name, r in report["results"].items():
+                self.metrics.push(f"bench.{name}", r["value"])
             _log("Bench", _bench_line(scores))
 
             return scores
 
-# Function: predictive_scaling, recommends the CPU/MEM/GPU based on a toy cycle here
+# Function: predictive_scaling, when the user is next expected (from the local launch/turn history) and when to prewarm
+    # the prewarming itself is done by jazmin_usage's scheduler job, this is the plan it follows
     @profile
-    def predictive_scaling(self, forecast_hours: int = 12) -> Dict[str, str]:
+    def predictive_scaling(self, forecast_hours: int = 12) -> Dict[str, Any]:
         if not self.config.flags.get("enable_predictive_scaling", True):
-            return {"cpu_alloc": "auto", "memory_alloc": "auto", "gpu_alloc": "auto"}
+            return {"prewarm": "off"}
 
         with timed(f"Predict{forecast_hours}h"):
-            _pause_sleep(0.2, 0.4)
-
-            phi = (time.time() / 3600.0) % 24 / 24.0
-            bias = 0.75 + 0.25 * math.sin(2 * math.pi * phi + self._rand_seed)
-
-            cpu = max(2, int(round(6 * bias)))
-            mem = max(4, int(round(12 * bias)))
-            gpu = 1 if bias < 0.85 else 2           # WHAT
-
-            plan = {"cpu_alloc": f"{cpu} cores", "memory_alloc": f"{mem} GB", "gpu_alloc": f"{gpu} units"}
-            _log("Predict", f"cpu={cpu} mem={mem} gpu={gpu}")
+            import jazmin_usage as ju
+            history = ju.get_history()
+            threshold = _convert_float(self.get_param("usage.prewarm_threshold", 0.35), 0.35)
+            now = time.time()
+
+            if history.total() < ju.MIN_EVENTS:
+                plan: Dict[str, Any] = {"prewarm": "no history", "events": round(history.total(), 1)}
+            else:
+                nxt = history.next_active(forecast_hours, threshold, now)
+                if nxt is None:
+                    plan = {"prewarm": "none due", "next_active": None}
+                else:
+                    start, likelihood = nxt
+                    lead_s = _convert_float(self.get_param("usage.prewarm_lead_min", 15), 15.0) * 60.0
+                    local = time.localtime(start)
+                    plan = {
+                        "next_active": f"{ju.DAYS[local.tm_wday]} {local.tm_hour:02d}:00",
+                        "in_minutes": int(max(0.0, start - now) // 60),
+                        "likelihood": round(likelihood, 2),
+                        "prewarm": "now" if start - lead_s <= now else time.strftime("%H:%M", time.localtime(start - lead_s)),
+                    }
+            _log("Predict", " ".join(f"{k}={v}" for k, v in plan.items()))
 
             return plan
 
@@ -363,11 +903,21 @@ class Optimizer:
         self.config.flags[name] = bool(value)
         _log("Flags", f"{name}={value}")
 
-# Function: set_param, updates a tuning parameter
+# Function: set_param, updates a tuning parameter and tells anything applying it
     def set_param(self, name: str, value: Any) -> None:
         self.config.params[name] = value
         _log("Params", f"{name}={value}")
 
+        for callback in list(self._listeners.get(name, ())):
+            try:
+                callback(value)
+            except Exception as e:
+                _log("Params", f"apply {name} failed: {e}", level=logging.WARNING)
+
+# Function: on_param_change, registers a callback run (on the caller's thread) whenever a param is set
+    def on_param_change(self, name: str, callback: Callable[[Any], None]) -> None:
+        self._listeners.setdefault(name, []).append(callback)
+
 # Function: get_param, reads a tuning parameter with default
     def get_param(self, name: str, default: Any = None) -> Any:
         
@@ -392,36 +942,130 @@ class Optimizer:
         
         _log("Metrics", f"csv->{path}")
 
+# Function: export_metrics, saves metrics in the compact binary format (see MetricStore.export_columnar)
+    def export_metrics(self, path: str | Path) -> Path:
+        out = self.metrics.export_columnar(path)
+
+        _log("Metrics", f"export->{out}")
+
+        return out
+
+# Function: start_metrics_server, serves /metrics in Prometheus format on 127.0.0.1 (returns the port)
+    def start_metrics_server(self, port: Optional[int] = None) -> int:
+        with self._lock:
+            if self._metrics_server is None:
+                port = int(self.get_param("metrics.port", 9464) if port is None else port)
+                server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+                server.daemon_threads = True
+                server.optimizer = self  # type: ignore[attr-defined]
+                threading.Thread(target=server.serve_forever, name="jazmin-metrics", daemon=True).start()
+                self._metrics_server = server
+                _log("Metrics", f"serving http://127.0.0.1:{server.server_address[1]}/metrics")
+
+            return self._metrics_server.server_address[1]
+
+# Function: stop_metrics_server, stops the endpoint
+    def stop_metrics_server(self) -> None:
+        with self._lock:
+            server, self._metrics_server = self._metrics_server, None
+        if server is not None:
+            server.shutdown()
+            server.server_close()
+
 # Function: measure_audio_latency, records a single audio latency sample
     def measure_audio_latency(self, ms: float) -> None:
-        self.metrics.push("audio.latency_ms", ms)
+        self.metrics.observe("audio.latency_ms", ms)
         
         _log("Measure", f"aud={_format_ms(ms,1)}")
 
-# Function: measure_gui_frame_time, records a single GUI frame time sample
-    def measure_gui_frame_time(self, ms: float) -> None:
-        self.metrics.push("gui.frame_time_ms", ms)
-        
-        _log("Measure", f"ft={_format_ms(ms,2)}")
+# Function: measure_audio_stages, records the per-stage times (ms) of one spoken line as audio.stage.<name>_ms
+    def measure_audio_stages(self, stages: Dict[str, float]) -> None:
+        for name, ms in stages.items():
+            self.metrics.observe(f"audio.stage.{name}_ms", max(0.0, ms))
+
+        _log("Measure", " ".join(f"{k}={_format_ms(v, 0)}" for k, v in stages.items()), level=logging.DEBUG)
+
+# Function: audio_stages, p50/p90/p99 of every audio stage that has samples, in pipeline order
+    def audio_stages(self) -> Dict[str, Dict[str, float]]:
+        out: Dict[str, Dict[str, float]] = {}
+        hists = self.metrics.histograms()
+        for name in AUDIO_STAGES:
+            h = hists.get(f"audio.stage.{name}_ms")
+            if h is not None and h.count():
+                out[name] = h.summary()
+
+        return out
+
+# Function: slowest_audio_stage, the stage (not total) with the highest median, where tuning should look first
+    def slowest_audio_stage(self) -> Optional[str]:
+        stages = {k: v for k, v in self.audio_stages().items() if k != "total"}
+
+        return max(stages, key=lambda k: stages[k]["p50"]) if stages else None
+
+# Function: measure_gui_frame_time, records a single GUI frame time sample plus the UI dispatch queue state
+    def measure_gui_frame_time(self, ms: float, queue_depth: Optional[int] = None, drain_ms: Optional[float] = None) -> None:
+        self.metrics.observe("gui.frame_time_ms", ms)
+        if queue_depth is not None:
+            self.metrics.push("gui.dispatch_depth", queue_depth)
+        if drain_ms is not None:
+            self.metrics.push("gui.dispatch_drain_ms", drain_ms)
+
+        # called every frame by the dispatcher so it stays at DEBUG
+        _log("Measure", f"ft={_format_ms(ms,2)}", level=logging.DEBUG)
+
+# Function: measure_after_lateness, records how late an after() callback fired versus when it was scheduled
+    def measure_after_lateness(self, ms: float) -> None:
+        self.metrics.push("gui.after_lateness_ms", max(0.0, ms))
+
+# Function: measure_gif_frame, records how late a GIF frame was shown and how many frames were skipped to catch up
+    def measure_gif_frame(self, lateness_ms: float, dropped: int = 0) -> None:
+        self.metrics.push("gui.gif_lateness_ms", max(0.0, lateness_ms))
+        self.metrics.push("gui.dropped_frames", dropped)
+
+# Function: measure_handler, records how long a Tk event handler ran
+    def measure_handler(self, name: str, ms: float) -> None:
+        self.metrics.push("gui.handler_ms", ms)
+        self.metrics.push(f"gui.handler_ms.{name}", ms)
+
+        _log("Measure", f"{name}={_format_ms(ms,2)}", level=logging.DEBUG)
+
+# Function: measure_audio_underrun, records that playback stalled (the mixer ran out of buffered audio)
+    def measure_audio_underrun(self, count: int = 1) -> None:
+        for _ in range(max(0, int(count))):
+            self.metrics.push("audio.underruns", 1)
+
+        _log("Measure", f"underrun x{count}")
 
 # Function: report_network_rtt, records a single RTT sample
     def report_network_rtt(self, ms: float) -> None:
-        self.metrics.push("net.rtt_ms", ms)
+        self.metrics.observe("net.rtt_ms", ms)
         
         _log("Measure", f"rtt={_format_ms(ms,0)}")
 
-# Function: summary, logs a compact summary and returns a dict
-    def summary(self) -> Dict[str, Any]:
+# Function: report, the full state (config, latest values, percentiles, aggregates, histograms) as a dict
+    def report(self) -> Dict[str, Any]:
         snap = self.metrics.snapshot()
-        out = {
+
+        return {
             "profile": self.config.profile,
             "revision": self.config.revision,
             "flags": self.config.flags.copy(),
             "params": self.config.params.copy(),
             "latest": snap,
+            "percentiles": {k: self.metrics.percentiles(k) for k in GUI_LATENCY_SERIES if k in snap},
+            "aggregates": self.metrics.aggregates(),
+            "histograms": {k: h.summary() for k, h in self.metrics.histograms().items() if h.count()},
+            "audio_stages": self.audio_stages(),
+            "audio_bottleneck": self.slowest_audio_stage(),
         }
+
+# Function: summary, logs a compact summary and returns report()
+    def summary(self) -> Dict[str, Any]:
+        out = self.report()
         
-        _log("Summary", f"{self.config.profile} rev={self.config.revision} {_snap_line(snap)}")
+        _log("Summary", f"{self.config.profile} rev={self.config.revision} {_snap_line(out['latest'], self.metrics.histograms())}")
+        if out["audio_stages"]:
+            _log("Summary", f"audio {_stage_line(out['audio_stages'], out['audio_bottleneck'])}")
         
         return out
 
@@ -433,7 +1077,6 @@ class Optimizer:
         try:
 
             while True:
-                self.metrics.push("gui.frame_time_ms", 1000.0 / random.uniform(50, 72))
                 self.metrics.push("audio.latency_ms", random.uniform(95, 155))
                 self.metrics.push("net.rtt_ms", random.uniform(18, 140))
                 await asyncio.sleep(interval_s)
@@ -463,6 +1106,144 @@ class Optimizer:
             self._bg_task.cancel()
 
 
+# Class: Dataclass, ScheduledJob
+    # a periodic job run by the OptimizerScheduler
+
+@dataclass
+class ScheduledJob:
+    name: str
+    fn: Callable[[], Any]
+    interval_s: float
+    next_due: float = 0.0
+
+
+# Class: OptimizerScheduler
+    # one long-lived thread for the optimizer's periodic work (replaces a new thread per idle tick)
+    # a tick runs the due jobs until its CPU budget is spent, the rest run right after on the next wake
+    # while the app is busy a tick is skipped, but never more than max_skips in a row
+
+class OptimizerScheduler:
+    def __init__(self, optimizer: "Optimizer", max_skips: int = 3):
+        self._opt = optimizer
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._skips = 0
+        self._cpu_mark = (time.process_time(), time.perf_counter())
+        self.max_skips = max_skips
+
+# Function: every, runs fn every interval_s seconds (first run one interval from now), replaces a job with the same name
+    def every(self, name: str, interval_s: float, fn: Callable[[], Any]) -> None:
+        with self._lock:
+            self._jobs[name] = ScheduledJob(name, fn, float(interval_s), time.monotonic() + float(interval_s))
+        self._wake.set()
+
+# Function: cancel, removes a job
+    def cancel(self, name: str) -> None:
+        with self._lock:
+            self._jobs.pop(name, None)
+
+# Function: has, true when a job with this name is scheduled
+    def has(self, name: str) -> bool:
+        return name in self._jobs
+
+# Function: start, starts the scheduler thread once
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="jazmin-optimizer", daemon=True)
+            self._thread.start()
+        _log("Scheduler", f"start jobs={','.join(self._jobs) or 'none'}")
+
+# Function: stop, stops the thread after the job that is running (if any)
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            now = time.monotonic()
+            with self._lock:
+                jobs = sorted(self._jobs.values(), key=lambda j: j.next_due)
+            due = [j for j in jobs if j.next_due <= now]
+
+            if not due:
+                timeout = max(0.01, jobs[0].next_due - now) if jobs else None
+                self._wake.wait(timeout)
+                self._wake.clear()
+                continue
+
+            if self._busy() and self._skips < self.max_skips:
+                self._skips += 1
+                for job in due:
+                    job.next_due = now + job.interval_s
+                self._opt.metrics.push("optimizer.skipped_ticks", 1)
+                _log("Scheduler", f"busy, skipped {','.join(j.name for j in due)} ({self._skips}/{self.max_skips})", level=logging.DEBUG)
+                continue
+
+            self._skips = 0
+            self._tick(due)
+
+    # runs due jobs in order while the thread's CPU time stays under the budget
+    def _tick(self, due: List[ScheduledJob]) -> None:
+        budget_ms = _convert_float(self._opt.get_param("scheduler.tick_budget_ms", 25), 25.0)
+        wall0, cpu0 = time.perf_counter(), time.thread_time()
+
+        for i, job in enumerate(due):
+            if i and (time.thread_time() - cpu0) * 1000.0 >= budget_ms:
+                _log("Scheduler", f"budget spent, deferring {','.join(j.name for j in due[i:])}", level=logging.DEBUG)
+                break  # still due, picked up straight away on the next pass
+
+            job.next_due = time.monotonic() + job.interval_s
+            try:
+                job.fn()
+            except Exception as e:
+                _log("Scheduler", f"{job.name} failed: {e}", level=logging.WARNING)
+
+        tick_ms = (time.perf_counter() - wall0) * 1000.0
+        cpu_ms = (time.thread_time() - cpu0) * 1000.0
+        self._opt.metrics.push("optimizer.tick_ms", tick_ms)
+        self._opt.metrics.push("optimizer.tick_cpu_ms", cpu_ms)
+        if cpu_ms > budget_ms:
+            _log("Scheduler", f"tick over budget cpu={_format_ms(cpu_ms,1)} budget={_format_ms(budget_ms,0)}", level=logging.DEBUG)
+
+    # busy = the process used most of a core since the last check, or the Tk loop is running late
+    def _busy(self) -> bool:
+        cpu, wall = time.process_time(), time.perf_counter()
+        last_cpu, last_wall = self._cpu_mark
+        self._cpu_mark = (cpu, wall)
+        share = (cpu - last_cpu) / max(wall - last_wall, 1e-6)
+        lateness = self._opt.metrics.percentile("gui.after_lateness_ms", 90, default=0.0)
+
+        return (share > _convert_float(self._opt.get_param("scheduler.busy_cpu", 0.85), 0.85)
+                or lateness > _convert_float(self._opt.get_param("scheduler.busy_lateness_ms", 50), 50.0))
+
+
+# Class: _MetricsHandler, answers GET /metrics with the optimizer's MetricStore (localhost only)
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        if self.client_address[0] not in ("127.0.0.1", "::1"):
+            self.send_error(403)
+            return
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+
+        body = self.server.optimizer.metrics.to_prometheus().encode("utf-8")  # type: ignore[attr-defined]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args) -> None:
+        pass
+
+
 # cached facade
 
 # Function: load_optimizer, returns a cached optimizer instance
@@ -485,53 +1266,98 @@ def adaptive_pipeline_tune(config: Dict[str, Any]) -> Dict[str, Any]:
 
 # (free) Function: benchmark_subsystems, convenience wrapper for benchmarking
 @profile
-def benchmark_subsystems() -> Dict[str, float]:
+def benchmark_subsystems(run: bool = False) -> Dict[str, float]:
     opt = load_optimizer()
 
-    return opt.benchmark_subsystems()
+    return opt.benchmark_subsystems(run)
 
-# (free) Function: predictive_scaling, convenience wrapper for scaling plan
+# (free) Function: predictive_scaling, convenience wrapper for the prewarm plan
 @profile
-def predictive_scaling(forecast_hours: int = 12) -> Dict[str, str]:
+def predictive_scaling(forecast_hours: int = 12) -> Dict[str, Any]:
     opt = load_optimizer()
 
     return opt.predictive_scaling(forecast_hours)
 
 # integration points that are made into the console
 
-# Function: emit_telemetry, placeholder for backend telemetry
+# Function: emit_telemetry, hands a full payload to the background exporter (jazmin_telemetry), never blocks
+    # the payload is deep-copied first, the writer serializes it later and the tuner may change live config before then
 def emit_telemetry(payload: Dict[str, Any]) -> None:
     # needed to make sure payloads full for backends but the console log stays compact
+    if not load_optimizer().config.flags.get("enable_telemetry", True):
+        return
+
+    try:
+        import jazmin_telemetry as jt
+        exporter = jt.get_exporter()
+    except Exception as e:
+        _log("Telemetry", f"exporter unavailable: {e}", level=logging.WARNING)
+        return
+
+    if not exporter.submit(copy.deepcopy(payload)):
+        _log("Telemetry", f"queue full, dropped={exporter.stats()['dropped']}", level=logging.DEBUG)
+        return
 
-    _log("Telemetry", "emit")
+    _log("Telemetry", f"emit {payload.get('event', '?')} q={exporter.stats()['queued']}", level=logging.DEBUG)
 
-# Function: on_session_start, runs once on session start and emits telemetry
+# Function: on_session_start, runs once on session start and emits telemetry (bench scores from the last stored report)
 def on_session_start() -> None:
     opt = load_optimizer()
     scores = opt.benchmark_subsystems()
-    emit_telemetry({"event": "session_start", "scores": scores, "cfg": opt.config.to_dict()})
+    emit_telemetry({
+        "event": "session_start",
+        "host": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "scores": scores,
+        "cfg": opt.config.to_dict(),
+    })
 
     _log("Start", _bench_line(scores))
 
+# Function: start_scheduler, starts the optimizer's scheduler thread with the idle tick job
+def start_scheduler() -> OptimizerScheduler:
+    opt = load_optimizer()
+    if not opt.scheduler.has("idle_tick"):
+        opt.scheduler.every("idle_tick", _convert_float(opt.get_param("scheduler.idle_tick_s", 15), 15.0), on_idle_tick)
+    opt.scheduler.start()
+
+    if opt.config.flags.get("enable_metrics_endpoint", False):
+        try:
+            opt.start_metrics_server()
+        except OSError as e:
+            _log("Metrics", f"endpoint not started: {e}", level=logging.WARNING)
+
+    return opt.scheduler
+
 # Function: on_idle_tick, runs on idle to tune and emit a compact snapshot
 def on_idle_tick() -> None:
     opt = load_optimizer()
     tuned = opt.adaptive_pipeline_tune(opt.config.params)
-    snap = opt.metrics.snapshot()
-    emit_telemetry({"event": "idle_tick", "snapshot": snap, "tuned": tuned})
+    opt.apply_tuning(tuned)
+    state = opt.report()
+    payload = {"event": "idle_tick", "snapshot": state["latest"], "tuned": tuned, **state}
+    try:
+        import jazmin_telemetry as jt
+        payload["telemetry"] = jt.get_exporter().stats()
+    except Exception:
+        pass
+    emit_telemetry(payload)
 
-    _log("Tick", f"{_snap_line(snap)} tuned={_tune_line(tuned)}")
+    _log("Tick", f"{_snap_line(state['latest'], opt.metrics.histograms())} tuned={_tune_line(tuned)}")
 
 __all__ = [
     "Optimizer",
     "OptimizerConfig",
     "MetricStore",
+    "LatencyHistogram",
+    "AUDIO_STAGES",
     "adaptive_pipeline_tune",
     "benchmark_subsystems",
     "predictive_scaling",
     "load_optimizer",
+    "instrument",
     "on_session_start",
     "on_idle_tick",
+    "start_scheduler",
 ]
 
 # End, Spencer
\ No newline at end of file
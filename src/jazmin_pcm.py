@@ -0,0 +1,221 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_pcm.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Decode-once cache, keeps clips as raw PCM in the mixer's format so playing them again skips the MP3 decode
+# Last date edited: (10/19/26 23:45)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import hashlib
+import io
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Set
+
+# Audio libraries
+import pygame
+
+# Jazmin modules
+from jazmin_assets import app_data_dir
+from jazmin_audio import init_mixer
+
+
+PCM_SUFFIX = ".pcm"
+
+
+# Class: PcmCache
+    # app_data/pcm/<key>.pcm holds the samples of one clip exactly as the mixer plays them
+    # the key covers the source (MP3 bytes, or path + size + mtime) and the mixer format, so a new build or
+    # a re-opened mixer with another format never gets stale samples
+    # a hit maps the file and hands it to Sound(buffer=), total size is bounded with the least recently used going first
+
+class PcmCache:
+    def __init__(self, folder: Optional[str | Path] = None, max_bytes: int = 128 << 20):
+        self.folder = Path(folder) if folder is not None else app_data_dir() / "pcm"
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total = 0
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+        self._scan()
+
+    # least recently used first, the order os.utime() on a hit keeps across launches
+    def _scan(self) -> None:
+        try:
+            files = sorted(self.folder.glob(f"*{PCM_SUFFIX}"), key=lambda p: p.stat().st_mtime)
+        except OSError:
+            files = []
+        for path in files:
+            try:
+                size = path.stat().st_size
+            except OSError:
+                continue
+            self._index[path.name] = size
+            self._total += size
+
+# Function: key, the cache file name for a source (MP3 bytes or a file path) in the current mixer format
+    def key(self, source: str | Path | bytes) -> str:
+        init_mixer()
+        frequency, size, channels = pygame.mixer.get_init()
+        digest = hashlib.sha1(f"{frequency}/{size}/{channels}|".encode("utf-8"))
+        if isinstance(source, bytes):
+            digest.update(source)
+        else:
+            path = Path(source)
+            stat = path.stat()
+            digest.update(f"{path.resolve()}|{stat.st_size}|{stat.st_mtime_ns}".encode("utf-8"))
+
+        return digest.hexdigest() + PCM_SUFFIX
+
+# Function: get, a Sound built from the cached samples (Sound(buffer=) copies them), None when the clip is not decoded yet
+    def get(self, source: str | Path | bytes) -> Optional[pygame.mixer.Sound]:
+        try:
+            name = self.key(source)
+        except OSError:
+            return None
+        with self._lock:
+            known = name in self._index
+            if known:
+                self._index.move_to_end(name)
+        if not known:
+            self.misses += 1
+            return None
+
+        path = self.folder / name
+        try:
+            with open(path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            with mapped:
+                sound = pygame.mixer.Sound(buffer=mapped)
+            os.utime(path)
+        except (OSError, ValueError, pygame.error) as e:
+            print(f"[Error] [PCM] - Dropping unreadable {name}:", e)
+            self._forget(name)
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return sound
+
+# Function: load, the cached Sound, or decodes the source now and keeps its samples for next time
+    def load(self, source: str | Path | bytes) -> Optional[pygame.mixer.Sound]:
+        sound = self.get(source)
+
+        return sound if sound is not None else self._decode(source)
+
+    def _decode(self, source: str | Path | bytes) -> Optional[pygame.mixer.Sound]:
+        try:
+            init_mixer()
+            sound = pygame.mixer.Sound(file=io.BytesIO(source) if isinstance(source, bytes) else str(source))
+        except Exception as e:
+            print("[Error] [PCM] - Could not decode clip:", e)
+            return None
+
+        try:
+            self.store(self.key(source), sound.get_raw())
+        except OSError as e:
+            print("[Error] [PCM] - Could not cache clip:", e)
+
+        return sound
+
+# Function: load_later, decodes a source into the cache on a worker thread (once, however often it is asked)
+    def load_later(self, source: str | Path | bytes) -> None:
+        try:
+            name = self.key(source)
+        except OSError:
+            return
+        with self._lock:
+            if name in self._index or name in self._pending:
+                return
+            self._pending.add(name)
+
+        def run() -> None:
+            try:
+                self._decode(source)
+            finally:
+                with self._lock:
+                    self._pending.discard(name)
+
+        threading.Thread(target=run, name="jazmin-pcm", daemon=True).start()
+
+# Function: store, writes decoded samples under a key and evicts down to max_bytes
+    def store(self, name: str, raw: bytes) -> None:
+        if not raw:
+            return
+        path = self.folder / name
+        tmp = path.with_suffix(".tmp")
+        tmp.write_bytes(raw)
+        os.replace(tmp, path)
+
+        with self._lock:
+            self._total += len(raw) - self._index.pop(name, 0)
+            self._index[name] = len(raw)
+        self._evict()
+
+    def _evict(self) -> None:
+        while True:
+            with self._lock:
+                if self._total <= self.max_bytes or len(self._index) <= 1:
+                    return
+                name, size = self._index.popitem(last=False)
+                self._total -= size
+            try:
+                os.remove(self.folder / name)
+            except OSError:
+                pass
+
+    def _forget(self, name: str) -> None:
+        with self._lock:
+            self._total -= self._index.pop(name, 0)
+        try:
+            os.remove(self.folder / name)
+        except OSError:
+            pass
+
+# Function: stats, clip count, size on disk and hit/miss counts
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"clips": len(self._index), "bytes": self._total, "hits": self.hits, "misses": self.misses}
+
+
+_cache: Optional[PcmCache] = None
+_cache_lock = threading.Lock()
+
+# Function: get_pcm_cache, the shared PCM cache (size from audio.pcm_cache_mb)
+def get_pcm_cache() -> PcmCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = PcmCache(max_bytes=int(_cache_mb() * (1 << 20)))
+
+    return _cache
+
+# Function: _cache_mb, the audio.pcm_cache_mb param
+def _cache_mb() -> float:
+    try:
+        import jazmin_optimizer as jo
+        return float(jo.load_optimizer().get_param("audio.pcm_cache_mb", 128))
+    except Exception:
+        return 128.0
+
+
+__all__ = [
+    "PcmCache",
+    "get_pcm_cache",
+]
+
+# End, Spencer
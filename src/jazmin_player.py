@@ -0,0 +1,398 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_player.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: In-process voice player on the voice bus, non-blocking handles, completion callbacks, mute and a deadline-aware speak queue
+# Last date edited: (10/19/26 21:20)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import os
+import queue
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+# Audio libraries
+import pygame
+
+# Jazmin modules
+from jazmin_audio import init_mixer, wait_for_music, wait_for_channel, fade_out_music, StageTimes
+from jazmin_mixer import get_mixer
+from jazmin_pcm import get_pcm_cache
+from jazmin_trace import get_tracer, span
+
+
+# held while a line plays on the music stream, code that drives pygame.mixer.music itself takes it too
+audio_lock = threading.RLock()
+
+# how long (s) a line of each kind stays worth saying, None waits as long as it takes
+SPEAK_DEADLINES: Dict[str, Optional[float]] = {
+    "ambience": 6.0,
+    "help": 5.0,
+    "menu": 30.0,
+    "ignored": 15.0,
+    "reply": None,
+}
+
+
+# Class: PlayHandle
+    # returned by Player.play() straight away, the line plays on the player's thread
+    # status goes queued -> playing -> done, or ends as stopped / muted / expired / error
+    # deadline is a time.monotonic() value, a line still waiting past it is dropped
+    # stages collects the per-stage times, parent is the trace span the line's spans nest under
+    # cache_pcm lines are kept decoded in the PCM cache, so the next time they play without an MP3 decode
+
+class PlayHandle:
+    def __init__(self, source: str | Path | bytes, label: str = "", deadline: Optional[float] = None,
+                 stages: Optional[StageTimes] = None, cache_pcm: bool = False):
+        self.source = source
+        self.label = label or (Path(source).name if not isinstance(source, bytes) else "bytes")
+        self.deadline = deadline
+        self.cache_pcm = cache_pcm
+        self.stages = stages or StageTimes()
+        self.parent = get_tracer().current()
+        self.status = "queued"
+        self.error: Optional[Exception] = None
+        self._stop = threading.Event()
+        self._done = threading.Event()
+        self._callbacks: List[Callable[["PlayHandle"], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+# Function: expired, true once the deadline has passed
+    def expired(self) -> bool:
+        return self.deadline is not None and time.monotonic() > self.deadline
+
+# Function: stop, stops the line (or drops it if it has not started yet)
+    def stop(self) -> None:
+        self._stop.set()
+
+# Function: wait, blocks until the line has finished, true if it did within timeout
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+# Function: add_done_callback, fn(handle) runs on the player's thread when the line ends (right away if it already has)
+    def add_done_callback(self, fn: Callable[["PlayHandle"], None]) -> None:
+        with self._lock:
+            if not self._done.is_set():
+                self._callbacks.append(fn)
+                return
+        _call(fn, self)
+
+    def _finish(self, status: str) -> None:
+        with self._lock:
+            self.status = status
+            self._done.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            _call(fn, self)
+
+
+def _call(fn: Callable[[PlayHandle], None], handle: PlayHandle) -> None:
+    try:
+        fn(handle)
+    except Exception as e:
+        print(f"[Error] [Player] - Callback for {handle.label} failed:", e)
+
+
+# Class: Player
+    # one thread plays queued lines in order on the voice bus, so two lines never talk over each other
+    # a line the PCM cache has decoded plays as a Sound on the voice channel, anything else streams through pygame's music
+    # play(interrupt=True) fades the current line out and drops the queue first, sfx and ambience are ducked, not stopped
+    # while muted nothing starts and the current line is stopped
+
+class Player:
+    def __init__(self):
+        self.lock = audio_lock
+        self._queue: "queue.Queue[PlayHandle]" = queue.Queue()
+        self._current: Optional[PlayHandle] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._muted = threading.Event()
+
+# Function: play, queues a file path or MP3 bytes and returns its handle
+    def play(self, source: str | Path | bytes, on_done: Optional[Callable[[PlayHandle], None]] = None,
+             interrupt: bool = False, label: str = "", stages: Optional[StageTimes] = None,
+             cache_pcm: bool = False) -> PlayHandle:
+        handle = PlayHandle(source, label, stages=stages, cache_pcm=cache_pcm)
+        if on_done is not None:
+            handle.add_done_callback(on_done)
+
+        return self.submit(handle, interrupt)
+
+# Function: submit, queues a handle that was built elsewhere (the speak queue)
+    def submit(self, handle: PlayHandle, interrupt: bool = False) -> PlayHandle:
+        if self._muted.is_set():
+            handle._finish("muted")
+            return handle
+
+        if interrupt:
+            self.stop_all()
+        self._queue.put(handle)
+        self._start()
+
+        return handle
+
+# Function: stop_all, stops the current line and drops everything queued
+    def stop_all(self) -> None:
+        while True:
+            try:
+                self._queue.get_nowait()._finish("stopped")
+            except queue.Empty:
+                break
+
+        current = self._current
+        if current is not None:
+            current.stop()
+
+# Function: set_muted, mutes (stopping what plays) or unmutes the player
+    def set_muted(self, muted: bool) -> None:
+        if muted:
+            self._muted.set()
+            self.stop_all()
+        else:
+            self._muted.clear()
+
+    @property
+    def muted(self) -> bool:
+        return self._muted.is_set()
+
+# Function: busy, true while a line plays or waits
+    def busy(self) -> bool:
+        return self._current is not None or not self._queue.empty()
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="jazmin-player", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            handle = self._queue.get()
+            if handle._stop.is_set():
+                handle._finish("stopped")
+            elif self._muted.is_set():
+                handle._finish("muted")
+            elif handle.expired():
+                handle._finish("expired")
+            else:
+                self._current = handle
+                try:
+                    handle._finish(get_tracer().bind(self._play, handle.parent)(handle))
+                except Exception as e:
+                    handle.error = e
+                    print(f"[Error] [Player] - Could not play {handle.label}:", e)
+                    handle._finish("error")
+                finally:
+                    self._current = None
+
+    def _play(self, handle: PlayHandle) -> str:
+        mixer = get_mixer()
+        stages = handle.stages
+        stop_when = lambda: handle._stop.is_set() or self._muted.is_set()
+
+        def heard(lag_ms: float) -> None:
+            stages.mark("first_play", stages.marks["play"] + lag_ms / 1000.0)
+            stages.push()
+
+        with self.lock:
+            init_mixer()
+            stages.mark("load_start")
+            sound = get_pcm_cache().get(handle.source) if handle.cache_pcm else None
+            if sound is not None:
+                stages.mark("mixer_load")
+                fade_out_music(mixer.fade_ms)  # a line started outside the player
+                channel = mixer.play("voice", sound)
+                stages.mark("play")
+                handle.status = "playing"
+                wait_for_channel(channel, stop_when=stop_when, fade_ms=mixer.fade_ms, on_start=heard)
+            else:
+                self._stream(handle, heard, stop_when)
+                if handle.cache_pcm:
+                    get_pcm_cache().load_later(handle.source)
+
+        if self._muted.is_set():
+            return "muted"
+
+        return "stopped" if handle._stop.is_set() else "done"
+
+    # music stream playback, MP3 bytes go through a temp file since music.load wants a path
+    def _stream(self, handle: PlayHandle, heard: Callable[[float], None], stop_when: Callable[[], bool]) -> None:
+        temp_path = None
+        path = handle.source
+        if isinstance(path, bytes):
+            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as temp_audio:
+                temp_audio.write(path)
+                temp_path = path = temp_audio.name
+
+        try:
+            mixer = get_mixer()
+            fade_out_music(mixer.fade_ms)  # a line started outside the player
+            with span("audio.decode"):
+                pygame.mixer.music.load(str(path))
+            handle.stages.mark("mixer_load")
+            pygame.mixer.music.play()
+            handle.stages.mark("play")
+            mixer.bus("voice").apply()
+            handle.status = "playing"
+
+            wait_for_music(stop_when=stop_when, fade_ms=mixer.fade_ms, on_start=heard)
+            pygame.mixer.music.unload()
+        finally:
+            if temp_path is not None:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+
+# Class: SpeakQueue
+    # text to speech requests, synthesized one at a time in order and handed to the player
+    # mute and the deadline are checked before the Voicemaker call and again before playing,
+    # so stale ambience/help lines and muted lines never cost a download
+
+class SpeakQueue:
+    def __init__(self, player: Player):
+        self.player = player
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.synthesized = 0
+        self.dropped: Dict[str, int] = {"muted": 0, "expired": 0}
+
+# Function: speak, queues a line and returns its handle straight away
+    # kind picks the default deadline from SPEAK_DEADLINES, muted is a bool or a callable checked at each step
+    def speak(self, text: str, kind: str = "reply", deadline_s: Optional[float] = None,
+              muted: Union[bool, Callable[[], bool]] = False, interrupt: bool = False, use_cache: bool = True,
+              on_done: Optional[Callable[[PlayHandle], None]] = None, stages: Optional[StageTimes] = None) -> PlayHandle:
+        deadline_s = SPEAK_DEADLINES.get(kind) if deadline_s is None else deadline_s
+        deadline = time.monotonic() + deadline_s if deadline_s is not None else None
+        handle = PlayHandle(b"", label=f"{kind}: {text[:32]}", deadline=deadline, stages=stages, cache_pcm=use_cache)
+        if on_done is not None:
+            handle.add_done_callback(on_done)
+
+        if not self._drop(handle, muted):
+            self._queue.put((handle, text, muted, interrupt, use_cache))
+            self._start()
+
+        return handle
+
+# Function: stats, lines synthesized and dropped (by reason)
+    def stats(self) -> Dict[str, object]:
+        return {"queued": self._queue.qsize(), "synthesized": self.synthesized, "dropped": dict(self.dropped)}
+
+    # finishes the handle when it is muted or stale, true if it was dropped
+    def _drop(self, handle: PlayHandle, muted: Union[bool, Callable[[], bool]]) -> bool:
+        reason = None
+        if handle._stop.is_set():
+            reason = "stopped"
+        elif self.player.muted or (muted() if callable(muted) else muted):
+            reason = "muted"
+        elif handle.expired():
+            reason = "expired"
+        if reason is None:
+            return False
+
+        if reason in self.dropped:
+            self.dropped[reason] += 1
+        print(f"[Jazmin] [Speech] - Dropped ({reason}) {handle.label}")
+        handle._finish(reason)
+
+        return True
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="jazmin-speak", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        from jazmin_http import synthesize_speech
+        while True:
+            handle, text, muted, interrupt, use_cache = self._queue.get()
+            if self._drop(handle, muted):
+                continue
+
+            try:
+                audio = get_tracer().bind(synthesize_speech, handle.parent)(text, use_cache=use_cache, stages=handle.stages)
+            except Exception as e:
+                audio, handle.error = None, e
+                print(f"[Error] [Speech] - Could not synthesize {handle.label}:", e)
+            if audio is None:
+                handle._finish("error")
+                continue
+            self.synthesized += 1
+
+            if not self._drop(handle, muted):
+                handle.source = audio
+                self.player.submit(handle, interrupt)
+
+
+_player: Optional[Player] = None
+_speaker: Optional[SpeakQueue] = None
+_player_lock = threading.Lock()
+
+# Function: get_player, the shared voice player
+def get_player() -> Player:
+    global _player
+    with _player_lock:
+        if _player is None:
+            _player = Player()
+
+    return _player
+
+# Function: get_speaker, the shared speak queue in front of the player
+def get_speaker() -> SpeakQueue:
+    global _speaker
+    player = get_player()
+    with _player_lock:
+        if _speaker is None:
+            _speaker = SpeakQueue(player)
+
+    return _speaker
+
+# Function: speak, shortcut for get_speaker().speak
+def speak(text: str, kind: str = "reply", deadline_s: Optional[float] = None,
+          muted: Union[bool, Callable[[], bool]] = False, interrupt: bool = False, use_cache: bool = True,
+          on_done: Optional[Callable[[PlayHandle], None]] = None, stages: Optional[StageTimes] = None) -> PlayHandle:
+    return get_speaker().speak(text, kind=kind, deadline_s=deadline_s, muted=muted, interrupt=interrupt,
+                               use_cache=use_cache, on_done=on_done, stages=stages)
+
+# Function: play_audio, shortcut for get_player().play
+def play_audio(source: str | Path | bytes, on_done: Optional[Callable[[PlayHandle], None]] = None,
+               interrupt: bool = False, label: str = "", stages: Optional[StageTimes] = None,
+               cache_pcm: bool = False) -> PlayHandle:
+    return get_player().play(source, on_done=on_done, interrupt=interrupt, label=label, stages=stages, cache_pcm=cache_pcm)
+
+# Function: set_muted, shortcut for get_player().set_muted
+def set_muted(muted: bool) -> None:
+    get_player().set_muted(muted)
+
+
+__all__ = [
+    "audio_lock",
+    "PlayHandle",
+    "Player",
+    "SpeakQueue",
+    "SPEAK_DEADLINES",
+    "get_player",
+    "get_speaker",
+    "speak",
+    "play_audio",
+    "set_muted",
+]
+
+# End, Spencer
@@ -0,0 +1,139 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_sfx.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Sound effect bank, decodes the UI sounds once at boot and plays them on the sfx bus
+# Last date edited: (10/19/26 21:20)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Audio libraries
+import pygame
+
+# Jazmin modules
+from jazmin_audio import init_mixer, on_reinit
+from jazmin_mixer import get_mixer
+from jazmin_pcm import get_pcm_cache
+
+
+SFX_PATTERN = "audio_*.mp3"
+
+
+# Class: SoundBank
+    # every effect is decoded into a pygame Sound once (load_all on a boot worker), so play() only starts a channel on the sfx bus
+    # effects are looked up by file stem ("audio_enter_button"), a full path works too
+    # an effect asked for before the bank has loaded it is decoded right there, like before
+    # decoding goes through the PCM cache, so after the first launch loading the bank is a file map per effect
+
+class SoundBank:
+    def __init__(self):
+        self.folder: Optional[Path] = None
+        self.ready = threading.Event()
+        self._sounds: Dict[str, pygame.mixer.Sound] = {}
+        self._paths: Dict[str, Path] = {}
+        self._load_lock = threading.Lock()
+        on_reinit(self._reload)
+
+# Function: load_all, decodes every audio_*.mp3 in folder, returns how many are loaded
+    def load_all(self, folder: Optional[str | Path] = None) -> int:
+        with self._load_lock:
+            if folder is not None:
+                self.folder = Path(folder)
+            init_mixer()
+
+            t0 = time.perf_counter()
+            for path in sorted(self.folder.glob(SFX_PATTERN)) if self.folder else []:
+                self._paths.setdefault(path.stem, path)
+            for key in list(self._paths):
+                if key not in self._sounds:
+                    self._decode(key)
+            self.ready.set()
+
+        print(f"[Jazmin] [SFX] - {len(self._sounds)} effects decoded in {(time.perf_counter() - t0) * 1000.0:.0f}ms")
+
+        return len(self._sounds)
+
+# Function: get, the decoded Sound for an effect (decoded now if the bank does not have it yet)
+    def get(self, name: str | Path) -> Optional[pygame.mixer.Sound]:
+        key = Path(name).stem
+        sound = self._sounds.get(key)
+        if sound is not None:
+            return sound
+
+        path = Path(name)
+        if not path.is_file() and self.folder is not None:
+            path = self.folder / f"{key}.mp3"
+        self._paths.setdefault(key, path)
+
+        return self._decode(key)
+
+# Function: play, starts an effect on the sfx bus (ducked while Jazmin speaks)
+    def play(self, name: str | Path, volume: float = 1.0) -> Optional[pygame.mixer.Channel]:
+        sound = self.get(name)
+        if sound is None:
+            return None
+
+        return get_mixer().play("sfx", sound, volume=volume)
+
+# Function: stop, stops every effect that is playing
+    def stop(self) -> None:
+        get_mixer().bus("sfx").stop()
+
+    def _decode(self, key: str) -> Optional[pygame.mixer.Sound]:
+        path = self._paths.get(key)
+        try:
+            init_mixer()
+            sound = get_pcm_cache().load(path) if path is not None and path.is_file() else None
+        except Exception as e:
+            print(f"[Error] [SFX] - Could not decode {key}:", e)
+            return None
+        if sound is None:
+            print(f"[Error] [SFX] - Could not decode {key}")
+            return None
+
+        self._sounds[key] = sound
+
+        return sound
+
+    # the mixer was re-opened, Sounds from the old device are invalid
+    def _reload(self) -> None:
+        self._sounds.clear()
+        self.ready.clear()
+        threading.Thread(target=self.load_all, name="jazmin-sfx", daemon=True).start()
+
+
+_bank: Optional[SoundBank] = None
+_bank_lock = threading.Lock()
+
+# Function: get_bank, the shared sound effect bank
+def get_bank() -> SoundBank:
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = SoundBank()
+
+    return _bank
+
+# Function: play_sfx, shortcut for get_bank().play
+def play_sfx(name: str | Path, volume: float = 1.0) -> Optional[pygame.mixer.Channel]:
+    return get_bank().play(name, volume)
+
+
+__all__ = [
+    "SoundBank",
+    "get_bank",
+    "play_sfx",
+]
+
+# End, Spencer
@@ -0,0 +1,386 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_stt.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Speech to text backends (Google, and local Vosk or Whisper engines that work offline) picked from config
+# Last date edited: (10/19/26 22:30)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+# Speech recognition
+import speech_recognition as sr
+
+# Jazmin modules
+from jazmin_assets import app_data_dir
+
+
+STT_SAMPLE_RATE = 16000     # what the local engines are trained on, audio is resampled to it
+
+
+# Function: models_dir, where local speech models are kept (app_data/models)
+def models_dir() -> Path:
+    path = app_data_dir() / "models"
+    path.mkdir(parents=True, exist_ok=True)
+
+    return path
+
+# Function: _param, a speech.* param from the optimizer
+def _param(name: str, default):
+    try:
+        import jazmin_optimizer as jo
+        return jo.load_optimizer().get_param(name, default)
+    except Exception:
+        return default
+
+
+# Class: SttBackend
+    # one speech to text engine, transcribe() takes the speech_recognition AudioData the mic listener hands over
+    # it raises sr.UnknownValueError when nothing was understood and sr.RequestError when the engine cannot run,
+    # the same errors recognize_google raises, so callers handle every backend alike
+
+class SttBackend:
+    name = "base"
+    offline = False
+
+# Function: available, whether the engine can run here (library installed, model present)
+    def available(self) -> bool:
+        return True
+
+# Function: load, loads the model ahead of the first utterance (local engines take seconds)
+    def load(self) -> None:
+        pass
+
+# Function: transcribe, the words in the audio
+    def transcribe(self, audio: sr.AudioData) -> str:
+        raise NotImplementedError
+
+# Function: stream, a session that takes raw mic chunks as they are captured (partials only where the engine has them)
+    def stream(self, sample_rate: int, sample_width: int) -> "SttSession":
+        return SttSession(self, sample_rate, sample_width)
+
+
+# Class: SttSession
+    # one utterance fed chunk by chunk, accept() returns the partial transcript so far (or None), finish() the final one
+    # this base session only buffers and transcribes at the end, engines that decode as they go override both
+
+class SttSession:
+    def __init__(self, backend: SttBackend, sample_rate: int, sample_width: int):
+        self.backend = backend
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self._frames = bytearray()
+
+# Function: accept, takes the next chunk of 16 bit mono PCM, returns the partial transcript when there is one
+    def accept(self, chunk: bytes) -> Optional[str]:
+        self._frames += chunk
+        return None
+
+# Function: finish, the final transcript of everything accepted (the configured fallback covers an unreachable engine)
+    def finish(self) -> str:
+        return transcribe(sr.AudioData(bytes(self._frames), self.sample_rate, self.sample_width), self.backend)
+
+
+# Class: GoogleBackend
+    # Google's web speech API through speech_recognition, a network round trip after the user stops talking
+
+class GoogleBackend(SttBackend):
+    name = "google"
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        return self.recognizer.recognize_google(audio)
+
+
+# Class: VoskBackend
+    # Kaldi models through vosk (pip install vosk), fully offline
+    # the model is a folder unpacked from alphacephei.com/vosk/models, speech.vosk_model or app_data/models/vosk
+
+class VoskBackend(SttBackend):
+    name = "vosk"
+    offline = True
+
+    def __init__(self, model_path: Optional[str | Path] = None):
+        self.model_path = Path(model_path or _param("speech.vosk_model", "") or models_dir() / "vosk")
+        self._model = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        try:
+            import vosk  # noqa: F401
+        except ImportError:
+            return False
+
+        return self.model_path.is_dir()
+
+    def load(self):
+        with self._lock:
+            if self._model is None:
+                try:
+                    import vosk
+                except ImportError as e:
+                    raise sr.RequestError(f"vosk is not installed: {e}")
+                if not self.model_path.is_dir():
+                    raise sr.RequestError(f"no Vosk model at {self.model_path}")
+
+                vosk.SetLogLevel(-1)
+                t0 = time.perf_counter()
+                self._model = vosk.Model(str(self.model_path))
+                print(f"[Jazmin] [Speech] - Vosk model loaded in {(time.perf_counter() - t0) * 1000.0:.0f}ms")
+
+        return self._model
+
+# Function: recognizer, a fresh Kaldi recognizer (one per utterance, Vosk resamples other rates to the model's)
+    def recognizer(self, sample_rate: int = STT_SAMPLE_RATE):
+        import vosk
+        recognizer = vosk.KaldiRecognizer(self.load(), sample_rate)
+        recognizer.SetWords(False)
+
+        return recognizer
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        recognizer = self.recognizer()
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=STT_SAMPLE_RATE, convert_width=2))
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        if not text:
+            raise sr.UnknownValueError()
+
+        return text
+
+    def stream(self, sample_rate: int, sample_width: int) -> "SttSession":
+        return VoskSession(self, sample_rate, sample_width)
+
+
+# Class: VoskSession
+    # decodes while the user talks, Kaldi closes a segment at each pause and keeps a running partial for the open one
+
+class VoskSession(SttSession):
+    def __init__(self, backend: VoskBackend, sample_rate: int, sample_width: int):
+        super().__init__(backend, sample_rate, sample_width)
+        self.recognizer = backend.recognizer(sample_rate)
+        self.segments: List[str] = []
+
+    def accept(self, chunk: bytes) -> Optional[str]:
+        if self.recognizer.AcceptWaveform(chunk):
+            segment = json.loads(self.recognizer.Result()).get("text", "").strip()
+            if segment:
+                self.segments.append(segment)
+            partial = ""
+        else:
+            partial = json.loads(self.recognizer.PartialResult()).get("partial", "").strip()
+
+        return " ".join(self.segments + [partial]).strip() or None
+
+    def finish(self) -> str:
+        t0 = time.perf_counter()
+        final = json.loads(self.recognizer.FinalResult()).get("text", "").strip()
+        text = " ".join(self.segments + [final]).strip()
+        if not text:
+            raise sr.UnknownValueError()
+        _record(self.backend.name, (time.perf_counter() - t0) * 1000.0, 0.0)
+
+        return text
+
+
+# Class: WhisperBackend
+    # Whisper models through faster-whisper (pip install faster-whisper), offline once the model is downloaded
+    # speech.whisper_model picks the size ("tiny.en", "base.en", ...), int8 on the CPU keeps it light
+
+class WhisperBackend(SttBackend):
+    name = "whisper"
+    offline = True
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or str(_param("speech.whisper_model", "base.en"))
+        self._model = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        try:
+            import faster_whisper  # noqa: F401
+        except ImportError:
+            return False
+
+        return True
+
+    def load(self):
+        with self._lock:
+            if self._model is None:
+                try:
+                    from faster_whisper import WhisperModel
+                except ImportError as e:
+                    raise sr.RequestError(f"faster-whisper is not installed: {e}")
+
+                t0 = time.perf_counter()
+                try:
+                    self._model = WhisperModel(self.model, device="cpu", compute_type="int8",
+                                               download_root=str(models_dir() / "whisper"))
+                except Exception as e:
+                    raise sr.RequestError(f"could not load Whisper model {self.model}: {e}")
+                print(f"[Jazmin] [Speech] - Whisper {self.model} loaded in {(time.perf_counter() - t0) * 1000.0:.0f}ms")
+
+        return self._model
+
+    def transcribe(self, audio: sr.AudioData) -> str:
+        import numpy as np
+        model = self.load()
+        raw = audio.get_raw_data(convert_rate=STT_SAMPLE_RATE, convert_width=2)
+        samples = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+
+        segments, _info = model.transcribe(samples, language="en", beam_size=1)
+        text = " ".join(segment.text.strip() for segment in segments).strip()
+        if not text:
+            raise sr.UnknownValueError()
+
+        return text
+
+
+BACKENDS: Dict[str, Callable[[], SttBackend]] = {
+    "google": GoogleBackend,
+    "vosk": VoskBackend,
+    "whisper": WhisperBackend,
+}
+
+_backends: Dict[str, SttBackend] = {}
+_backends_lock = threading.Lock()
+
+# Function: register_backend, adds another engine (name -> factory)
+def register_backend(name: str, factory: Callable[[], SttBackend]) -> None:
+    BACKENDS[name] = factory
+    with _backends_lock:
+        _backends.pop(name, None)
+
+# Function: get_backend, the shared instance of a backend (speech.stt_backend when no name is given)
+def get_backend(name: Optional[str] = None) -> SttBackend:
+    name = name or str(_param("speech.stt_backend", "google"))
+    with _backends_lock:
+        backend = _backends.get(name)
+        if backend is None:
+            factory = BACKENDS.get(name)
+            if factory is None:
+                print(f"[Error] [Speech] - Unknown speech backend {name}, using google")
+                name, factory = "google", GoogleBackend
+            backend = _backends.setdefault(name, factory())
+
+    return backend
+
+# Function: fallback_backend, the offline engine used when the configured one cannot be reached (speech.stt_fallback)
+def fallback_backend() -> Optional[SttBackend]:
+    name = str(_param("speech.stt_fallback", "vosk") or "")
+    if not name or name not in BACKENDS:
+        return None
+    backend = get_backend(name)
+
+    return backend if backend.available() else None
+
+# Function: transcribe, the words in the audio from the configured backend, the fallback engine when it is unreachable
+    # timed as speech.stt_ms and speech.stt_rtf (transcribe time over audio length)
+def transcribe(audio: sr.AudioData, backend: Optional[SttBackend] = None) -> str:
+    backend = backend or get_backend()
+    t0 = time.perf_counter()
+    try:
+        text = backend.transcribe(audio)
+    except sr.RequestError as e:
+        fallback = fallback_backend()
+        if fallback is None or fallback is backend:
+            raise
+        print(f"[Jazmin] [Speech] - {backend.name} unavailable ({e}), using {fallback.name}")
+        backend = fallback
+        t0 = time.perf_counter()
+        text = backend.transcribe(audio)
+
+    _record(backend.name, (time.perf_counter() - t0) * 1000.0, audio_seconds(audio))
+
+    return text
+
+# Function: open_session, a streaming session on the configured backend (the fallback's when it cannot start)
+def open_session(sample_rate: int, sample_width: int) -> SttSession:
+    backend = get_backend()
+    try:
+        return backend.stream(sample_rate, sample_width)
+    except sr.RequestError as e:
+        fallback = fallback_backend()
+        if fallback is None or fallback is backend:
+            return SttSession(backend, sample_rate, sample_width)
+        print(f"[Jazmin] [Speech] - {backend.name} cannot stream ({e}), using {fallback.name}")
+
+        return fallback.stream(sample_rate, sample_width)
+
+# Function: audio_seconds, the length of an AudioData clip
+def audio_seconds(audio: sr.AudioData) -> float:
+    return len(audio.frame_data) / float(audio.sample_rate * audio.sample_width)
+
+def _record(name: str, ms: float, seconds: float) -> None:
+    try:
+        import jazmin_optimizer as jo
+        metrics = jo.load_optimizer().metrics
+        metrics.push("speech.stt_ms", ms)
+        if seconds > 0:
+            metrics.push("speech.stt_rtf", ms / 1000.0 / seconds)
+    except Exception:
+        pass
+
+# Function: warm_backend, loads the configured engine's model (and the offline fallback's) off the Tk thread
+def warm_backend() -> None:
+    for backend in (get_backend(), fallback_backend()):
+        if backend is not None and backend.offline and backend.available():
+            try:
+                backend.load()
+            except sr.RequestError as e:
+                print(f"[Error] [Speech] - {backend.name} not loaded:", e)
+
+
+# Function: word_error_rate, word level edit distance over the reference length (0.0 is a perfect transcript)
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    ref = transcript_words(reference)
+    hyp = transcript_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    row = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        prev, row[0] = row[0], i
+        for j, h in enumerate(hyp, 1):
+            prev, row[j] = row[j], min(row[j] + 1, row[j - 1] + 1, prev + (r != h))
+
+    return row[-1] / float(len(ref))
+
+# Function: transcript_words, lower case words without punctuation, how transcripts are compared
+def transcript_words(text: str) -> List[str]:
+    return "".join(c if c.isalnum() or c in "' " else " " for c in text.lower()).split()
+
+
+__all__ = [
+    "STT_SAMPLE_RATE",
+    "SttBackend",
+    "GoogleBackend",
+    "VoskBackend",
+    "WhisperBackend",
+    "SttSession",
+    "VoskSession",
+    "BACKENDS",
+    "register_backend",
+    "get_backend",
+    "fallback_backend",
+    "transcribe",
+    "open_session",
+    "audio_seconds",
+    "warm_backend",
+    "word_error_rate",
+    "transcript_words",
+]
+
+# End, Spencer
@@ -0,0 +1,229 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_telemetry.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Batches telemetry events in the background into compressed NDJSON files (and optionally a local collector)
+# Last date edited: (10/19/26 17:30)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import atexit
+import gzip
+import json
+import os
+import threading
+import time
+import urllib.request
+import uuid
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+# Jazmin modules
+from jazmin_assets import app_data_dir
+
+
+# Class: Dataclass, TelemetrySettings
+    # limits for the exporter, read from the optimizer's telemetry.* params
+
+@dataclass
+class TelemetrySettings:
+    queue_max: int = 2048             # events held before new ones are dropped
+    batch_max: int = 256              # events written per batch
+    flush_s: float = 2.0              # longest an event waits in the queue
+    segment_bytes: int = 1_000_000    # rotate the file after this many compressed bytes
+    segment_s: float = 600.0          # or after this long
+    keep_segments: int = 20           # older files are deleted
+    collector_url: str = ""           # optional http endpoint that gets each batch as gzip NDJSON
+    post_timeout_s: float = 2.0
+
+# Function: from_params, builds the settings from a params dict (telemetry.queue_max, ...)
+    @classmethod
+    def from_params(cls, params: Dict[str, Any]) -> "TelemetrySettings":
+        base = cls()
+        values = {}
+        for name, default in base.__dict__.items():
+            raw = params.get(f"telemetry.{name}", default)
+            try:
+                values[name] = type(default)(raw)
+            except (TypeError, ValueError):
+                values[name] = default
+
+        return cls(**values)
+
+
+# Class: TelemetryExporter
+    # submit() only appends to a bounded deque (atomic, no lock) and never blocks the caller
+    # a background thread turns the queue into batches, each batch is one gzip member appended to the current segment
+    # so a segment stays readable even if Jazmin is closed mid-write
+
+class TelemetryExporter:
+    def __init__(self, settings: Optional[TelemetrySettings] = None, folder: Optional[Path] = None):
+        self.settings = settings or TelemetrySettings()
+        self.session = uuid.uuid4().hex[:12]
+        self._folder = folder
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._seq = 0
+        self._segment: Optional[Path] = None
+        self._segment_started = 0.0
+
+        self.submitted = 0
+        self.dropped = 0
+        self.written = 0
+        self.batches = 0
+        self.posted = 0
+        self.post_failures = 0
+
+# Function: submit, queues one event (dropped and counted when the queue is full)
+    def submit(self, payload: Dict[str, Any]) -> bool:
+        if len(self._queue) >= self.settings.queue_max:
+            self.dropped += 1
+            return False
+
+        self._queue.append({"ts": round(time.time(), 3), "session": self.session, **payload})
+        self.submitted += 1
+        if self._thread is None:
+            self._start()
+        elif len(self._queue) >= self.settings.batch_max:
+            self._wake.set()
+
+        return True
+
+# Function: stats, exporter counters
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": len(self._queue),
+            "submitted": self.submitted,
+            "dropped": self.dropped,
+            "written": self.written,
+            "batches": self.batches,
+            "posted": self.posted,
+            "post_failures": self.post_failures,
+            "segment": self._segment.name if self._segment else None,
+        }
+
+# Function: close, writes whatever is queued and stops the thread
+    def close(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _start(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="jazmin-telemetry", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.settings.flush_s)
+            self._wake.clear()
+            self._drain()
+        self._drain()
+
+    def _drain(self) -> None:
+        while self._queue:
+            batch: List[Dict[str, Any]] = []
+            while self._queue and len(batch) < self.settings.batch_max:
+                try:
+                    batch.append(self._queue.popleft())
+                except IndexError:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Dict[str, Any]]) -> None:
+        lines = []
+        for event in batch:
+            self._seq += 1
+            event["seq"] = self._seq
+            lines.append(json.dumps(event, default=str, separators=(",", ":")))
+        data = gzip.compress(("\n".join(lines) + "\n").encode("utf-8"))
+
+        try:
+            path = self._current_segment()
+            with path.open("ab") as f:
+                f.write(data)
+            self.written += len(batch)
+            self.batches += 1
+        except OSError as e:
+            print("[Error] [Telemetry] - Could not write batch:", e)
+
+        if self.settings.collector_url:
+            self._post(data)
+
+    def _post(self, data: bytes) -> None:
+        request = urllib.request.Request(self.settings.collector_url, data=data, method="POST", headers={
+            "Content-Type": "application/x-ndjson",
+            "Content-Encoding": "gzip",
+            "X-Jazmin-Session": self.session,
+        })
+        try:
+            with urllib.request.urlopen(request, timeout=self.settings.post_timeout_s) as response:
+                response.read()
+            self.posted += 1
+        except Exception:
+            self.post_failures += 1  # the batch is already on disk
+
+    # opens a new segment when the current one is too big or too old, and prunes old ones
+    def _current_segment(self) -> Path:
+        now = time.time()
+        path = self._segment
+        if (path is None or now - self._segment_started >= self.settings.segment_s
+                or (path.exists() and path.stat().st_size >= self.settings.segment_bytes)):
+            folder = self._folder or app_data_dir() / "telemetry"
+            folder.mkdir(parents=True, exist_ok=True)
+            path = folder / f"telemetry-{time.strftime('%Y%m%d-%H%M%S')}-{self.session}-{self.batches}.ndjson.gz"
+            self._segment, self._segment_started = path, now
+            self._prune(folder)
+
+        return path
+
+    def _prune(self, folder: Path) -> None:
+        segments = sorted(folder.glob("telemetry-*.ndjson.gz"), key=lambda p: p.stat().st_mtime)
+        for old in segments[:-max(1, self.settings.keep_segments)]:
+            try:
+                os.remove(old)
+            except OSError:
+                pass
+
+
+_exporter: Optional[TelemetryExporter] = None
+_exporter_lock = threading.Lock()
+
+# Function: get_exporter, the shared exporter (settings are taken from the optimizer params on first use)
+def get_exporter() -> TelemetryExporter:
+    global _exporter
+    if _exporter is None:
+        with _exporter_lock:
+            if _exporter is None:
+                try:
+                    import jazmin_optimizer as jo
+                    settings = TelemetrySettings.from_params(jo.load_optimizer().config.params)
+                except Exception:
+                    settings = TelemetrySettings()
+                _exporter = TelemetryExporter(settings)
+
+    return _exporter
+
+
+__all__ = [
+    "TelemetrySettings",
+    "TelemetryExporter",
+    "get_exporter",
+]
+
+# End, Spencer
@@ -0,0 +1,253 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_trace.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Lightweight span tracer that follows one conversation turn across Jazmin's threads
+# Last date edited: (10/19/26 23:59)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import json
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+# Jazmin modules
+from jazmin_assets import app_data_dir
+
+
+TRACE_FILES = 50            # newest slow-turn traces kept in app_data/traces
+
+# Function: now_us, monotonic clock in microseconds (the unit Chrome traces use)
+def now_us() -> int:
+    return time.perf_counter_ns() // 1000
+
+
+# Class: Span
+    # one timed stage, spans of the same turn share a trace_id and point at their parent
+
+class Span:
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "start_us", "end_us", "tid", "thread", "args")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str] = None, start_us: Optional[int] = None, **args: Any):
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:8]
+        self.parent_id = parent_id
+        self.name = name
+        self.start_us = now_us() if start_us is None else start_us
+        self.end_us: Optional[int] = None
+        self.tid = threading.get_ident()
+        self.thread = threading.current_thread().name
+        self.args: Dict[str, Any] = args
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_us or now_us()) - self.start_us) / 1000.0
+
+# Function: to_event, the span as a Chrome trace "complete" event
+    def to_event(self, pid: int) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "cat": self.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": self.start_us,
+            "dur": max(0, (self.end_us or self.start_us) - self.start_us),
+            "pid": pid,
+            "tid": self.tid,
+            "args": {"trace_id": self.trace_id, "span_id": self.span_id, "parent_id": self.parent_id, **self.args},
+        }
+
+
+# the span that new spans on this thread nest under (threads get it through bind)
+_current: ContextVar[Optional[Span]] = ContextVar("jazmin_span", default=None)
+
+
+# Class: Tracer
+    # finished spans go into a ring buffer (deque append is atomic, no lock on the hot path)
+    # a trace is one user turn: start_trace() opens the root, end_trace() closes it and exports slow turns
+
+class Tracer:
+    def __init__(self, capacity: int = 4096, max_open: int = 32):
+        self._spans: Deque[Span] = deque(maxlen=capacity)
+        self._open: "OrderedDict[str, Span]" = OrderedDict()
+        self._open_lock = threading.Lock()
+        self._max_open = max_open
+        self._pid = os.getpid()
+
+# Function: start_trace, opens the root span of a new trace (a turn), it is not made current anywhere
+    def start_trace(self, name: str = "turn", **args: Any) -> Span:
+        root = Span(name, uuid.uuid4().hex[:12], **args)
+        with self._open_lock:
+            self._open[root.trace_id] = root
+            while len(self._open) > self._max_open:
+                self._open.popitem(last=False)  # turns that never finished (muted, errors)
+
+        return root
+
+# Function: end_trace, closes a trace's root span, returns the per-stage breakdown in ms
+    # the root stays open until playback is over, so a turn is judged by its time to first sound (the audio.play_start span),
+    # turns that took longer than trace.slow_turn_ms to be heard are written out as Chrome trace JSON
+    def end_trace(self, trace: Optional[Span | str] = None) -> Dict[str, float]:
+        trace_id = trace.trace_id if isinstance(trace, Span) else trace
+        if trace_id is None:
+            current = _current.get()
+            trace_id = current.trace_id if current else None
+
+        with self._open_lock:
+            root = self._open.pop(trace_id, None) if trace_id else None
+        if root is None:
+            return {}
+
+        root.end_us = now_us()
+        self._spans.append(root)
+        breakdown = self.breakdown(root.trace_id)
+        heard_ms = self.first_sound_ms(root)
+
+        if heard_ms >= _slow_turn_ms():
+            stages = " ".join(f"{k}={v:.0f}ms" for k, v in breakdown.items() if k != root.name)
+            print(f"[Jazmin] [Trace] - Slow {root.name} {heard_ms:.0f}ms to first sound: {stages}")
+            try:
+                path = self.export_chrome(trace_id=root.trace_id)
+                print(f"[Jazmin] [Trace] - Written to {path}")
+            except OSError as e:
+                print("[Error] [Trace] - Could not write trace:", e)
+
+        return breakdown
+
+# Function: first_sound_ms, ms from the start of a trace to its first audio.play_start ending (the whole trace when nothing played)
+    def first_sound_ms(self, root: Span) -> float:
+        heard = [s.end_us for s in self.spans(root.trace_id) if s.name == "audio.play_start" and s.end_us is not None]
+
+        return (min(heard) - root.start_us) / 1000.0 if heard else root.duration_ms
+
+# Function: current, the span new spans on this thread will nest under
+    def current(self) -> Optional[Span]:
+        return _current.get()
+
+# Function: span, times a block as a child of the current span (or as its own trace when there is none)
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[Span]:
+        parent = _current.get()
+        s = Span(name, parent.trace_id if parent else uuid.uuid4().hex[:12], parent.span_id if parent else None, **args)
+        token = _current.set(s)
+        try:
+            yield s
+        finally:
+            _current.reset(token)
+            s.end_us = now_us()
+            self._spans.append(s)
+
+# Function: record, adds a span that was timed by hand (start/end from now_us)
+    def record(self, name: str, start_us: int, end_us: Optional[int] = None, **args: Any) -> Span:
+        parent = _current.get()
+        s = Span(name, parent.trace_id if parent else uuid.uuid4().hex[:12], parent.span_id if parent else None, start_us, **args)
+        s.end_us = now_us() if end_us is None else end_us
+        self._spans.append(s)
+
+        return s
+
+# Function: bind, wraps fn so it runs under parent (default: the caller's current span), for thread targets
+    def bind(self, fn: Callable[..., Any], parent: Optional[Span] = None) -> Callable[..., Any]:
+        parent = parent or _current.get()
+        if parent is None:
+            return fn
+
+        def run(*a: Any, **kw: Any) -> Any:
+            token = _current.set(parent)
+            try:
+                return fn(*a, **kw)
+            finally:
+                _current.reset(token)
+
+        return run
+
+# Function: spans, finished spans (optionally only one trace), oldest first
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        return [s for s in list(self._spans) if trace_id is None or s.trace_id == trace_id]
+
+# Function: breakdown, total ms per stage name for one trace
+    def breakdown(self, trace_id: str) -> Dict[str, float]:
+        out: Dict[str, float] = {}
+        for s in self.spans(trace_id):
+            out[s.name] = round(out.get(s.name, 0.0) + s.duration_ms, 2)
+
+        return out
+
+# Function: export_chrome, writes spans as Chrome trace-event JSON (chrome://tracing or Perfetto)
+    def export_chrome(self, path: Optional[str | Path] = None, trace_id: Optional[str] = None) -> Path:
+        spans = self.spans(trace_id)
+        events = [s.to_event(self._pid) for s in spans]
+        threads = {s.tid: s.thread for s in spans}
+        events += [{"name": "thread_name", "ph": "M", "pid": self._pid, "tid": tid, "args": {"name": name}}
+                   for tid, name in threads.items()]
+
+        folder = None
+        if path is None:
+            folder = app_data_dir() / "traces"
+            folder.mkdir(parents=True, exist_ok=True)
+            path = folder / f"trace-{time.strftime('%Y%m%d-%H%M%S')}-{trace_id or 'all'}.json"
+        path = Path(path)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8")
+        if folder is not None:
+            _prune_traces(folder)
+
+        return path
+
+
+# Function: _prune_traces, keeps the TRACE_FILES newest traces in the traces folder
+def _prune_traces(folder: Path) -> None:
+    files = sorted(folder.glob("trace-*.json"), key=lambda p: p.stat().st_mtime)
+    for old in files[:-TRACE_FILES]:
+        try:
+            os.remove(old)
+        except OSError:
+            pass
+
+
+# Function: _slow_turn_ms, trace.slow_turn_ms from the optimizer
+def _slow_turn_ms() -> float:
+    try:
+        import jazmin_optimizer as jo
+        return float(jo.load_optimizer().get_param("trace.slow_turn_ms", 4000))
+    except Exception:
+        return 4000.0
+
+
+# shared tracer for the whole app
+_tracer = Tracer()
+
+# Function: get_tracer, returns the shared tracer
+def get_tracer() -> Tracer:
+    return _tracer
+
+# Function: span, shortcut for get_tracer().span
+def span(name: str, **args: Any):
+    return _tracer.span(name, **args)
+
+# Function: bind, shortcut for get_tracer().bind
+def bind(fn: Callable[..., Any], parent: Optional[Span] = None) -> Callable[..., Any]:
+    return _tracer.bind(fn, parent)
+
+
+__all__ = [
+    "Span",
+    "Tracer",
+    "get_tracer",
+    "span",
+    "bind",
+    "now_us",
+]
+
+# End, Spencer
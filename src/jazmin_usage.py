@@ -0,0 +1,320 @@
+# Jazmin  - Your Digital Personality
+# File    : jazmin_usage.py
+# Author  : Spencer Barton (spencer@jazminpy.com)
+# GitHub  : https://github.com/spencebarton/jazmin
+# License : MIT License
+# Descript: Learns when the user usually opens Jazmin and talks to her, and warms connections, speech and assets ahead of it
+# Last date edited: (10/19/26 21:20)
+
+# Copyright (c) 2025 Spencer Barton
+# Managed through Jazmin and SBD. All rights reserved.
+# For more information, visit jazminpy.com
+
+from __future__ import annotations
+
+# Standard Libraries used
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Jazmin modules
+from jazmin_assets import app_data_dir, asset_cache_dir
+
+
+DAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+TURN_WEIGHT = 0.25      # a launch says more about when the user shows up than one more turn in a conversation
+MIN_EVENTS = 3.0        # below this much (decayed) history there is nothing to predict from
+WARM_SUFFIXES = (".mp3", ".wav", ".gif", ".png", ".mp4")
+
+
+# Function: _grid, an empty 7 day x 24 hour histogram
+def _grid() -> List[List[float]]:
+    return [[0.0] * 24 for _ in range(7)]
+
+
+# Class: UsageHistory
+    # day-of-week x hour-of-day histograms of launches and turns, stored in app_data/usage.json
+    # counts decay with a half life so a changed routine takes over within a few weeks
+
+class UsageHistory:
+    def __init__(self, path: Optional[str | Path] = None, half_life_days: float = 28.0):
+        self.path = Path(path) if path is not None else app_data_dir() / "usage.json"
+        self.half_life_days = half_life_days
+        self.launches = _grid()
+        self.turns = _grid()
+        self.updated = time.time()
+        self.last_turn = 0.0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.load()
+
+# Function: load, reads the saved histograms (a missing or broken file starts a fresh history)
+    def load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+
+        for name in ("launches", "turns"):
+            grid = data.get(name)
+            if isinstance(grid, list) and len(grid) == 7 and all(isinstance(row, list) and len(row) == 24 for row in grid):
+                setattr(self, name, [[float(v) for v in row] for row in grid])
+        self.updated = float(data.get("updated", self.updated))
+
+# Function: save, writes the histograms when they changed since the last save
+    def save(self) -> bool:
+        with self._lock:
+            if not self._dirty:
+                return False
+            data = {
+                "version": 1,
+                "updated": self.updated,
+                "half_life_days": self.half_life_days,
+                "launches": [[round(v, 4) for v in row] for row in self.launches],
+                "turns": [[round(v, 4) for v in row] for row in self.turns],
+            }
+            self._dirty = False
+
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data), encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print("[Error] [Usage] - Could not save usage history:", e)
+            return False
+
+        return True
+
+# Function: record_launch, counts a start of Jazmin in the current (or given) hour
+    def record_launch(self, when: Optional[float] = None) -> None:
+        self._record(self.launches, when)
+
+# Function: record_turn, counts one conversation turn in the current (or given) hour
+    def record_turn(self, when: Optional[float] = None) -> None:
+        self._record(self.turns, when)
+        self.last_turn = time.time() if when is None else when
+
+    def _record(self, grid: List[List[float]], when: Optional[float]) -> None:
+        now = time.time() if when is None else when
+        local = time.localtime(now)
+        with self._lock:
+            self._decay(now)
+            grid[local.tm_wday][local.tm_hour] += 1.0
+            self._dirty = True
+
+    # scales every count down by the time passed since the last update
+    def _decay(self, now: float) -> None:
+        days = (now - self.updated) / 86400.0
+        if days <= 0:
+            return
+
+        factor = 0.5 ** (days / self.half_life_days)
+        for grid in (self.launches, self.turns):
+            for row in grid:
+                row[:] = [v * factor for v in row]
+        self.updated = now
+
+# Function: total, the decayed number of events in the history
+    def total(self) -> float:
+        return sum(map(sum, self.launches)) + TURN_WEIGHT * sum(map(sum, self.turns))
+
+# Function: activity, a smoothed activity score for one weekday and hour
+    # neighbouring hours count half, and the same hour on any day of the week backs up sparse weekdays
+    def activity(self, day: int, hour: int) -> float:
+        def cell(d: int, h: int) -> float:
+            d, h = (d + h // 24) % 7, h % 24
+            return self.launches[d][h] + TURN_WEIGHT * self.turns[d][h]
+
+        def smoothed(d: int, h: int) -> float:
+            return cell(d, h) + 0.5 * (cell(d, h - 1) + cell(d, h + 1))
+
+        daily = sum(smoothed(d, hour) for d in range(7)) / 7.0
+
+        return 0.7 * smoothed(day, hour) + 0.3 * daily
+
+# Function: peak, the activity of the busiest hour of the week
+    def peak(self) -> float:
+        return max(self.activity(d, h) for d in range(7) for h in range(24))
+
+# Function: likelihood, how busy an hour usually is next to the busiest hour of the week (0..1)
+    def likelihood(self, when: Optional[float] = None, peak: Optional[float] = None) -> float:
+        if self.total() < MIN_EVENTS:
+            return 0.0
+
+        local = time.localtime(time.time() if when is None else when)
+        peak = self.peak() if peak is None else peak
+
+        return self.activity(local.tm_wday, local.tm_hour) / peak if peak > 0 else 0.0
+
+# Function: forecast, (hour start, likelihood) for the current hour and the ones after it
+    def forecast(self, hours: int = 12, now: Optional[float] = None) -> List[Tuple[float, float]]:
+        now = time.time() if now is None else now
+        hour_start = now - (now % 3600)
+        peak = self.peak()
+
+        return [(hour_start + i * 3600, self.likelihood(hour_start + i * 3600, peak)) for i in range(max(1, hours))]
+
+# Function: next_active, the first hour in the forecast likely to see the user, or None
+    def next_active(self, hours: int = 12, threshold: float = 0.35, now: Optional[float] = None) -> Optional[Tuple[float, float]]:
+        now = time.time() if now is None else now
+        for start, likelihood in self.forecast(hours, now):
+            if likelihood >= threshold:
+                return max(start, now), likelihood
+
+        return None
+
+
+_history: Optional[UsageHistory] = None
+_history_lock = threading.Lock()
+
+# Function: get_history, the shared usage history (half life from usage.half_life_days)
+def get_history() -> UsageHistory:
+    global _history
+    with _history_lock:
+        if _history is None:
+            _history = UsageHistory(half_life_days=_param("usage.half_life_days", 28.0))
+
+    return _history
+
+
+# Function: _param, a usage.* param from the optimizer
+def _param(name: str, default: float) -> float:
+    try:
+        import jazmin_optimizer as jo
+        return float(jo.load_optimizer().get_param(name, default))
+    except Exception:
+        return default
+
+
+# prewarming, each step is best effort and timed on its own
+
+_tts_lines: List[str] = []
+_asset_paths: List[Path] = []
+_warmers: Dict[str, Callable[[], None]] = {}
+_last_prewarm = 0.0
+_prewarm_lock = threading.Lock()
+
+
+# Function: _warm_http, live keep-alive connections to Voicemaker and OpenAI
+def _warm_http() -> None:
+    from jazmin_http import prewarm_connections
+    prewarm_connections()
+
+# Function: _warm_tts, makes sure the usual first lines are in the TTS cache, and decoded in the PCM cache
+def _warm_tts() -> None:
+    from jazmin_http import synthesize_speech
+    from jazmin_pcm import get_pcm_cache
+    for text in list(_tts_lines):
+        audio = synthesize_speech(text)
+        if audio:
+            get_pcm_cache().load(audio)
+
+# Function: _warm_assets, reads the asset files and prepared videos so decoding them starts from the OS file cache
+def _warm_assets() -> None:
+    for path in list(_asset_paths) + sorted(asset_cache_dir().glob("*.mp4")):
+        try:
+            with open(path, "rb") as f:
+                while f.read(1 << 20):
+                    pass
+        except OSError:
+            pass
+
+_warmers.update({"http": _warm_http, "tts": _warm_tts, "assets": _warm_assets})
+
+# Function: add_warmer, registers another prewarm step (name -> callable)
+def add_warmer(name: str, fn: Callable[[], None]) -> None:
+    _warmers[name] = fn
+
+# Function: prewarm, runs every prewarm step and returns the time each took in ms
+def prewarm(reason: str = "forecast") -> Dict[str, float]:
+    global _last_prewarm
+    if not _prewarm_lock.acquire(blocking=False):
+        return {}  # one is already running
+
+    try:
+        _last_prewarm = time.time()
+        took: Dict[str, float] = {}
+        for name, fn in list(_warmers.items()):
+            t0 = time.perf_counter()
+            try:
+                fn()
+            except Exception as e:
+                print(f"[Error] [Prewarm] - {name}:", e)
+            took[name] = round((time.perf_counter() - t0) * 1000.0, 1)
+
+        print(f"[Jazmin] [Prewarm] - ({reason}) " + " ".join(f"{k}={v:.0f}ms" for k, v in took.items()))
+        try:
+            import jazmin_optimizer as jo
+            jo.load_optimizer().metrics.push("usage.prewarm_ms", sum(took.values()))
+        except Exception:
+            pass
+
+        return took
+    finally:
+        _prewarm_lock.release()
+
+# Function: prewarm_due, whether the user is likely to show up within usage.prewarm_lead_min and nothing is warm yet
+def prewarm_due(now: Optional[float] = None) -> bool:
+    now = time.time() if now is None else now
+    history = get_history()
+    refresh_s = _param("usage.prewarm_refresh_s", 240.0)
+    if now - _last_prewarm < refresh_s or now - history.last_turn < refresh_s:
+        return False  # still warm from the last prewarm or from real use
+
+    lead_s = _param("usage.prewarm_lead_min", 15.0) * 60.0
+    peak = history.peak()
+    soon = max(history.likelihood(now, peak), history.likelihood(now + lead_s, peak))
+
+    return soon >= _param("usage.prewarm_threshold", 0.35)
+
+# Function: prewarm_tick, scheduler job, prewarms on its own thread when the forecast says so
+def prewarm_tick() -> None:
+    if prewarm_due():
+        threading.Thread(target=prewarm, name="jazmin-prewarm", daemon=True).start()
+
+# Function: note_turn, records a conversation turn (cheap, saved by the scheduler)
+def note_turn() -> None:
+    get_history().record_turn()
+
+# Function: start_usage_tracking, records this launch, prewarms once and schedules the forecast check
+    # tts_lines are the lines spoken right after a launch (the greeting), asset_folder is scanned for media to warm
+def start_usage_tracking(tts_lines: Iterable[str] = (), asset_folder: Optional[str | Path] = None) -> None:
+    history = get_history()
+    history.record_launch()
+    history.save()
+    atexit.register(history.save)
+
+    _tts_lines[:] = [line for line in tts_lines if line]
+    if asset_folder is not None:
+        try:
+            _asset_paths[:] = sorted(p for p in Path(asset_folder).iterdir() if p.suffix.lower() in WARM_SUFFIXES)
+        except OSError:
+            _asset_paths[:] = []
+
+    threading.Thread(target=prewarm, args=("launch",), name="jazmin-prewarm", daemon=True).start()
+
+    try:
+        import jazmin_optimizer as jo
+        scheduler = jo.load_optimizer().scheduler
+        scheduler.every("prewarm", 60.0, prewarm_tick)
+        scheduler.every("usage_save", 300.0, history.save)
+        jo.predictive_scaling()
+    except Exception as e:
+        print("[Error] [Usage] - Prewarm schedule not started:", e)
+
+
+__all__ = [
+    "UsageHistory",
+    "get_history",
+    "add_warmer",
+    "prewarm",
+    "prewarm_due",
+    "note_turn",
+    "start_usage_tracking",
+]
+
+# End, Spencer
@@ -19,6 +19,11 @@ import random
 from tkinter import PhotoImage
 import threading, jazmin_application as ja
 
+# Jazmin modules
+from jazmin_player import speak
+
+start_time = None
+
 # Function: Jazmin_Timer_Start
     # starts JazminTimer used for identifying when application launches (after loading assets)
 def Jazmin_Timer_Start():
@@ -30,6 +35,13 @@ def Jazmin_Timer_Elapsed():
     if start_time is None: print("[Jazmin] [Boot Timer]   - Timer has not been started yet")       
     else: elapsed_time = time.time() - start_time; print(f"[Jazmin] [Boot Timer]   - Elapsed time - {elapsed_time:.2f} seconds"); print("Jazmin is opening...")
 
+# Function: Jazmin_Timer_Phase()
+    # prints when a boot phase finished (relative to the timer start) and how long the phase itself ran
+def Jazmin_Timer_Phase(phase, duration=None, where=""):
+    took = f" took {duration:.2f}s" if duration is not None else ""; where = f" [{where}]" if where else ""
+    if start_time is None: print(f"[Jazmin] [Boot Timer]   - Phase {phase}{where}{took} (timer not running)")
+    else: print(f"[Jazmin] [Boot Timer]   - +{time.time() - start_time:.2f}s Phase {phase}{where}{took}")
+
 # Function: Jazmin_Timer_Stop()
     # will destroy JazminTimer
 def Jazmin_Timer_Stop():
@@ -90,10 +102,7 @@ def open_jazminhelp(self):
     line = random.choice(HELP_LINES)
     print(f"[Jazmin] [Help] - Chosen voice line: {line}")
 
-    threading.Thread(
-        target=ja.api_audio_get,
-        args=(line, self.audio_muted),
-        daemon=True
-    ).start()
+    # a help line is only worth saying right away, the speak queue drops it if it is stale or muted
+    speak(line, kind="help", muted=lambda: self.audio_muted)
 
 # End, Spencer
\ No newline at end of file